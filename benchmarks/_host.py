@@ -0,0 +1,86 @@
+"""
+Host-side stand-ins for the MicroPython `machine` and `micropython` modules so the library can be benchmarked under
+CPython. On a MicroPython board the real modules are used and nothing here is installed.
+"""
+import sys
+import time
+
+
+class MockPin:
+    OUT = 1
+    IN = 0
+    IRQ_FALLING = 4
+    IRQ_RISING = 8
+
+    def __init__(self, pin_id: int, mode: int = IN, value: int = 0):
+        self.id = pin_id
+        self.mode = mode
+        self._value = value
+
+    def value(self, v: int = None):
+        if v is None:
+            return self._value
+        self._value = v
+
+    def irq(self, handler=None, trigger: int = IRQ_FALLING):
+        self.handler = handler
+
+
+class MockSPI:
+    """
+    SPI bus that records every transaction instead of clocking it out
+    """
+    MSB = 0
+    LSB = 1
+
+    def __init__(self, spi_id: int, baudrate: int = 1_000_000, **kwargs):
+        self.id = spi_id
+        self.baudrate = baudrate
+        self.calls = 0
+        self.bytes = 0
+
+    def write(self, buf) -> None:
+        self.calls += 1
+        self.bytes += len(buf)
+
+    def reset_counters(self) -> None:
+        self.calls = 0
+        self.bytes = 0
+
+
+def _const(v):
+    return v
+
+
+def install_stubs() -> bool:
+    """
+    Install the mock modules if the real ones aren't available.
+    :return: True if running on the host with mocks installed
+    """
+    try:
+        import machine  # noqa: F401
+        return False
+    except ImportError:
+        pass
+
+    machine = type(sys)("machine")
+    machine.Pin = MockPin
+    machine.SPI = MockSPI
+    machine.idle = lambda: None
+    sys.modules["machine"] = machine
+
+    micropython = type(sys)("micropython")
+    micropython.const = _const
+    sys.modules["micropython"] = micropython
+
+    if not hasattr(time, "sleep_ms"):
+        time.sleep_ms = lambda ms: None
+        time.ticks_us = lambda: time.perf_counter_ns() // 1000
+        time.ticks_diff = lambda a, b: a - b
+
+    return True
+
+
+def add_src_to_path() -> None:
+    here = __file__.rsplit("/", 1)[0] if "/" in __file__ else "."
+    sys.path.insert(0, here + "/../src")
@@ -0,0 +1,60 @@
+"""
+In-memory IEPaperDisplay with the geometry of the 250x122 panel, for benchmarking drawing without a display attached
+"""
+from heltec_e_ink import IEPaperDisplay, PixelType, RefreshMode
+
+
+class StubDisplay(IEPaperDisplay):
+    def __init__(self, width_px: int = 122, height_px: int = 250):
+        self._width_px = width_px
+        self._height_px = height_px
+        self.bytes_sent = 0
+        self.refreshes = 0
+
+    @property
+    def supported_pixel_types(self) -> [PixelType]:
+        return [PixelType.BLACK_WHITE, PixelType.RED]
+
+    @property
+    def display_ready(self) -> bool:
+        return True
+
+    @property
+    def width_px(self) -> int:
+        return self._width_px
+
+    @property
+    def width_bytes(self) -> int:
+        return (self._width_px + 7) // 8
+
+    @property
+    def height_px(self) -> int:
+        return self._height_px
+
+    @property
+    def bits_per_pixel(self) -> int:
+        return 1
+
+    def initialize_display(self) -> None:
+        pass
+
+    def draw_pixel_absolute(self, buffer: bytearray, x: int, y: int, color: PixelType):
+        if x < 0 or x >= self.width_px or y < 0 or y >= self.height_px \
+                or color not in self.supported_pixel_types:
+            return
+        index = y * self.width_bytes + (x >> 3)
+
+        if color is PixelType.BLACK_WHITE:
+            buffer[index] &= ~(0b1000_0000 >> (x % 8))
+        else:
+            buffer[index] |= 0b1000_0000 >> (x % 8)
+
+    def set_pixels(self, pixel_type: PixelType, img_bytes: bytearray, start_byte: int = None) -> None:
+        self.bytes_sent += len(img_bytes)
+
+    def set_pixels_window(self, pixel_type: PixelType, img_bytes: bytearray, x_byte: int, y: int, width_bytes: int,
+                          height: int) -> None:
+        self.bytes_sent += len(img_bytes)
+
+    def refresh(self, mode: RefreshMode = RefreshMode.FULL) -> None:
+        self.refreshes += 1
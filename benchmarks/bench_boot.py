@@ -0,0 +1,114 @@
+"""
+Cold-boot time to first flush: how long it takes from importing heltec_e_ink to the first frame being in the display
+RAM, split into the steps a program goes through after reset.
+
+Run it as the first thing after a reset (e.g. `mpremote reset` then `mpremote run benchmarks/bench_boot.py`, with
+_host.py copied to the board), so nothing of the package is imported yet. On the board it drives the panel wired as
+in main.py; under CPython it uses the mock bus from _host, and the steps that wait on the panel measure only Python.
+Comparing a source install, a .mpy install (tools/build_mpy.py) and frozen firmware (manifest.py) shows what each
+saves at import.
+
+    python benchmarks/bench_boot.py [RESULTS.json]
+
+Allocations are the gc.mem_alloc() growth per step with the collector paused on MicroPython, and the tracemalloc
+growth under CPython.
+"""
+import sys
+
+from _host import install_stubs, add_src_to_path, MockPin, MockSPI
+
+add_src_to_path()
+ON_HOST = install_stubs()
+
+import gc
+import json
+import time
+
+if not hasattr(gc, "mem_alloc"):
+    import tracemalloc
+    tracemalloc.start()
+
+
+def allocated() -> int:
+    if hasattr(gc, "mem_alloc"):
+        return gc.mem_alloc()
+    return tracemalloc.get_traced_memory()[0]
+
+
+def boot() -> [(str, int, int)]:
+    """
+    Go from a cold import to the first flush
+    :return: (step, microseconds, bytes allocated) per step
+    """
+    steps = []
+    last = [time.ticks_us(), allocated()]
+
+    def step(name: str) -> None:
+        now = (time.ticks_us(), allocated())
+        steps.append((name, time.ticks_diff(now[0], last[0]), now[1] - last[1]))
+        last[0] = time.ticks_us()
+        last[1] = allocated()
+
+    import heltec_e_ink
+    from heltec_e_ink import connect_to_display, Displays, SerialInitInfo, EInkCanvas, PixelType
+    step("import")
+
+    init_info = SerialInitInfo(0, 19, 18, 20, 14, 15, 2_000_000)
+    if ON_HOST:
+        display = connect_to_display(Displays.QYEG0213RWS800, init_info, spi=MockSPI(0), pin_factory=MockPin)
+    else:
+        display = connect_to_display(Displays.QYEG0213RWS800, init_info)
+    step("connect")
+
+    display.initialize_display()
+    step("initialize")
+
+    canvas = EInkCanvas(display)
+    canvas.clear()
+    step("canvas")
+
+    canvas.draw_text(4, 4, "hello", PixelType.BLACK_WHITE)
+    canvas.draw_rectangle((0, 0), (121, 20), PixelType.RED)
+    step("draw")
+
+    canvas.flush()
+    display.flush_transfers()
+    step("flush")
+
+    return steps
+
+
+def main() -> int:
+    out_path = sys.argv[1] if len(sys.argv) > 1 else None
+
+    if "heltec_e_ink" in sys.modules:
+        print("heltec_e_ink is already imported; the import step won't be cold")
+    gc.collect()
+    if hasattr(gc, "mem_alloc"):
+        gc.disable()
+    try:
+        steps = boot()
+    finally:
+        gc.enable()
+
+    total_us = 0
+    total_alloc = 0
+    for (name, us, alloc) in steps:
+        total_us += us
+        total_alloc += alloc
+        print(f"{name:12} {us:>9} us {alloc:>8} B")
+    print(f"{'first flush':12} {total_us:>9} us {total_alloc:>8} B")
+    print(f"loaded from {sys.modules['heltec_e_ink'].__file__}, "
+          f"{len([m for m in sys.modules if m.startswith('heltec_e_ink')])} package modules imported")
+
+    if out_path is not None:
+        with open(out_path, "w") as f:
+            json.dump({"platform": sys.platform, "implementation": sys.implementation.name,
+                       "time_to_first_flush_us": total_us, "allocated_bytes": total_alloc,
+                       "steps": {name: {"us": us, "alloc_bytes": alloc} for (name, us, alloc) in steps}}, f)
+        print(f"wrote {out_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
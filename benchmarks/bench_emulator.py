@@ -0,0 +1,50 @@
+"""
+End-to-end throughput under CPython through the emulated controller: draw a frame, flush it through the full
+command protocol and refresh. Optionally saves the last frame with --png PATH.
+"""
+import sys
+
+from _host import add_src_to_path
+
+add_src_to_path()
+
+import time
+
+from heltec_e_ink import EInkCanvas, PixelType
+from heltec_e_ink.emulator import connect_to_emulator
+
+FRAMES = 20
+
+
+def draw_frame(canvas: EInkCanvas, n: int) -> None:
+    canvas.clear()
+    canvas.draw_rectangle((2, 2), (119, 247), PixelType.BLACK_WHITE)
+    canvas.draw_circle((60, 60), 25 + n % 10, PixelType.RED, filled=True)
+    canvas.draw_text(8, 120, f"FRAME {n}", PixelType.BLACK_WHITE)
+    canvas.draw_line((0, 249), (121, 140), PixelType.BLACK_WHITE)
+
+
+def main() -> int:
+    display, controller = connect_to_emulator()
+    display.initialize_display()
+    canvas = EInkCanvas(display)
+
+    start = time.perf_counter()
+    for n in range(FRAMES):
+        draw_frame(canvas, n)
+        canvas.flush(refresh=True)
+    elapsed = time.perf_counter() - start
+
+    shown = controller.planes()
+    matches = all(shown[p] == canvas.plane(p) for p in display.supported_pixel_types)
+    print(f"{FRAMES / elapsed:.1f} frames/s, {controller.bytes_received // FRAMES} bytes/frame, "
+          f"{controller.refresh_count} refreshes, panel matches canvas: {matches}")
+
+    if "--png" in sys.argv:
+        controller.save_png(sys.argv[sys.argv.index("--png") + 1])
+
+    return 0 if matches else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
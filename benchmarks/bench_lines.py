@@ -0,0 +1,75 @@
+"""
+Rasterize a few thousand random lines into an EInkCanvas backed by a stub display and report lines per second, next to
+the original floating-point rasterizer as a baseline.
+"""
+import sys
+
+from _host import install_stubs, add_src_to_path
+
+add_src_to_path()
+install_stubs()
+
+import random
+import time
+
+from heltec_e_ink import EInkCanvas, PixelType, Rotation
+from _stub_display import StubDisplay
+
+LINE_COUNT = 2000
+SEED = 2040
+
+
+def legacy_draw_line(canvas: EInkCanvas, p1: (int, int), p2: (int, int), color: PixelType):
+    """
+    The original float line stepper, kept as the comparison baseline
+    """
+    (x1, y1) = p1
+    (x2, y2) = p2
+    ld = round(((x2 - x1) ** 2 + (y2 - y1) ** 2) ** 0.5)
+    if ld == 0:
+        return
+    dx = (x2 - x1) / ld
+    dy = (y2 - y1) / ld
+    x = x1
+    y = y1
+    for _ in range(ld + 1):
+        canvas.draw_pixel(round(x), round(y), color)
+        x += dx
+        y += dy
+
+
+def random_lines(width: int, height: int) -> [((int, int), (int, int))]:
+    rng = random.Random(SEED) if hasattr(random, "Random") else random
+    lines = []
+    for i in range(LINE_COUNT):
+        p1 = (rng.randint(0, width - 1), rng.randint(0, height - 1))
+        if i % 4 == 0:
+            p2 = (rng.randint(0, width - 1), p1[1])
+        elif i % 4 == 1:
+            p2 = (p1[0], rng.randint(0, height - 1))
+        else:
+            p2 = (rng.randint(0, width - 1), rng.randint(0, height - 1))
+        lines.append((p1, p2))
+    return lines
+
+
+def bench(label: str, draw) -> None:
+    for rotation in (Rotation.ROTATE_0, Rotation.ROTATE_90):
+        canvas = EInkCanvas(StubDisplay(), rotation, diff_flush=False)
+        canvas.clear()
+        lines = random_lines(canvas.width_px, canvas.height_px)
+        start = time.ticks_us()
+        for (p1, p2) in lines:
+            draw(canvas, p1, p2, PixelType.BLACK_WHITE)
+        elapsed_us = max(time.ticks_diff(time.ticks_us(), start), 1)
+        print(f"{label} rotation={rotation}: {LINE_COUNT * 1_000_000 // elapsed_us} lines/s")
+
+
+def main() -> int:
+    bench("bresenham", lambda c, p1, p2, color: c.draw_line(p1, p2, color))
+    bench("legacy", legacy_draw_line)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
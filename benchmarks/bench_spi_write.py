@@ -0,0 +1,91 @@
+"""
+Measure the SPI cost of flushing a full frame through SerialInterface.write_command.
+
+Run on the host with `python benchmarks/bench_spi_write.py`, or copy the benchmarks directory to the board and run it
+there. Exits non-zero if a full flush needs more SPI transactions than BUDGET_CALLS_PER_FLUSH.
+"""
+import sys
+
+from _host import install_stubs, add_src_to_path
+
+add_src_to_path()
+ON_HOST = install_stubs()
+
+import time
+
+from heltec_e_ink import connect_to_display, Displays, SerialInitInfo, EInkCanvas
+
+# Per plane: the X/Y RAM counter writes (command + data each), then the write command and one data chunk
+BUDGET_CALLS_PER_FLUSH = 2 * (4 + 2)
+ITERATIONS = 5
+
+
+class CountingSPI:
+    """
+    Wraps a real or mocked SPI bus and counts transactions and bytes
+    """
+
+    def __init__(self, spi):
+        self._spi = spi
+        self.calls = 0
+        self.bytes = 0
+
+    def write(self, buf) -> None:
+        self.calls += 1
+        self.bytes += len(buf)
+        self._spi.write(buf)
+
+
+def legacy_write_command(iface, command: int, data=None) -> int:
+    """
+    The original one-transaction-per-byte write path, kept as the comparison baseline
+    """
+    if data is None:
+        data = b""
+    spi = iface._spi
+    iface.select_chip = True
+    iface.command_mode = True
+    spi.write(bytearray([command]))
+    iface.data_mode = len(data) > 0
+    for b in data:
+        iface.select_chip = True
+        spi.write(bytearray([b]))
+    iface.select_chip = False
+    return 1 + len(data)
+
+
+def run(label: str, display, canvas: EInkCanvas, spi: CountingSPI) -> int:
+    spi.calls = 0
+    spi.bytes = 0
+    start = time.ticks_us()
+    for _ in range(ITERATIONS):
+        canvas.flush()
+    elapsed_us = time.ticks_diff(time.ticks_us(), start)
+    calls = spi.calls // ITERATIONS
+    print(f"{label}: {calls} spi calls, {spi.bytes // ITERATIONS} bytes, {elapsed_us // ITERATIONS} us per flush")
+    return calls
+
+
+def main() -> int:
+    init_info = SerialInitInfo(0, 19, 18, 20, 14, 15, 2_000_000)
+    display = connect_to_display(Displays.QYEG0213RWS800, init_info)
+    iface = display._display_iface
+    spi = CountingSPI(iface._spi)
+    iface._spi = spi
+
+    canvas = EInkCanvas(display, diff_flush=False)
+    canvas.clear()
+
+    bulk_calls = run("bulk", display, canvas, spi)
+
+    iface.write_command = lambda command, data=None: legacy_write_command(iface, command, data)
+    run("per-byte", display, canvas, spi)
+
+    if bulk_calls > BUDGET_CALLS_PER_FLUSH:
+        print(f"FAIL: {bulk_calls} spi calls per flush exceeds budget of {BUDGET_CALLS_PER_FLUSH}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,292 @@
+"""
+Throughput and allocation benchmarks for the drawing primitives, canvas flush and Display.write.
+
+Runs under CPython (with the stubs from _host) or on the board under MicroPython. The display is the real driver on a
+counting mock SPI bus in both cases, so flush and write numbers measure the Python side only, not the bus clock.
+
+    python benchmarks/bench_suite.py [RESULTS.json] [--compare OLD.json]
+
+Results are printed, and written as JSON if a path is given: ops/sec and bytes allocated per op for each case. On
+MicroPython allocations are the gc.mem_alloc() growth per op with the collector paused; under CPython they are the
+tracemalloc peak per op. --compare prints the change against an earlier results file and exits non-zero if any case
+got more than REGRESSION_PERCENT slower (host timings are noisy; compare runs from the same machine).
+"""
+import sys
+
+from _host import install_stubs, add_src_to_path, MockPin, MockSPI
+
+add_src_to_path()
+ON_HOST = install_stubs()
+
+import gc
+import json
+import time
+
+from heltec_e_ink import connect_to_display, Displays, SerialInitInfo, EInkCanvas, Frame, \
+    FrameBufferCanvas, PixelType, Rotation
+
+REGRESSION_PERCENT = 20
+# Each case is timed until at least this long has passed, REPEATS times, keeping the best rate
+MIN_RUN_US = 100_000
+REPEATS = 3
+ALLOC_OPS = 8
+
+BW = PixelType.BLACK_WHITE
+RED = PixelType.RED
+
+
+def make_display():
+    init_info = SerialInitInfo(0, 19, 18, 20, 14, 15, 2_000_000)
+    return connect_to_display(Displays.QYEG0213RWS800, init_info, spi=MockSPI(0), pin_factory=MockPin)
+
+
+def make_canvas(rotation: int = Rotation.ROTATE_0, diff_flush: bool = False, canvas_type=EInkCanvas) -> EInkCanvas:
+    canvas = canvas_type(make_display(), rotation, diff_flush=diff_flush)
+    canvas.clear()
+    return canvas
+
+
+#
+# Cases: each returns a function performing one op
+#
+
+def case_clear():
+    canvas = make_canvas()
+    return lambda: canvas.clear()
+
+
+def case_draw_pixel(rotation: int):
+    canvas = make_canvas(rotation)
+    w = canvas.width_px
+    h = canvas.height_px
+    state = [0]
+
+    def op():
+        i = state[0]
+        canvas.draw_pixel(i % w, (i // w) % h, BW)
+        state[0] = i + 1
+    return op
+
+
+def case_draw_line(canvas_type=EInkCanvas):
+    canvas = make_canvas(canvas_type=canvas_type)
+    return lambda: canvas.draw_line((3, 7), (118, 241), BW)
+
+
+def case_draw_circle(filled: bool, canvas_type=EInkCanvas):
+    canvas = make_canvas(canvas_type=canvas_type)
+    return lambda: canvas.draw_circle((60, 125), 50, RED, filled)
+
+
+def case_draw_rectangle(filled: bool, canvas_type=EInkCanvas):
+    canvas = make_canvas(canvas_type=canvas_type)
+    return lambda: canvas.draw_rectangle((5, 10), (116, 239), BW, filled)
+
+
+def case_draw_buffer():
+    canvas = make_canvas()
+    frame = bytearray(len(canvas.plane(BW)))
+    return lambda: canvas.draw_buffer(BW, frame)
+
+
+def case_flush():
+    canvas = make_canvas()
+    return lambda: canvas.flush()
+
+
+def case_flush_diff():
+    canvas = make_canvas(diff_flush=True)
+    canvas.flush()
+    state = [0]
+
+    def op():
+        # Touch a single row so each flush has one short run to send
+        state[0] = (state[0] + 1) % 250
+        canvas.draw_pixel(state[0] % 122, state[0], BW)
+        canvas.flush()
+    return op
+
+
+def make_frame():
+    """
+    A typical screen (text and a few shapes on white) as a compressed frame, or None without tools/make_frame.py
+    """
+    try:
+        sys.path.insert(0, (__file__.rsplit("/", 1)[0] if "/" in __file__ else ".") + "/../tools")
+        from make_frame import pack
+    except ImportError:
+        return None
+
+    canvas = make_canvas()
+    canvas.draw_text(4, 4, "SHELF 12 ROW B", BW)
+    canvas.draw_text(4, 20, "PRICE 4.99", BW)
+    canvas.draw_rectangle((2, 2), (119, 247), BW)
+    canvas.draw_circle((60, 150), 30, RED, True)
+    return Frame(pack(canvas.display.width_bytes, canvas.display.height_px,
+                      [(p, bytes(canvas.plane(p))) for p in (BW, RED)]))
+
+
+def case_frame_send(frame: Frame):
+    display = make_display()
+    return lambda: frame.send(display)
+
+
+def case_frame_expand(frame: Frame):
+    canvas = make_canvas()
+    return lambda: canvas.draw_frame(frame)
+
+
+def case_set_pixels_raw():
+    # Baseline for frame_send: both raw planes
+    canvas = make_canvas()
+    display = canvas.display
+    planes = [(p, canvas.plane(p)) for p in (BW, RED)]
+
+    def op():
+        for (p, plane) in planes:
+            display.set_pixels(p, plane)
+    return op
+
+
+def case_display_write():
+    display = make_display()
+    data = [0x01, 0x00]
+    return lambda: display.write(0x4F, data)
+
+
+def case_display_write_plane():
+    display = make_display()
+    plane = memoryview(bytearray(display.width_bytes * display.height_px))
+    return lambda: display.write(0x24, plane)
+
+
+CASES = [
+    ("clear", case_clear),
+    ("draw_pixel_rot0", lambda: case_draw_pixel(Rotation.ROTATE_0)),
+    ("draw_pixel_rot90", lambda: case_draw_pixel(Rotation.ROTATE_90)),
+    ("draw_pixel_rot180", lambda: case_draw_pixel(Rotation.ROTATE_180)),
+    ("draw_pixel_rot270", lambda: case_draw_pixel(Rotation.ROTATE_270)),
+    ("draw_line", case_draw_line),
+    ("draw_circle_outline", lambda: case_draw_circle(False)),
+    ("draw_circle_filled", lambda: case_draw_circle(True)),
+    ("draw_rectangle_outline", lambda: case_draw_rectangle(False)),
+    ("draw_rectangle_filled", lambda: case_draw_rectangle(True)),
+    ("draw_buffer", case_draw_buffer),
+    ("flush", case_flush),
+    ("flush_diff_one_row", case_flush_diff),
+    ("display_write", case_display_write),
+    ("display_write_plane", case_display_write_plane),
+    ("set_pixels_raw", case_set_pixels_raw),
+    # FrameBufferCanvas falls back to the EInkCanvas primitives where framebuf is missing (under CPython)
+    ("fb_draw_line", lambda: case_draw_line(FrameBufferCanvas)),
+    ("fb_draw_circle_filled", lambda: case_draw_circle(True, FrameBufferCanvas)),
+    ("fb_draw_rectangle_filled", lambda: case_draw_rectangle(True, FrameBufferCanvas)),
+]
+
+FRAME = make_frame()
+if FRAME is not None:
+    CASES.append(("frame_send", lambda: case_frame_send(FRAME)))
+    CASES.append(("frame_expand", lambda: case_frame_expand(FRAME)))
+
+
+#
+# Measurement
+#
+
+def ops_per_sec(op) -> (int, int):
+    op()
+    best = (0, 0)
+    for _ in range(REPEATS):
+        best = max(best, timed_run(op))
+    return best
+
+
+def timed_run(op) -> (int, int):
+    iterations = 0
+    batch = 1
+    start = time.ticks_us()
+    while True:
+        for _ in range(batch):
+            op()
+        iterations += batch
+        elapsed_us = time.ticks_diff(time.ticks_us(), start)
+        if elapsed_us >= MIN_RUN_US:
+            return (iterations * 1_000_000 // max(elapsed_us, 1), iterations)
+        batch *= 2
+
+
+def alloc_per_op(op) -> int:
+    gc.collect()
+    if hasattr(gc, "mem_alloc"):
+        gc.disable()
+        try:
+            before = gc.mem_alloc()
+            for _ in range(ALLOC_OPS):
+                op()
+            return (gc.mem_alloc() - before) // ALLOC_OPS
+        finally:
+            gc.enable()
+
+    import tracemalloc
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        for _ in range(ALLOC_OPS):
+            op()
+        return max(tracemalloc.get_traced_memory()[1] - base, 0) // ALLOC_OPS
+    finally:
+        tracemalloc.stop()
+
+
+def run() -> dict:
+    results = {}
+    for (name, make_op) in CASES:
+        op = make_op()
+        (rate, iterations) = ops_per_sec(op)
+        alloc = alloc_per_op(op)
+        results[name] = {"ops_per_sec": rate, "alloc_bytes_per_op": alloc, "iterations": iterations}
+        print(f"{name:24} {rate:>10} ops/s {alloc:>8} B/op")
+        gc.collect()
+    return results
+
+
+def compare(results: dict, old_path: str) -> int:
+    with open(old_path) as f:
+        old = json.load(f)["results"]
+    regressions = 0
+    for (name, now) in results.items():
+        if name not in old or not old[name]["ops_per_sec"]:
+            continue
+        change = (now["ops_per_sec"] - old[name]["ops_per_sec"]) * 100 // old[name]["ops_per_sec"]
+        flag = ""
+        if change < -REGRESSION_PERCENT:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(f"{name:24} {change:>+5}% ops/s, {now['alloc_bytes_per_op'] - old[name]['alloc_bytes_per_op']:>+6} B/op"
+              + flag)
+    return regressions
+
+
+def main() -> int:
+    args = sys.argv[1:]
+    old_path = None
+    if "--compare" in args:
+        i = args.index("--compare")
+        old_path = args[i + 1]
+        args = args[:i] + args[i + 2:]
+    out_path = args[0] if args else None
+
+    results = run()
+    if out_path is not None:
+        with open(out_path, "w") as f:
+            json.dump({"platform": sys.platform, "implementation": sys.implementation.name,
+                       "version": ".".join(str(v) for v in sys.implementation.version[:3]), "results": results}, f)
+        print(f"wrote {out_path}")
+
+    if old_path is not None and compare(results, old_path):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,48 @@
+"""
+Redraw a screen full of text with the built-in font and report the time per screen, cold and with a warm glyph cache
+"""
+import sys
+
+from _host import install_stubs, add_src_to_path
+
+add_src_to_path()
+install_stubs()
+
+import time
+
+from heltec_e_ink import EInkCanvas, PixelType, Rotation
+from _stub_display import StubDisplay
+
+SCREENS = 10
+LINE = "TEMP 21.5C RH 48%"
+
+
+def draw_screen(canvas: EInkCanvas) -> int:
+    chars = 0
+    for y in range(0, 240, 8):
+        canvas.draw_text(0, y, LINE, PixelType.BLACK_WHITE)
+        chars += len(LINE)
+    return chars
+
+
+def main() -> int:
+    for rotation in (Rotation.ROTATE_0, Rotation.ROTATE_90):
+        canvas = EInkCanvas(StubDisplay(), rotation, diff_flush=False)
+        canvas.clear()
+
+        start = time.ticks_us()
+        chars = draw_screen(canvas)
+        cold_us = time.ticks_diff(time.ticks_us(), start)
+
+        start = time.ticks_us()
+        for _ in range(SCREENS):
+            canvas.clear()
+            draw_screen(canvas)
+        warm_us = time.ticks_diff(time.ticks_us(), start) // SCREENS
+
+        print(f"rotation={rotation}: {chars} chars, cold {cold_us} us, warm {warm_us} us per screen")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""
+Check that writing pixel data doesn't allocate in proportion to its size: Display.write and set_pixels must pass the
+plane to the SPI bus as it is, and a full canvas flush must allocate far less than a copy of one plane. So must a diff
+flush, whether one row of the dirty frame changed or all of them.
+
+Runs under CPython (with the stubs from _host; allocations are tracemalloc peaks, so short-lived per-row buffers don't
+add up) or on the board (gc.mem_alloc() growth with the collector paused, which counts every one). Exits non-zero on
+failure.
+
+    python benchmarks/check_alloc.py
+"""
+import sys
+
+from _host import install_stubs, add_src_to_path, MockPin, MockSPI
+
+add_src_to_path()
+install_stubs()
+
+import gc
+
+from heltec_e_ink import connect_to_display, Displays, SerialInitInfo, EInkCanvas, PixelType
+
+# Allowed difference between sending one row and the whole plane, for bookkeeping that isn't per-byte (under CPython,
+# e.g. byte counts that no longer fit a cached small int)
+SLACK_BYTES = 128
+# A full flush of both planes; a single copy of one plane would be 4000 bytes
+FLUSH_BUDGET_BYTES = 512
+# A diff flush adds views of the plane and its shadow (a few hundred bytes each under CPython), but nothing per row
+DIFF_FLUSH_BUDGET_BYTES = 2048
+ROUNDS = 8
+
+
+def allocated_by(op) -> int:
+    """
+    Bytes allocated by one call of op: the least over ROUNDS calls, so one-off allocations (caches filling) don't count
+    """
+    op()
+    gc.collect()
+    least = None
+    if hasattr(gc, "mem_alloc"):
+        gc.disable()
+        try:
+            for _ in range(ROUNDS):
+                before = gc.mem_alloc()
+                op()
+                least = _min(least, gc.mem_alloc() - before)
+        finally:
+            gc.enable()
+        return least
+
+    import tracemalloc
+    tracemalloc.start()
+    try:
+        for _ in range(ROUNDS):
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            op()
+            least = _min(least, tracemalloc.get_traced_memory()[1] - base)
+    finally:
+        tracemalloc.stop()
+    return least
+
+
+def _min(a: int, b: int) -> int:
+    return b if a is None or b < a else a
+
+
+def main() -> int:
+    init_info = SerialInitInfo(0, 19, 18, 20, 14, 15, 2_000_000)
+    display = connect_to_display(Displays.QYEG0213RWS800, init_info, spi=MockSPI(0), pin_factory=MockPin)
+    plane_bytes = display.width_bytes * display.height_px
+    plane = memoryview(bytearray(plane_bytes))
+    row = plane[0:display.width_bytes]
+    failures = 0
+
+    for (name, send) in (("write", lambda data: display.write(0x24, data)),
+                         ("set_pixels", lambda data: display.set_pixels(PixelType.BLACK_WHITE, data))):
+        small = allocated_by(lambda: send(row))
+        large = allocated_by(lambda: send(plane))
+        ok = large - small <= SLACK_BYTES
+        failures += not ok
+        print(f"{name:12} {len(row):>5} B: {small:>5} B allocated, {plane_bytes} B: {large:>5} B allocated"
+              + ("" if ok else "  FAIL: grows with the data"))
+
+    canvas = EInkCanvas(display, diff_flush=False)
+    canvas.clear()
+    flush = allocated_by(canvas.flush)
+    ok = flush <= FLUSH_BUDGET_BYTES
+    failures += not ok
+    print(f"{'flush':12} {flush:>5} B allocated" + ("" if ok else f"  FAIL: over {FLUSH_BUDGET_BYTES} B"))
+
+    # The default canvas compares every dirty row with what it sent last; drawing a whole plane dirties them all
+    canvas = EInkCanvas(display)
+    white = bytearray(b"\xff" * plane_bytes)
+    one_row = bytearray(white)
+    one_row[plane_bytes // 2] = 0x00
+    inverted = bytearray(plane_bytes)
+    diffs = []
+    for (name, changed) in (("diff 1 row", one_row), ("diff all", inverted)):
+        canvas.draw_buffer(PixelType.BLACK_WHITE, white)
+        canvas.flush()
+        frames = [white, changed]
+
+        def flush_change():
+            frames.reverse()
+            canvas.draw_buffer(PixelType.BLACK_WHITE, frames[0])
+            canvas.flush()
+
+        flush = allocated_by(flush_change)
+        diffs.append(flush)
+        ok = flush <= DIFF_FLUSH_BUDGET_BYTES
+        failures += not ok
+        print(f"{name:12} {flush:>5} B allocated" + ("" if ok else f"  FAIL: over {DIFF_FLUSH_BUDGET_BYTES} B"))
+
+    ok = diffs[1] - diffs[0] <= SLACK_BYTES
+    failures += not ok
+    if not ok:
+        print(f"{'diff':12} FAIL: grows with the rows that changed")
+
+    print("OK" if failures == 0 else f"{failures} failures")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
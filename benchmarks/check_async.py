@@ -0,0 +1,139 @@
+"""
+Run the asyncio variants against the emulated controller and check they leave the panel as the blocking calls do:
+initialize_display_async, refresh_async, RefreshPipeline, SharedSPIBus.show_async and PowerManager.apply_async.
+
+    python benchmarks/check_async.py
+"""
+import sys
+
+from _host import add_src_to_path
+
+add_src_to_path()
+
+import asyncio
+import threading
+
+from heltec_e_ink import EInkCanvas, PixelType, PowerManager, RefreshPipeline, connect_to_display
+from heltec_e_ink.emulator import connect_to_emulator, connect_to_emulated_bus
+
+BW = PixelType.BLACK_WHITE
+RED = PixelType.RED
+
+
+def draw(canvas: EInkCanvas, n: int) -> None:
+    canvas.clear()
+    canvas.draw_rectangle((2, 2), (119, 40 + n), BW, filled=True)
+    canvas.draw_circle((60, 120), 20 + n, RED)
+
+
+def expected(n: int) -> dict:
+    display, controller = connect_to_emulator()
+    display.initialize_display()
+    canvas = EInkCanvas(display)
+    draw(canvas, n)
+    canvas.flush(refresh=True)
+    return controller.planes()
+
+
+async def check_display() -> bool:
+    display, controller = connect_to_emulator()
+    await display.initialize_display_async()
+    canvas = EInkCanvas(display)
+    draw(canvas, 1)
+    canvas.flush()
+    await display.refresh_async()
+    return controller.planes() == expected(1)
+
+
+async def check_pipeline() -> bool:
+    display, controller = connect_to_emulator()
+    display.initialize_display()
+    canvas = EInkCanvas(display)
+    pipeline = RefreshPipeline(canvas)
+    task = asyncio.create_task(pipeline.run())
+    for n in range(3):
+        draw(canvas, n)
+        pipeline.submit()
+        await asyncio.sleep(0)
+    await pipeline.wait_idle()
+    ok = controller.planes() == expected(2)
+
+    # Going back to a frame the canvas flushed before the pipeline sent its own must still reach the panel
+    canvas.flush()
+    draw(canvas, 0)
+    pipeline.submit()
+    await pipeline.wait_idle()
+    task.cancel()
+    draw(canvas, 2)
+    ok = ok and canvas.flush(refresh=True)
+    return ok and controller.planes() == expected(2)
+
+
+async def check_bus() -> bool:
+    (bus, displays, controllers) = connect_to_emulated_bus(2)
+    bus.initialize_all()
+    canvases = [EInkCanvas(d) for d in displays]
+    for (n, canvas) in enumerate(canvases):
+        draw(canvas, n)
+    await bus.show_async(canvases)
+    ok = all(c.planes() == expected(n) for (n, c) in enumerate(controllers))
+
+    # A panel still busy with an earlier refresh must be waited for without blocking the event loop: another task
+    # ends that refresh. Should show_async block instead, a timer ends it so the check fails rather than hangs.
+    busy = controllers[0]._busy
+    ended_by = []
+
+    def end_refresh(by: str) -> None:
+        if busy.value():
+            ended_by.append(by)
+            busy.value(0)
+
+    async def other_task() -> None:
+        await asyncio.sleep(0.01)
+        end_refresh("task")
+
+    busy.value(1)
+    timer = threading.Timer(1.0, end_refresh, ("timer",))
+    timer.start()
+    task = asyncio.create_task(other_task())
+    for (n, canvas) in enumerate(canvases):
+        draw(canvas, n + 1)
+    await bus.show_async(canvases)
+    timer.cancel()
+    await task
+    return ok and ended_by == ["task"] \
+        and all(c.planes() == expected(n + 1) for (n, c) in enumerate(controllers))
+
+
+async def check_power() -> bool:
+    display, controller = connect_to_emulator()
+    canvas = EInkCanvas(display)
+    power = PowerManager(display, canvas)
+    for n in range(2):
+        power.submit(lambda c, n=n: draw(c, n))
+        await power.apply_async()
+    ok = controller.planes() == expected(1) and controller.deep_sleep != 0
+
+    # The MCU reboots with the panel still in deep sleep: a fresh display and manager must reset it before anything
+    display = connect_to_display(0, controller._init_info, spi=controller, pin_factory=controller.pin_factory)
+    canvas = EInkCanvas(display)
+    power = PowerManager(display, canvas)
+    resets = controller.hardware_resets
+    refreshes = controller.refresh_count
+    power.submit(lambda c: draw(c, 2))
+    ok = ok and await power.apply_async()
+    return ok and controller.hardware_resets > resets and controller.refresh_count > refreshes \
+        and controller.planes() == expected(2)
+
+
+def main() -> int:
+    failures = 0
+    for check in (check_display, check_pipeline, check_bus, check_power):
+        ok = asyncio.run(check())
+        failures += not ok
+        print(f"{check.__name__:16} {'OK' if ok else 'FAIL'}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
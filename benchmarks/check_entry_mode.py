@@ -0,0 +1,114 @@
+"""
+Check that the SSD1680 driver addresses the RAM by the data entry mode in the panel's init blob: the stock profile
+(Y counting down) and a copy set up with Y counting up must both leave the emulated panel showing exactly the canvas,
+through full, diff and windowed flushes. A blob that doesn't count X up before Y must be rejected.
+
+The emulator takes its geometry from the profile too, so a panel that exists only as a new profile (here a 128x296
+black/white one at RAM X 0) is checked the same way.
+
+    python benchmarks/check_entry_mode.py
+"""
+import sys
+
+from _host import add_src_to_path
+
+add_src_to_path()
+
+from heltec_e_ink import EInkCanvas, PanelProfile, PixelType
+from heltec_e_ink.displays.heltec_250_122_bwr_QYEG0213RWS800 import PROFILE
+from heltec_e_ink.emulator import connect_to_emulator
+
+BW = PixelType.BLACK_WHITE
+RED = PixelType.RED
+
+
+def with_init(profile: PanelProfile, name: str, changes: {int: bytes}, width_px: int = None, height_px: int = None,
+              planes: ((PixelType, int),) = None, ram_x_offset: int = None) -> PanelProfile:
+    """
+    A copy of a profile whose init blob has the data of the given commands replaced, and optionally other geometry
+    """
+    blob = bytearray()
+    i = 0
+    while i < len(profile.init):
+        n = profile.init[i]
+        command = profile.init[i + 1]
+        data = changes.get(command, profile.init[i + 2:i + 1 + n])
+        blob += bytes((len(data) + 1, command)) + data
+        i += 1 + n
+    return PanelProfile(name, profile.driver, width_px or profile.width_px, height_px or profile.height_px,
+                        planes or profile.planes, bytes(blob), profile.refresh_modes,
+                        profile.ram_x_offset if ram_x_offset is None else ram_x_offset, profile.reset_delay_ms)
+
+
+# Y counts up from the top row at RAM Y 0
+Y_UP = with_init(PROFILE, "QYEG0213RWS800 (Y up)", {
+    0x11: b"\x03",
+    0x45: b"\x00\x00\xf9\x00",
+    0x4F: b"\x00\x00",
+})
+# 128x296 black/white panel whose columns start at RAM X 0
+BW_296 = with_init(PROFILE, "128x296 BW", {
+    0x01: b"\x27\x01\x00",
+    0x44: b"\x00\x0f",
+    0x45: b"\x27\x01\x00\x00",
+    0x4E: b"\x00",
+    0x4F: b"\x27\x01",
+}, width_px=128, height_px=296, planes=((BW, 0x24),), ram_x_offset=0)
+# Y advances before X
+Y_FIRST = with_init(PROFILE, "QYEG0213RWS800 (Y first)", {0x11: b"\x07"})
+
+
+def matches(controller, canvas: EInkCanvas, display) -> bool:
+    shown = controller.planes()
+    return all(shown[p] == canvas.plane(p) for p in display.supported_pixel_types)
+
+
+def check(profile: PanelProfile) -> [(str, bool)]:
+    display, controller = connect_to_emulator(profile)
+    display.initialize_display()
+    canvas = EInkCanvas(display)
+    (w, h) = (profile.width_px, profile.height_px)
+    red = RED if RED in display.supported_pixel_types else BW
+    results = []
+
+    canvas.clear()
+    canvas.draw_text(4, 4, "TOP", BW)
+    canvas.draw_circle((60, 200), 20, red, filled=True)
+    canvas.flush(refresh=True)
+    results.append(("full", matches(controller, canvas, display)))
+
+    canvas.draw_rectangle((10, 100), (50, 110), BW, filled=True)
+    canvas.flush(refresh=True)
+    results.append(("diff", matches(controller, canvas, display)))
+
+    canvas.draw_line((0, h - 1), (w - 1, h - 100), BW)
+    canvas.flush_partial()
+    results.append(("window", matches(controller, canvas, display)))
+
+    # A full plane after the window must go back to the whole frame
+    canvas.draw_text(4, h - 10, "BOTTOM", red)
+    canvas.invalidate()
+    canvas.flush(refresh=True)
+    results.append(("reframe", matches(controller, canvas, display)))
+    return results
+
+
+def main() -> int:
+    failures = 0
+    for profile in (PROFILE, Y_UP, BW_296):
+        for (name, ok) in check(profile):
+            failures += not ok
+            print(f"{profile.name:26} {name:8} {'OK' if ok else 'FAIL'}")
+
+    try:
+        connect_to_emulator(Y_FIRST)
+        rejected = False
+    except Exception:
+        rejected = True
+    failures += not rejected
+    print(f"{Y_FIRST.name:26} {'rejected' if rejected else 'ACCEPTED'}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+"""
+Check that the compiled drawing kernels produce the same buffers as the Python reference versions, on random rows.
+
+On the board this compares the viper kernels heltec_e_ink picked at import against the Python ones and times both.
+Under CPython there is no viper emitter, so the viper source is run as plain Python instead (with ptr8 as the
+identity and micropython.viper as a no-op decorator): that checks the kernels' logic, though not the emitter.
+
+    python benchmarks/check_kernels.py
+"""
+import sys
+
+from _host import add_src_to_path
+
+add_src_to_path()
+
+import random
+import time
+
+from heltec_e_ink import _kernels
+
+ROUNDS = 2000
+SEED = 2040
+
+
+def viper_as_python():
+    """
+    Load _kernels_viper as ordinary Python, for hosts without the viper emitter
+    """
+    micropython = type(sys)("micropython")
+    micropython.viper = lambda f: f
+    saved = sys.modules.get("micropython")
+    sys.modules["micropython"] = micropython
+    try:
+        sys.modules.pop("heltec_e_ink._kernels_viper", None)
+        from heltec_e_ink import _kernels_viper
+        _kernels_viper.ptr8 = lambda buf: buf
+        return _kernels_viper
+    finally:
+        if saved is None:
+            del sys.modules["micropython"]
+        else:
+            sys.modules["micropython"] = saved
+
+
+def random_bytes(rng, n: int) -> bytearray:
+    return bytearray(rng.getrandbits(8) for _ in range(n))
+
+
+def check(kernels) -> int:
+    rng = random.Random(SEED) if hasattr(random, "Random") else random
+    failures = 0
+    for _ in range(ROUNDS):
+        count = rng.randint(1, 24)
+        src = random_bytes(rng, count + 1)
+        mask = random_bytes(rng, count)
+        dst = random_bytes(rng, count + 1)
+        ink = rng.choice((0x00, 0xFF))
+        edge = rng.choice((0xFF, 0xC0, 0xFC))
+        shift = rng.randint(0, 7)
+
+        for (name, args) in (("blit_row", (src, count, (ink << 8) | edge)),
+                             ("blit_row_masked", (src, mask, (count << 16) | (ink << 8) | edge))):
+            expected = bytearray(dst)
+            actual = bytearray(dst)
+            getattr(_kernels, "py_" + name)(memoryview(expected), *args)
+            getattr(kernels, name)(memoryview(actual), *args)
+            if expected != actual:
+                failures += 1
+                print(f"FAIL {name}: {bytes(expected).hex()} != {bytes(actual).hex()}")
+
+        expected = bytearray(count + 1)
+        actual = bytearray(count + 1)
+        _kernels.py_shift_row(src, expected, count, (edge << 8) | shift)
+        kernels.shift_row(src, actual, count, (edge << 8) | shift)
+        if expected != actual:
+            failures += 1
+            print(f"FAIL shift_row: {bytes(expected).hex()} != {bytes(actual).hex()}")
+
+        # Planes that differ in a few random bytes, scanned from a random row
+        rows = rng.randint(1, 12)
+        a = random_bytes(rng, rows * count)
+        b = bytearray(a)
+        for _ in range(rng.randint(0, 3)):
+            b[rng.randrange(len(b))] ^= 1 << rng.randint(0, 7)
+        row = rng.randint(0, rows)
+        end_width = (rows << 16) | count
+        expected = _kernels.py_next_changed_row(a, b, row, end_width)
+        actual = kernels.next_changed_row(a, b, row, end_width)
+        first = next((y for y in range(row, rows) if a[y * count:(y + 1) * count] != b[y * count:(y + 1) * count]),
+                     rows)
+        if not expected == actual == first:
+            failures += 1
+            print(f"FAIL next_changed_row: {first} expected, {expected} (python), {actual}")
+    return failures
+
+
+def bench(label: str, blit_row) -> None:
+    dst = memoryview(bytearray(16))
+    src = memoryview(bytearray(b"\x5a" * 16))
+    start = time.ticks_us() if hasattr(time, "ticks_us") else time.perf_counter_ns() // 1000
+    for _ in range(ROUNDS):
+        blit_row(dst, src, 16, 0xFFFF)
+    end = time.ticks_us() if hasattr(time, "ticks_us") else time.perf_counter_ns() // 1000
+    print(f"{label}: {ROUNDS * 1_000_000 // max(end - start, 1)} 16-byte rows/s")
+
+
+def main() -> int:
+    if _kernels.NATIVE:
+        kernels = _kernels
+        print("checking viper kernels")
+        bench("viper", _kernels.blit_row)
+        bench("python", _kernels.py_blit_row)
+    else:
+        kernels = viper_as_python()
+        print("no viper emitter; checking the viper source as Python")
+
+    failures = check(kernels)
+    print("OK" if failures == 0 else f"{failures} mismatches")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""
+Check that the dirty tracking covers everything the primitives draw: random scenes (lines, outlined and filled
+rectangles and circles, pixels, text and blits, partly off the canvas, in every rotation) are flushed through the
+emulated controller with diff flushes and windowed partial flushes, and after each one the panel must show exactly
+the canvas planes. A primitive that changes pixels outside the window it marks dirty leaves them unsent.
+
+    python benchmarks/check_scenes.py
+"""
+import sys
+
+from _host import add_src_to_path
+
+add_src_to_path()
+
+import random
+
+from heltec_e_ink import EInkCanvas, Image, PixelType, Rotation
+from heltec_e_ink.emulator import connect_to_emulator
+
+SCENES = 40
+SHAPES_PER_SCENE = 6
+SEED = 2040
+COLORS = (PixelType.BLACK_WHITE, PixelType.RED)
+
+
+def point(rng, canvas: EInkCanvas) -> (int, int):
+    # Reaches past every edge, so clipping is exercised too
+    return rng.randint(-40, canvas.width_px + 40), rng.randint(-40, canvas.height_px + 40)
+
+
+def draw_shape(rng, canvas: EInkCanvas, image: Image) -> None:
+    color = rng.choice(COLORS)
+    kind = rng.randrange(6)
+    if kind == 0:
+        canvas.draw_line(point(rng, canvas), point(rng, canvas), color)
+    elif kind == 1:
+        canvas.draw_rectangle(point(rng, canvas), point(rng, canvas), color, filled=rng.random() < 0.5)
+    elif kind == 2:
+        canvas.draw_circle(point(rng, canvas), rng.randint(1, 60), color, filled=rng.random() < 0.5)
+    elif kind == 3:
+        (x, y) = point(rng, canvas)
+        canvas.draw_pixel(x, y, color)
+    elif kind == 4:
+        (x, y) = point(rng, canvas)
+        canvas.draw_text(x, y, "Scene 42", color)
+    else:
+        (x, y) = point(rng, canvas)
+        canvas.blit(image, x, y, color)
+
+
+def main() -> int:
+    rng = random.Random(SEED)
+    image = Image(21, 13, bytearray(rng.getrandbits(8) for _ in range(3 * 13)))
+    failures = 0
+
+    for rotation in (Rotation.ROTATE_0, Rotation.ROTATE_90, Rotation.ROTATE_180, Rotation.ROTATE_270):
+        display, controller = connect_to_emulator()
+        display.initialize_display()
+        canvas = EInkCanvas(display, rotation)
+        canvas.clear()
+        canvas.flush(refresh=True)
+
+        for scene in range(SCENES):
+            if rng.random() < 0.3:
+                canvas.clear()
+            for _ in range(SHAPES_PER_SCENE):
+                draw_shape(rng, canvas, image)
+
+            if scene % 2:
+                canvas.flush_partial()
+            else:
+                canvas.flush(refresh=True)
+
+            shown = controller.planes()
+            for p in display.supported_pixel_types:
+                if shown[p] != canvas.plane(p):
+                    failures += 1
+                    print(f"FAIL rotation {rotation} scene {scene}: the panel's {p} plane differs from the canvas")
+
+    print("OK" if failures == 0 else f"{failures} mismatches")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
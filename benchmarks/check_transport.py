@@ -0,0 +1,95 @@
+"""
+Check that writes queued on a transport leave the emulated controller exactly as direct writes do, including when the
+canvas is drawn on while its last flush is still queued. FakeTransport stands in for the DMA: it sends a data phase
+only when the next write needs the queue to move, so queued data is read as late as it would be on the board. A
+transport whose writes never complete must make flushing raise rather than hang.
+
+FakeTransport completes its writes by hand, so the DMA interrupt itself is only exercised on the board by
+benchmarks/smoke_dma.py.
+
+    python benchmarks/check_transport.py
+"""
+import sys
+
+from _host import add_src_to_path
+
+add_src_to_path()
+
+from heltec_e_ink import BandedCanvas, EInkCanvas, FakeTransport, PixelType
+from heltec_e_ink.emulator import connect_to_emulator
+
+BW = PixelType.BLACK_WHITE
+RED = PixelType.RED
+
+
+def scenario(display) -> None:
+    canvas = EInkCanvas(display)
+    canvas.clear()
+    canvas.flush(refresh=True)
+    # Drawn while the cleared planes may still be queued
+    canvas.draw_rectangle((10, 10), (100, 200), BW, filled=True)
+    canvas.draw_circle((60, 60), 30, RED, filled=True)
+    canvas.flush(refresh=True)
+    canvas.draw_text(4, 220, "queued", BW)
+    canvas.draw_rectangle((0, 0), (121, 249), RED)
+    canvas.flush(refresh=True)
+
+    banded = BandedCanvas(display, band_rows=32)
+    banded.render(lambda c: c.draw_line((0, 0), (121, 249), BW), refresh=True)
+    display.flush_transfers()
+
+
+def run(queued: bool):
+    display, controller = connect_to_emulator()
+    display.initialize_display()
+    transport = None
+    if queued:
+        transport = FakeTransport(display._display_iface, depth=4)
+        display._display_iface.transport = transport
+    scenario(display)
+    return controller, transport
+
+
+class StalledTransport(FakeTransport):
+    """
+    A transport whose data phases never complete, as with a DMA channel whose interrupt doesn't fire
+    """
+
+    def _wait_for_completion(self) -> None:
+        pass
+
+
+def stalled_flush_raises() -> bool:
+    display, _ = connect_to_emulator()
+    display.initialize_display()
+    display._display_iface.transport = StalledTransport(display._display_iface, depth=4, timeout_ms=50)
+    canvas = EInkCanvas(display)
+    try:
+        canvas.flush()
+        display.flush_transfers()
+    except Exception:
+        return True
+    return False
+
+
+def main() -> int:
+    (direct, _) = run(False)
+    (queued, transport) = run(True)
+
+    checks = (
+        ("ram", queued.ram == direct.ram),
+        ("shown", queued.shown == direct.shown),
+        ("commands", queued.command_counts == direct.command_counts),
+        ("refreshes", queued.refresh_count == direct.refresh_count),
+        ("timeout", stalled_flush_raises()),
+    )
+    failures = 0
+    for (name, ok) in checks:
+        failures += not ok
+        print(f"{name:10} {'OK' if ok else 'FAIL'}")
+    print(f"{transport.completed} writes went through the queue")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
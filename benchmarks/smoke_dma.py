@@ -0,0 +1,62 @@
+"""
+Board smoke test for DmaTransport: flush a frame through the DMA queue and check that every write completes, i.e. that
+the end-of-transfer interrupt fires and advances the queue. A transport that stalls raises after its timeout_ms
+instead of hanging, and is reported as a failure.
+
+Needs MicroPython with rp2.DMA and the panel wired as in main.py; no host check can stand in for it, since
+FakeTransport completes its writes by hand.
+
+    mpremote cp -r src/heltec_e_ink :
+    mpremote run benchmarks/smoke_dma.py
+
+On success the panel shows a filled rectangle and a red circle, and the script prints OK.
+"""
+import sys
+import time
+
+from heltec_e_ink import connect_to_display, Displays, SerialInitInfo, EInkCanvas, DmaTransport, PixelType
+
+
+def main() -> int:
+    init_info = SerialInitInfo(0, 19, 18, 20, 14, 15, 2_000_000)
+    display = connect_to_display(Displays.QYEG0213RWS800, init_info)
+    display.initialize_display()
+
+    iface = display._display_iface
+    transport = DmaTransport(iface, timeout_ms=500)
+    iface.transport = transport
+
+    canvas = EInkCanvas(display)
+    canvas.clear()
+    canvas.draw_rectangle((10, 10), (60, 120), PixelType.BLACK_WHITE, filled=True)
+    canvas.draw_circle((90, 180), 20, PixelType.RED, filled=True)
+
+    failures = 0
+    start = time.ticks_ms()
+    try:
+        canvas.flush()
+        # Drawing while the planes are queued has to wait for the DMA, not spin forever
+        canvas.draw_line((0, 0), (121, 249), PixelType.BLACK_WHITE)
+        canvas.flush(refresh=True)
+        display.flush_transfers()
+    except Exception as e:
+        failures += 1
+        print(f"FAIL: {e}")
+    elapsed = time.ticks_diff(time.ticks_ms(), start)
+
+    if not transport.idle:
+        failures += 1
+        print("FAIL: writes still queued")
+    print(f"{transport.completed} writes completed in {elapsed} ms")
+
+    if transport.idle:
+        display.wait_until_ready()
+        transport.close()
+    iface.transport = None
+
+    print("OK" if failures == 0 else f"{failures} failures")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
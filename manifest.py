@@ -0,0 +1,9 @@
+# Freezes heltec_e_ink into a MicroPython firmware image, so it is imported from flash as bytecode instead of being
+# compiled from source on the board at every boot:
+#
+#   make -C ports/rp2 BOARD=RPI_PICO FROZEN_MANIFEST=/path/to/heltec-e-ink-rp2040/manifest.py
+#
+# Frozen modules cost no RAM until imported, so the host-only emulator can ride along.
+include("$(PORT_DIR)/boards/manifest.py")
+
+package("heltec_e_ink", base_path="src", opt=3)
@@ -1,24 +1,73 @@
-from ._display_interface import IEPaperDisplay, PixelType
-from ._serial_interface import SerialInitInfo
-from ._drawing import EInkCanvas, Rotation
+from ._display_interface import IEPaperDisplay, PixelType, RefreshMode, Rotation
+from ._profile import PanelProfile
+from ._serial_interface import SerialInitInfo, DmaTransport, FakeTransport
+# Imported up front, as it always was, so `from heltec_e_ink import *` still gets it on MicroPython too
+from ._drawing import EInkCanvas
+
+# Everything else is imported on first use through the module __getattr__ (MicroPython 1.12+ on the RP2040 port), so
+# importing the package only loads what connecting to a display and drawing on it needs
+_LAZY_MODULES = {
+    "BandedCanvas": "_banded",
+    "FrameBufferCanvas": "_fbcanvas",
+    "RefreshPipeline": "_pipeline",
+    "SharedSPIBus": "_bus",
+    "PowerManager": "_power",
+    "PowerState": "_power",
+    "Stats": "_stats",
+    "Font": "_font",
+    "Image": "_image",
+    "ImageFile": "_image",
+    "Frame": "_frame",
+}
+
+
+def __getattr__(name: str):
+    module = _LAZY_MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module 'heltec_e_ink' has no attribute '{name}'")
+    value = getattr(__import__("heltec_e_ink." + module, None, None, [name]), name)
+    # Later lookups find it directly
+    globals()[name] = value
+    return value
+
+
+# On CPython `from heltec_e_ink import *` gets every name, lazy ones included. MicroPython firmware whose star import
+# ignores __all__ copies only the names already loaded, so on the board the lazy ones should be imported by name.
+__all__ = ["IEPaperDisplay", "PixelType", "RefreshMode", "Rotation", "PanelProfile", "SerialInitInfo", "DmaTransport",
+           "FakeTransport", "EInkCanvas", "Displays", "load_profile", "connect_to_display"] + list(_LAZY_MODULES)
 
 
 class Displays:
     QYEG0213RWS800 = 0
 
 
-def connect_to_display(display_name: Displays, init_info: SerialInitInfo) -> IEPaperDisplay:
+# Module in heltec_e_ink.displays holding each panel's PROFILE; only the panel in use is imported
+_PROFILE_MODULES = {
+    Displays.QYEG0213RWS800: "heltec_250_122_bwr_QYEG0213RWS800",
+}
+
+
+def load_profile(display_name: Displays) -> PanelProfile:
     """
-    Get the display of the given type.
+    Import the profile of the given display
     :param display_name: The name of the display.
-    :param init_info: Initialization info for display pin connections
-    :return: The display NOT INITIALIZED.
     """
-    if display_name is Displays.QYEG0213RWS800:
-        from .displays.heltec_250_122_bwr_QYEG0213RWS800 import Display, SerialInterface
-        iface = SerialInterface(init_info=init_info)
-        display = Display(iface)
-        return display
+    module = _PROFILE_MODULES.get(display_name)
+    if module is None:
+        raise Exception(f"Couldn't find {display_name}")
+    return __import__("heltec_e_ink.displays." + module, None, None, ["PROFILE"]).PROFILE
 
-    raise Exception(f"Couldn't find {display_name}")
 
+def connect_to_display(display_name: Displays, init_info: SerialInitInfo, spi=None, pin_factory=None) -> IEPaperDisplay:
+    """
+    Get the display of the given type.
+    :param display_name: The name of the display, or a PanelProfile for a panel not in Displays.
+    :param init_info: Initialization info for display pin connections
+    :param spi: SPI bus to use instead of creating one from init_info (e.g. an emulated controller)
+    :param pin_factory: Called like machine.Pin to create the pins; machine.Pin if None
+    :return: The display NOT INITIALIZED.
+    """
+    profile = display_name if isinstance(display_name, PanelProfile) else load_profile(display_name)
+    driver = __import__("heltec_e_ink.displays." + profile.driver, None, None, ["Display", "SerialInterface"])
+    iface = driver.SerialInterface(init_info=init_info, spi=spi, pin_factory=pin_factory)
+    return driver.Display(iface, profile)
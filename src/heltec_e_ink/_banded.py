@@ -0,0 +1,72 @@
+from ._display_interface import IEPaperDisplay, PixelType, RefreshMode, Rotation
+from ._drawing import EInkCanvas
+
+
+class BandedCanvas(EInkCanvas):
+    """
+    Canvas that holds only a strip of band_rows display rows per plane, so peak memory doesn't depend on the panel
+    height. A frame is drawn by a callback that render() runs once per strip; drawing outside the current strip is
+    clipped, and each finished strip is sent to its RAM rows before the strip buffer is reused.
+    """
+
+    def __init__(self, display: IEPaperDisplay, band_rows: int, rotation: Rotation = Rotation.ROTATE_0):
+        """
+        :param display: Display the strips are sent to
+        :param band_rows: Display rows per strip
+        :param rotation: Rotation applied to all drawing coordinates
+        """
+        if band_rows <= 0:
+            raise Exception(f"Band must hold at least one row (got {band_rows})")
+        self._band_rows = min(band_rows, display.height_px)
+        super().__init__(display, rotation, diff_flush=False)
+
+    def _plane_rows(self) -> int:
+        return self._band_rows
+
+    @property
+    def band_rows(self) -> int:
+        return self._band_rows
+
+    def render(self, draw, refresh: bool = False) -> None:
+        """
+        Draw a whole frame strip by strip and send it to the display RAM
+        :param draw: Called as draw(canvas) once per strip; it should draw the entire frame every time
+        :param refresh: Refresh the display after the last strip
+        """
+        stride = self._stride
+        for y0 in range(0, self._h, self._band_rows):
+            self._y0 = y0
+            self._y1 = min(y0 + self._band_rows, self._h)
+            # The previous strip may still be queued on an asynchronous transport, reading from the same buffers
+            self._display.flush_transfers()
+            self.clear()
+            draw(self)
+
+            length = (self._y1 - y0) * stride
+            for p in self._display.supported_pixel_types:
+                self._display.set_pixels(p, memoryview(self._buffers[p])[0:length], start_byte=y0 * stride)
+
+        self._y0 = 0
+        self._y1 = self._band_rows
+
+        if refresh:
+            self._display.refresh()
+
+    def _mark_dirty(self, x0: int, y0: int, x1: int, y1: int, color: PixelType):
+        # Strips are always sent whole, so there's nothing to track
+        pass
+
+    def _mark_all_dirty(self, color: PixelType):
+        pass
+
+    def draw_buffer(self, color: PixelType, buffer: bytearray):
+        raise Exception("A banded canvas can't hold a full-frame buffer; stream it with Display.set_pixels instead")
+
+    def draw_frame(self, frame: "Frame"):
+        raise Exception("A banded canvas can't hold a full frame; send it with Frame.send instead")
+
+    def flush(self, refresh: bool = False, mode: RefreshMode = RefreshMode.FULL) -> bool:
+        raise Exception("A banded canvas is sent by render()")
+
+    def flush_partial(self, refresh: bool = True, mode: RefreshMode = RefreshMode.PARTIAL) -> bool:
+        raise Exception("A banded canvas is sent by render()")
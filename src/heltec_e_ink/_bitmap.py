@@ -0,0 +1,74 @@
+from ._display_interface import Rotation
+from ._kernels import shift_row
+
+
+def row_bytes(width: int) -> int:
+    """
+    Bytes per row of a packed 1-bit bitmap of the given width
+    """
+    return (width + 7) >> 3
+
+
+def rotate_bitmap(data: bytearray, width: int, height: int, rotation: Rotation) -> (bytearray, int, int):
+    """
+    Rotate a packed bitmap (rows of MSB-first bytes) into display orientation for a canvas rotation
+    :return: (rotated data, rotated width, rotated height)
+    """
+    if rotation is Rotation.ROTATE_0:
+        return data, width, height
+
+    src_stride = row_bytes(width)
+    if rotation is Rotation.ROTATE_180:
+        (out_w, out_h) = (width, height)
+    else:
+        (out_w, out_h) = (height, width)
+    dst_stride = row_bytes(out_w)
+    out = bytearray(dst_stride * out_h)
+
+    for j in range(height):
+        src_row = j * src_stride
+        for i in range(width):
+            if not data[src_row + (i >> 3)] & (0x80 >> (i & 7)):
+                continue
+            if rotation is Rotation.ROTATE_90:
+                (col, row) = (height - 1 - j, i)
+            elif rotation is Rotation.ROTATE_180:
+                (col, row) = (width - 1 - i, height - 1 - j)
+            else:
+                (col, row) = (j, width - 1 - i)
+            out[row * dst_stride + (col >> 3)] |= 0x80 >> (col & 7)
+
+    return out, out_w, out_h
+
+
+def tail_mask(width: int) -> int:
+    """
+    Mask of the bits in the last byte of a packed row that hold pixels rather than padding
+    """
+    return (0xFF << ((8 - (width & 7)) & 7)) & 0xFF
+
+
+def shift_row_into(src: bytearray, src_bytes: int, dst: bytearray, shift: int, last_mask: int = 0xFF) -> None:
+    """
+    Shift one packed row right by 0-7 bits into dst, which must hold at least src_bytes + 1 bytes
+    :param last_mask: Applied to the last source byte, to drop its padding bits
+    """
+    shift_row(src, dst, src_bytes, (last_mask << 8) | shift)
+
+
+def shift_bitmap(data: bytearray, width: int, height: int, shift: int) -> (bytearray, int):
+    """
+    Shift every row of a packed bitmap right by 0-7 bits, so it can be ORed onto whole destination bytes
+    :return: (shifted data, bytes per shifted row)
+    """
+    src_stride = row_bytes(width)
+    if shift == 0:
+        return data, src_stride
+
+    dst_stride = src_stride + 1
+    out = bytearray(dst_stride * height)
+    src = memoryview(data)
+    dst = memoryview(out)
+    for j in range(height):
+        shift_row_into(src[j * src_stride:], src_stride, dst[j * dst_stride:], shift, tail_mask(width))
+    return out, dst_stride
@@ -0,0 +1,151 @@
+from ._display_interface import IEPaperDisplay, RefreshMode
+from ._drawing import EInkCanvas
+from ._serial_interface import ISerialDisplayInterface, SerialInitInfo, Pin, SPI, idle
+
+
+class SharedSPIBus:
+    """
+    One SPI bus driving several panels, each with its own CS, DC and BUSY pins.
+
+    Only one panel talks on the bus at a time: before a panel writes, the bus waits for transfers still queued by the
+    previous panel to finish. Frames go out one panel after another, then every panel refreshes at once, since a
+    refresh only needs the panel's own controller:
+
+        bus = SharedSPIBus(0, tx_pin=19, sck_pin=18, baud_hz=2_000_000)
+        left = bus.add_display(Displays.QYEG0213RWS800, cs_pin=20, data_command_pin=14, busy_pin=15)
+        right = bus.add_display(Displays.QYEG0213RWS800, cs_pin=21, data_command_pin=12, busy_pin=13)
+        ...
+        bus.show([left_canvas, right_canvas])
+    """
+
+    def __init__(self, spi_id: int, tx_pin: int, sck_pin: int, baud_hz: int, spi: SPI = None, pin_factory=None):
+        """
+        :param spi_id: SPI peripheral, 0 or 1
+        :param tx_pin: MOSI pin
+        :param sck_pin: Clock pin
+        :param baud_hz: Bus clock
+        :param spi: SPI bus to use instead of creating one (e.g. an emulated bus)
+        :param pin_factory: Called like machine.Pin to create the pins; machine.Pin if None
+        """
+        if pin_factory is None:
+            pin_factory = Pin
+        if spi is None:
+            spi = SPI(spi_id, baud_hz, firstbit=SPI.MSB, polarity=0, phase=0,
+                      sck=pin_factory(sck_pin, mode=pin_factory.OUT), mosi=pin_factory(tx_pin, mode=pin_factory.OUT))
+
+        self._spi_id = spi_id
+        self._tx_pin = tx_pin
+        self._sck_pin = sck_pin
+        self._baud_hz = baud_hz
+        self._spi = spi
+        self._pin_factory = pin_factory
+        self._owner: ISerialDisplayInterface = None
+        self._displays: [IEPaperDisplay] = []
+
+    @property
+    def displays(self) -> [IEPaperDisplay]:
+        return list(self._displays)
+
+    def add_display(self, display_name: int, cs_pin: int, data_command_pin: int, busy_pin: int,
+                    reset_pin: int = None) -> IEPaperDisplay:
+        """
+        Connect a panel to the bus
+        :param display_name: One of Displays, or a PanelProfile
+        :param cs_pin: The panel's chip select pin
+        :param data_command_pin: The panel's data/command pin
+        :param busy_pin: The panel's BUSY pin
+        :param reset_pin: The panel's RES# pin, needed to wake it from deep sleep
+        :return: The display NOT INITIALIZED
+        """
+        from . import connect_to_display
+
+        init_info = SerialInitInfo(self._spi_id, self._tx_pin, self._sck_pin, cs_pin, data_command_pin, busy_pin,
+                                   self._baud_hz, reset_pin)
+        display = connect_to_display(display_name, init_info, spi=self._spi, pin_factory=self._pin_factory)
+        display._display_iface.bus = self
+        self._displays.append(display)
+        return display
+
+    def claim(self, iface: ISerialDisplayInterface) -> None:
+        """
+        Hand the bus to an interface about to write, once the previous owner's queued transfers are out
+        """
+        owner = self._owner
+        if owner is not iface:
+            if owner is not None and owner.transport is not None:
+                owner.transport.flush()
+            self._owner = iface
+
+    def initialize_all(self) -> None:
+        """
+        Initialize every panel that isn't already
+        """
+        for display in self._displays:
+            display.initialize_display()
+
+    def refresh_all(self, mode: RefreshMode = RefreshMode.FULL, displays: [IEPaperDisplay] = None) -> None:
+        """
+        Start a refresh on every panel and wait for all of them to finish
+        """
+        if displays is None:
+            displays = self._displays
+        for display in displays:
+            display.refresh(mode)
+        self.wait_all(displays)
+
+    def wait_all(self, displays: [IEPaperDisplay] = None) -> None:
+        """
+        Block until every panel's queued transfers are sent and its BUSY line is low
+        """
+        if displays is None:
+            displays = self._displays
+        for display in displays:
+            display.flush_transfers()
+        while not all(d.display_ready for d in displays):
+            idle()
+
+    async def wait_all_async(self, displays: [IEPaperDisplay] = None) -> None:
+        """
+        Wait for every panel's BUSY line without blocking other asyncio tasks
+        """
+        try:
+            from asyncio import gather
+        except ImportError:
+            from uasyncio import gather
+
+        if displays is None:
+            displays = self._displays
+        await gather(*[d.wait_ready() for d in displays])
+
+    def show(self, canvases: [EInkCanvas], mode: RefreshMode = RefreshMode.FULL) -> None:
+        """
+        Flush each canvas to its panel in turn, then refresh the panels that received anything in parallel
+        """
+        refreshing = self._flush_each(canvases)
+        self.refresh_all(mode, refreshing)
+
+    async def show_async(self, canvases: [EInkCanvas], mode: RefreshMode = RefreshMode.FULL) -> None:
+        """
+        show(), yielding to other asyncio tasks while a panel finishes its previous refresh and while the panels refresh
+        """
+        refreshing = []
+        for canvas in canvases:
+            display = canvas.display
+            # The controller doesn't take RAM writes until its previous refresh is done
+            await display.wait_ready()
+            if canvas.flush():
+                refreshing.append(display)
+        for display in refreshing:
+            display.refresh(mode)
+        await self.wait_all_async(refreshing)
+
+    @staticmethod
+    def _flush_each(canvases: [EInkCanvas]) -> [IEPaperDisplay]:
+        refreshing = []
+        for canvas in canvases:
+            display = canvas.display
+            # The controller doesn't take RAM writes until its previous refresh is done
+            display.wait_until_ready()
+            if canvas.flush():
+                refreshing.append(display)
+        return refreshing
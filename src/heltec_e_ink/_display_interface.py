@@ -4,6 +4,24 @@ class PixelType:
     YELLOW = 2
 
 
+class Rotation:
+    ROTATE_0 = 0
+    ROTATE_90 = 1
+    ROTATE_180 = 2
+    ROTATE_270 = 3
+
+
+class RefreshMode:
+    # Full waveform; the whole panel flashes
+    FULL = 0
+    # Partial-update waveform; only changed pixels are driven
+    PARTIAL = 1
+    # Full waveform with the LUT already in the controller, skipping the temperature read and LUT load
+    FAST = 2
+    # Partial update of the black/white plane only; red pixels on the panel are left as they are
+    PARTIAL_BW = 3
+
+
 # noinspection PyPropertyDefinition
 class IEPaperDisplay:
     """
@@ -57,6 +75,26 @@ class IEPaperDisplay:
         Initialize the display directly after applying power
         """
 
+    async def initialize_display_async(self) -> None:
+        """
+        Initialize the display, yielding to other asyncio tasks while it's busy
+        """
+
+    def wait_until_ready(self) -> None:
+        """
+        Block until the display is no longer busy
+        """
+
+    async def wait_ready(self) -> None:
+        """
+        Wait until the display is no longer busy, yielding to other asyncio tasks
+        """
+
+    def flush_transfers(self) -> None:
+        """
+        Block until writes queued on an asynchronous transport have been sent
+        """
+
     def draw_pixel_absolute(self, buffer: bytearray, x: int, y: int, color: PixelType):
         """
         Draw a pixel at the absolute coordinate. The coordinate system is Cartesian; the bottom left pixel is (0,0).
@@ -71,13 +109,38 @@ class IEPaperDisplay:
         """
         Set the pixels in RAM without refreshing
         :param pixel_type: Type of pixels being set
-        :param img_bytes: Image byte array
+        :param img_bytes: Image byte array, or an iterable of byte chunks or a file object (e.g. a prerendered plane on
+                          flash) to stream to the display without holding the whole plane in RAM
         :param start_byte: Start location in memory to begin writing the data
         """
 
-    def refresh(self) -> None:
+    def set_pixels_window(self, pixel_type: PixelType, img_bytes: bytearray, x_byte: int, y: int, width_bytes: int,
+                          height: int) -> None:
+        """
+        Set the pixels of a rectangular RAM window without refreshing
+        :param pixel_type: Type of pixels being set
+        :param img_bytes: Window bytes, row by row, width_bytes per row; or a chunk iterable or file object to stream
+        :param x_byte: First byte column of the window
+        :param y: First row of the window
+        :param width_bytes: Width of the window in bytes
+        :param height: Height of the window in rows
+        """
+
+    def refresh(self, mode: RefreshMode = RefreshMode.FULL) -> None:
         """
         Display the current LUT buffers on the screen
+        :param mode: Waveform to use for the update
+        """
+
+    async def refresh_async(self, mode: RefreshMode = RefreshMode.FULL) -> None:
+        """
+        Refresh the display and wait for the refresh to finish, yielding to other asyncio tasks
+        """
+
+    def load_lut(self, lut) -> None:
+        """
+        Upload a custom waveform LUT, used by RefreshMode.FAST refreshes until the next reset or non-FAST refresh
+        :param lut: LUT bytes, a path to a file holding them, or a file object to read them from
         """
 
     def power_on_reset(self) -> None:
@@ -85,12 +148,37 @@ class IEPaperDisplay:
         Software reset of the display
         """
 
-    def enter_deep_sleep(self) -> None:
+    async def power_on_reset_async(self) -> None:
         """
-        Enter deep sleep mode (usually when done updating the display)
+        Software reset of the display, yielding to other asyncio tasks while it's busy
+        """
+
+    def enter_deep_sleep(self, retain_ram: bool = True) -> None:
+        """
+        Enter deep sleep mode (usually when done updating the display). The register setup is lost either way.
+        :param retain_ram: Keep the RAM contents (mode 1); otherwise the RAM is lost too (mode 2)
         """
 
     def exit_deep_sleep(self) -> None:
         """
-        Exit deep sleep mode (usually when about to update the display)
+        Exit deep sleep mode (usually when about to update the display). The controller only wakes on a hardware reset,
+        so this is hardware_reset(); the registers need setting up again afterwards.
+        """
+
+    @property
+    def can_hardware_reset(self) -> bool:
+        """
+        Whether the controller's RES# pin is wired, so hardware_reset() can be used
+        """
+
+    def hardware_reset(self) -> None:
+        """
+        Reset the controller through its RES# pin and wait for it to be ready. Registers go back to their reset values;
+        the RAM is kept.
+        """
+
+    def restore_registers(self) -> None:
+        """
+        Re-send the register setup without resetting the controller, e.g. after waking from deep sleep with the RAM
+        retained
         """
@@ -1,22 +1,64 @@
-from math import sqrt
-from ._display_interface import IEPaperDisplay, PixelType
-
-
-class Rotation:
-    ROTATE_0 = 0
-    ROTATE_90 = 1
-    ROTATE_180 = 2
-    ROTATE_270 = 3
+from ._display_interface import IEPaperDisplay, PixelType, RefreshMode, Rotation
+from ._bitmap import rotate_bitmap, shift_bitmap, shift_row_into, tail_mask
+from ._font import Font, default_font
+from ._kernels import blit_row, blit_row_masked, next_changed_row
 
 
 class EInkCanvas:
-    def __init__(self, display: IEPaperDisplay, rotation: Rotation = Rotation.ROTATE_0):
+    # Unchanged rows between two changed row ranges that are resent rather than starting a new RAM write
+    ROW_MERGE_GAP = 2
+    # Pre-rotated, pre-shifted glyphs kept for draw_text; the cache is emptied when it would grow past this
+    GLYPH_CACHE_SIZE = 96
+
+    def __init__(self, display: IEPaperDisplay, rotation: Rotation = Rotation.ROTATE_0, diff_flush: bool = True):
+        """
+        :param display: Display the canvas is flushed to
+        :param rotation: Rotation applied to all drawing coordinates
+        :param diff_flush: Keep a shadow copy of the display RAM so flush only sends changed rows (one extra plane of
+                           RAM per pixel type)
+        """
         self._display = display
         self._rotation = rotation
         self._buffers = {}
+        # Bounding box of pixels changed since the last flush, per pixel type, as [x0, y0, x1, y1] (absolute, inclusive)
+        self._dirty = {}
+        # Set when a flush may have left plane data queued on an asynchronous transport
+        self._sending = False
+        # Copy of what the display RAM holds per pixel type; a missing entry means unknown
+        self._shadow = {} if diff_flush else None
+        # (font, char code, bit shift) -> (glyph rows in display orientation, bytes per row, rows)
+        self._glyph_cache = {}
+        self._default_font: Font = None
+
+        self._stride = display.width_bytes
+        self._w = display.width_px
+        self._h = display.height_px
+        # Absolute rows [_y0, _y1) held in the plane buffers; drawing outside them is clipped
+        self._y0 = 0
+        self._y1 = self._plane_rows()
+        # (plane buffer, ink byte) per pixel type, so the pixel setters need a single lookup
+        self._planes = {}
+        # Byte value that draws a plane's color; the black/white plane is inked by clearing bits
+        self._ink = {}
+        # One row of solid 0x00 and 0xFF bytes, the source for span and clear slice assignments
+        self._solid = {0x00: memoryview(bytearray(self._stride)), 0xFF: memoryview(bytearray(b"\xff" * self._stride))}
 
         for pixel_type in display.supported_pixel_types:
-            self._buffers[pixel_type] = bytearray([0x00] * self._display.width_bytes * self.height_px)
+            self._buffers[pixel_type] = bytearray(self._stride * self._plane_rows())
+            self._ink[pixel_type] = 0x00 if pixel_type is PixelType.BLACK_WHITE else 0xFF
+            self._planes[pixel_type] = (self._buffers[pixel_type], self._ink[pixel_type])
+
+        # Resolve the rotation once; every primitive funnels through these
+        self._to_absolute = (self._to_absolute_0, self._to_absolute_90,
+                             self._to_absolute_180, self._to_absolute_270)[rotation]
+        self._draw_pixel = (self._draw_pixel_0, self._draw_pixel_90,
+                            self._draw_pixel_180, self._draw_pixel_270)[rotation]
+
+    def _plane_rows(self) -> int:
+        """
+        Number of display rows each plane buffer holds
+        """
+        return self._display.height_px
 
     def __del__(self):
         del self._buffers
@@ -40,79 +82,377 @@ class EInkCanvas:
     def rotation(self):
         return self._rotation
 
+    @property
+    def display(self) -> IEPaperDisplay:
+        return self._display
+
+    def plane(self, pixel_type: PixelType) -> bytearray:
+        """
+        The buffer backing one plane of the canvas
+        """
+        return self._buffers[pixel_type]
+
+    @property
+    def dirty_window(self) -> (int, int, int, int):
+        """
+        Absolute bounding box (x0, y0, x1, y1) of every pixel changed since the last flush, or None if nothing changed
+        """
+        box = None
+        for d in self._dirty.values():
+            if box is None:
+                box = list(d)
+            else:
+                box = [min(box[0], d[0]), min(box[1], d[1]), max(box[2], d[2]), max(box[3], d[3])]
+        return None if box is None else tuple(box)
+
     def draw_buffer(self, color: PixelType, buffer: bytearray):
         buf = self._buffers[color]
         if len(buffer) > len(buf):
             raise Exception(f"Can't draw buffer of size {len(buffer)} to one of size {len(buf)}")
 
-        for i, v in enumerate(buffer):
-            buf[i] = v
+        self._mark_all_dirty(color)
+        buf[0:len(buffer)] = buffer
+
+    def draw_frame(self, frame: "Frame"):
+        """
+        Decode a compressed frame into the planes it holds
+        """
+        if frame.width_bytes != self._display.width_bytes or frame.height != self._display.height_px:
+            raise Exception(f"Frame of {frame.width_bytes}x{frame.height} bytes doesn't fit the display")
 
-    def flush(self):
+        for p in frame.pixel_types:
+            self._mark_all_dirty(p)
+            frame.expand_into(p, self._buffers[p])
+
+    def flush(self, refresh: bool = False, mode: RefreshMode = RefreshMode.FULL) -> bool:
+        """
+        Send the planes to the display RAM. With diff_flush, only rows that differ from the last flush are sent.
+        :param refresh: Refresh the display afterwards, unless nothing was sent
+        :param mode: Refresh mode to use
+        :return: True if anything was sent
+        """
+        sent = False
         for p in self._display.supported_pixel_types:
-            self._display.set_pixels(p, bytearray(self._buffers[p]))
+            if self._shadow is None:
+                self._display.set_pixels(p, self._buffers[p])
+                sent = True
+            elif self._flush_changed_rows(p):
+                sent = True
+
+        self._dirty.clear()
+        # The planes (or slices of them) may still be queued; the next change to them waits until they're sent
+        self._sending = sent
+
+        if sent and refresh:
+            self._display.refresh(mode)
+
+        return sent
+
+    def invalidate(self):
+        """
+        Forget what the display RAM holds (e.g. after a reset), so the next flush sends every plane in full
+        """
+        if self._shadow is not None:
+            self._shadow.clear()
+
+    def record_sent(self, pixel_type: PixelType, data: bytearray):
+        """
+        Record that a whole plane was written to the display RAM outside flush (e.g. by a RefreshPipeline), so the next
+        diff flush compares against it. Pixels drawn since then stay dirty.
+        """
+        if self._shadow is None:
+            return
+        shadow = self._shadow.get(pixel_type)
+        if shadow is None:
+            self._shadow[pixel_type] = bytearray(data)
+        else:
+            shadow[:] = data
+
+    def _flush_changed_rows(self, pixel_type: PixelType) -> bool:
+        buf = self._buffers[pixel_type]
+        shadow = self._shadow.get(pixel_type)
+        if shadow is None:
+            self._display.set_pixels(pixel_type, buf)
+            self._shadow[pixel_type] = bytearray(buf)
+            return True
+
+        # Nothing outside the dirty window can have changed since the last flush
+        dirty = self._dirty.get(pixel_type)
+        if dirty is None:
+            return False
+
+        width_bytes = self._display.width_bytes
+        view = memoryview(buf)
+        ranges = []
+        # Rows are compared in place; slicing them out would allocate two buffers per dirty row
+        end_width = ((dirty[3] + 1) << 16) | width_bytes
+        y = next_changed_row(buf, shadow, dirty[1], end_width)
+        while y <= dirty[3]:
+            if ranges and y - ranges[-1][1] <= self.ROW_MERGE_GAP:
+                ranges[-1][1] = y + 1
+            else:
+                ranges.append([y, y + 1])
+            y = next_changed_row(buf, shadow, y + 1, end_width)
+
+        # Copied view to view: a bytearray slice assigned from a memoryview goes through a temporary copy on CPython
+        shadow_view = memoryview(shadow)
+        for (y0, y1) in ranges:
+            start = y0 * width_bytes
+            end = y1 * width_bytes
+            self._display.set_pixels(pixel_type, view[start:end], start_byte=start)
+            shadow_view[start:end] = view[start:end]
+
+        return len(ranges) > 0
+
+    def flush_partial(self, refresh: bool = True, mode: RefreshMode = RefreshMode.PARTIAL) -> bool:
+        """
+        Send only the dirty window of each changed plane and run the partial-update waveform
+        :param refresh: Refresh the display after sending the windows
+        :param mode: PARTIAL, or PARTIAL_BW to send and refresh only the black/white plane; other planes stay dirty
+                     until a later flush
+        :return: True if anything was sent
+        """
+        planes = list(self._dirty.keys())
+        if mode == RefreshMode.PARTIAL_BW:
+            planes = [p for p in planes if p == PixelType.BLACK_WHITE]
+        if not planes:
+            return False
+
+        width_bytes = self._display.width_bytes
+        for p in planes:
+            (x0, y0, x1, y1) = self._dirty.pop(p)
+            buf = self._buffers[p]
+            b0 = x0 >> 3
+            w = (x1 >> 3) - b0 + 1
+            h = y1 - y0 + 1
+            shadow = None if self._shadow is None else self._shadow.get(p)
+            if shadow is not None:
+                for row in range(y0, y0 + h):
+                    src = row * width_bytes + b0
+                    shadow[src:src + w] = buf[src:src + w]
+            # Stream the window a row at a time straight out of the plane
+            self._display.set_pixels_window(p, self._window_rows(buf, b0, y0, w, h), b0, y0, w, h)
+
+        if refresh:
+            self._display.refresh(mode)
+
+        return True
+
+    def _window_rows(self, buf: bytearray, x_byte: int, y: int, width_bytes: int, height: int):
+        view = memoryview(buf)
+        for row in range(y, y + height):
+            start = row * self._stride + x_byte
+            yield view[start:start + width_bytes]
 
     def clear(self, color_types: [PixelType] = None):
         if color_types is None:
             color_types = self._display.supported_pixel_types
 
+        stride = self._stride
         for c in color_types:
+            self._mark_all_dirty(c)
             buf = self._buffers[c]
-            for i in range(len(buf)):
-                buf[i] = 0xFF if c is PixelType.BLACK_WHITE else 0x00
+            paper = self._solid[self._ink[c] ^ 0xFF]
+            for i in range(0, len(buf), stride):
+                buf[i:i + stride] = paper
 
     def draw_pixel(self, x: int, y: int, color: PixelType):
-        if self.rotation is Rotation.ROTATE_0:
-            pass
-        elif self.rotation is Rotation.ROTATE_90:
-            (x, y) = (self.width_px - y, x)
-        elif self.rotation is Rotation.ROTATE_180:
-            (x, y) = (self.width_px - x, self.height_px - y)
-        elif self.rotation is Rotation.ROTATE_270:
-            (x, y) = (y, self.height_px - x)
+        self._mark_dirty(x, y, x, y, color)
+        self._draw_pixel(x, y, color)
+
+    def _to_absolute_0(self, x: int, y: int) -> (int, int):
+        return x, y
+
+    def _to_absolute_90(self, x: int, y: int) -> (int, int):
+        return self._w - 1 - y, x
+
+    def _to_absolute_180(self, x: int, y: int) -> (int, int):
+        return self._w - 1 - x, self._h - 1 - y
+
+    def _to_absolute_270(self, x: int, y: int) -> (int, int):
+        return y, self._h - 1 - x
+
+    def _draw_pixel_0(self, x: int, y: int, color: PixelType):
+        plane = self._planes.get(color)
+        if plane is None or x < 0 or x >= self._w or y < self._y0 or y >= self._y1:
+            return
+        i = (y - self._y0) * self._stride + (x >> 3)
+        if plane[1]:
+            plane[0][i] |= 0x80 >> (x & 7)
+        else:
+            plane[0][i] &= ~(0x80 >> (x & 7))
+
+    def _draw_pixel_90(self, x: int, y: int, color: PixelType):
+        (x, y) = (self._w - 1 - y, x)
+        plane = self._planes.get(color)
+        if plane is None or x < 0 or x >= self._w or y < self._y0 or y >= self._y1:
+            return
+        i = (y - self._y0) * self._stride + (x >> 3)
+        if plane[1]:
+            plane[0][i] |= 0x80 >> (x & 7)
+        else:
+            plane[0][i] &= ~(0x80 >> (x & 7))
 
-        self._display.draw_pixel_absolute(self._buffers[color], x, y, color)
+    def _draw_pixel_180(self, x: int, y: int, color: PixelType):
+        (x, y) = (self._w - 1 - x, self._h - 1 - y)
+        plane = self._planes.get(color)
+        if plane is None or x < 0 or x >= self._w or y < self._y0 or y >= self._y1:
+            return
+        i = (y - self._y0) * self._stride + (x >> 3)
+        if plane[1]:
+            plane[0][i] |= 0x80 >> (x & 7)
+        else:
+            plane[0][i] &= ~(0x80 >> (x & 7))
+
+    def _draw_pixel_270(self, x: int, y: int, color: PixelType):
+        (x, y) = (y, self._h - 1 - x)
+        plane = self._planes.get(color)
+        if plane is None or x < 0 or x >= self._w or y < self._y0 or y >= self._y1:
+            return
+        i = (y - self._y0) * self._stride + (x >> 3)
+        if plane[1]:
+            plane[0][i] |= 0x80 >> (x & 7)
+        else:
+            plane[0][i] &= ~(0x80 >> (x & 7))
+
+    def _fill_rect_absolute(self, x0: int, y0: int, x1: int, y1: int, color: PixelType):
+        """
+        Ink every pixel of the absolute rectangle between two corners (inclusive), clipped to the display. Each row is
+        one span: whole bytes are slice-assigned and only the two edge bytes are masked.
+        """
+        if x0 > x1:
+            (x0, x1) = (x1, x0)
+        if y0 > y1:
+            (y0, y1) = (y1, y0)
+        x0 = max(x0, 0)
+        y0 = max(y0, self._y0)
+        x1 = min(x1, self._w - 1)
+        y1 = min(y1, self._y1 - 1)
+        if x0 > x1 or y0 > y1:
+            return
+
+        buf = self._buffers[color]
+        ink = self._ink[color]
+        stride = self._stride
+        b0 = x0 >> 3
+        b1 = x1 >> 3
+        left_mask = 0xFF >> (x0 & 7)
+        right_mask = (0xFF << (7 - (x1 & 7))) & 0xFF
+        if b0 == b1:
+            left_mask &= right_mask
+        middle = b1 - b0 - 1
+        solid = self._solid[ink][0:max(middle, 0)]
+
+        for i in range((y0 - self._y0) * stride + b0, (y1 - self._y0) * stride + b0 + 1, stride):
+            if ink:
+                buf[i] |= left_mask
+            else:
+                buf[i] &= ~left_mask
+            if b1 > b0:
+                if middle > 0:
+                    buf[i + 1:i + 1 + middle] = solid
+                if ink:
+                    buf[i + 1 + middle] |= right_mask
+                else:
+                    buf[i + 1 + middle] &= ~right_mask
+
+    def _fill_rect(self, x0: int, y0: int, x1: int, y1: int, color: PixelType):
+        """
+        Fill a rectangle given in canvas coordinates
+        """
+        (ax0, ay0) = self._to_absolute(x0, y0)
+        (ax1, ay1) = self._to_absolute(x1, y1)
+        self._fill_rect_absolute(ax0, ay0, ax1, ay1, color)
+
+    def _mark_dirty(self, x0: int, y0: int, x1: int, y1: int, color: PixelType):
+        """
+        Grow the dirty window of a plane by a rectangle given in canvas coordinates. Called before the pixels change.
+        """
+        if self._sending:
+            self._wait_sent()
+        (ax0, ay0) = self._to_absolute(x0, y0)
+        (ax1, ay1) = self._to_absolute(x1, y1)
+        left = max(min(ax0, ax1), 0)
+        top = max(min(ay0, ay1), 0)
+        right = min(max(ax0, ax1), self._w - 1)
+        bottom = min(max(ay0, ay1), self._h - 1)
+        if left > right or top > bottom or color not in self._buffers:
+            return
+
+        d = self._dirty.get(color)
+        if d is None:
+            self._dirty[color] = [left, top, right, bottom]
+        else:
+            d[0] = min(d[0], left)
+            d[1] = min(d[1], top)
+            d[2] = max(d[2], right)
+            d[3] = max(d[3], bottom)
+
+    def _mark_all_dirty(self, color: PixelType):
+        if self._sending:
+            self._wait_sent()
+        self._dirty[color] = [0, 0, self._w - 1, self._h - 1]
+
+    def _wait_sent(self):
+        """
+        Wait until the planes are off a queued transport, which reads them as it sends, before they change
+        """
+        self._display.flush_transfers()
+        self._sending = False
 
     def draw_line(self, p1: (int, int), p2: (int, int), color: PixelType):
         (x1, y1) = p1
         (x2, y2) = p2
-        ld = round(sqrt((x2 - x1)**2 + (y2 - y1)**2))
-        if ld is 0:
+        self._mark_dirty(x1, y1, x2, y2, color)
+
+        # Axis-aligned lines are single spans: a byte fill across a row, or a stride walk down a column
+        if x1 == x2 or y1 == y2:
+            self._fill_rect(x1, y1, x2, y2, color)
             return
-        dx = (x2 - x1) / ld
-        dy = (y2 - y1) / ld
-        x = x1
-        y = y1
 
-        for p in range(round(ld) + 1):
-            self.draw_pixel(round(x), round(y), color)
-            x += dx
-            y += dy
+        # Integer Bresenham
+        dx = abs(x2 - x1)
+        dy = -abs(y2 - y1)
+        sx = 1 if x1 < x2 else -1
+        sy = 1 if y1 < y2 else -1
+        err = dx + dy
+
+        while True:
+            self._draw_pixel(x1, y1, color)
+            if x1 == x2 and y1 == y2:
+                break
+            e2 = 2 * err
+            if e2 >= dy:
+                err += dy
+                x1 += sx
+            if e2 <= dx:
+                err += dx
+                y1 += sy
 
     def draw_circle(self, c: (int, int), r: int, color: PixelType, filled: bool = False):
         if r <= 0:
             return
         (x, y) = c
+        self._mark_dirty(x - r, y - r, x + r, y + r, color)
 
         # Bresenham algorithm
 
         x_pos = -r
         y_pos = 0
         err = 2 - 2 * r
+        filled_y = None
 
         while x_pos <= 0:
-            self.draw_pixel(x - x_pos, y + y_pos, color)
-            self.draw_pixel(x + x_pos, y + y_pos, color)
-            self.draw_pixel(x + x_pos, y - y_pos, color)
-            self.draw_pixel(x - x_pos, y - y_pos, color)
-
-            if filled:
-                s1 = (x + x_pos, y + y_pos)
-                e1 = (s1[0] + (2 * (-x_pos) + 1), s1[1])
-                s2 = (x + x_pos, y - y_pos)
-                e2 = (s2[0] + (2 * (-x_pos) + 1), s2[1])
-                self.draw_line(s1, e1, color)
-                self.draw_line(s2, e2, color)
+            self._draw_pixel(x - x_pos, y + y_pos, color)
+            self._draw_pixel(x + x_pos, y + y_pos, color)
+            self._draw_pixel(x + x_pos, y - y_pos, color)
+            self._draw_pixel(x - x_pos, y - y_pos, color)
+
+            # The first step on a row is the widest, later steps on the same row are inside it
+            if filled and y_pos != filled_y:
+                self._fill_rect(x + x_pos, y + y_pos, x - x_pos, y + y_pos, color)
+                self._fill_rect(x + x_pos, y - y_pos, x - x_pos, y - y_pos, color)
+                filled_y = y_pos
 
             e2 = err
             if e2 <= y_pos:
@@ -133,19 +473,162 @@ class EInkCanvas:
         self.draw_line(top_left, top_right, color)
         self.draw_line(top_right, bottom_right, color)
 
-        print(f"filled={filled}")
         if filled:
-            s = top_left
-            e = top_right
-            print(f"1: s={s}  e={e}")
-            yd = top_left[1] - bottom_left[1]
-            print(f"tl: {top_left}")
-            print(f"tr: {top_right}")
-            print(f"bl: {bottom_left}")
-            print(f"br: {bottom_right}")
-            print(f"yd={yd}")
-            for i in range(round(yd)):
-                self.draw_line(s, e, color)
-                s = (s[0], s[1] - 1)
-                e = (e[0], e[1] - 1)
-                print(f"s={s}  e={e}")
+            # The outline lines are clipped one by one, so their dirty windows needn't cover the inside
+            self._mark_dirty(top_left[0], top_left[1], bottom_right[0], bottom_right[1], color)
+            self._fill_rect(top_left[0], top_left[1], bottom_right[0], bottom_right[1], color)
+
+    def draw_text(self, x: int, y: int, text: str, color: PixelType, font: Font = None) -> int:
+        """
+        Draw text with its top left corner at (x, y); glyph rows run toward increasing y and '\\n' starts a new line.
+        Characters the font doesn't have are skipped.
+        :param font: Font to draw with; the built-in 5x7 font if None
+        :return: Width in pixels of the widest line drawn
+        """
+        if self._sending:
+            # Glyphs are drawn before the dirty window is known
+            self._wait_sent()
+        if font is None:
+            if self._default_font is None:
+                self._default_font = default_font()
+            font = self._default_font
+
+        height = font.height
+        spacing = font.spacing
+        cx = x
+        cy = y
+        right = x
+        for ch in text:
+            if ch == "\n":
+                cx = x
+                cy += height + spacing
+                continue
+            g = font.glyph(ch)
+            if g is None:
+                continue
+            if g[0] > 0:
+                self._draw_glyph(font, ch, g[0], g[1], cx, cy, color)
+            cx += g[0] + spacing
+            right = max(right, cx - spacing)
+
+        if right > x:
+            self._mark_dirty(x, y, right - 1, cy + height - 1, color)
+        return right - x
+
+    def _draw_glyph(self, font: Font, ch: str, width: int, rows: memoryview, x: int, y: int, color: PixelType):
+        (ax0, ay0) = self._to_absolute(x, y)
+        (ax1, ay1) = self._to_absolute(x + width - 1, y + font.height - 1)
+        ax = min(ax0, ax1)
+        ay = min(ay0, ay1)
+
+        key = (font, ord(ch), ax & 7)
+        entry = self._glyph_cache.get(key)
+        if entry is None:
+            (data, w, h) = rotate_bitmap(rows, width, font.height, self._rotation)
+            (data, row_bytes) = shift_bitmap(data, w, h, ax & 7)
+            entry = (data, row_bytes, h)
+            if len(self._glyph_cache) >= self.GLYPH_CACHE_SIZE:
+                self._glyph_cache.clear()
+            self._glyph_cache[key] = entry
+
+        self._blit_absolute(entry[0], entry[1], entry[2], ax >> 3, ay, color)
+
+    def blit(self, image: "Image", x: int, y: int, color: PixelType, mask: "Image" = None):
+        """
+        Draw a packed 1-bit image (an Image, or an ImageFile streamed from flash) with its top left corner at (x, y).
+        Set bits are inked in the given color and clear bits are left alone. With a mask of the same size, every
+        pixel under a set mask bit is replaced instead: inked for a set image bit, cleared to paper otherwise.
+
+        Unrotated canvases stream the image one row at a time; rotated ones read the whole bitmap to rotate it.
+        """
+        w = image.width
+        h = image.height
+        if w == 0 or h == 0:
+            return
+        if mask is not None and (mask.width != w or mask.height != h):
+            raise Exception(f"Mask of {mask.width}x{mask.height} doesn't match image of {w}x{h}")
+
+        (ax0, ay0) = self._to_absolute(x, y)
+        (ax1, ay1) = self._to_absolute(x + w - 1, y + h - 1)
+        ax = min(ax0, ax1)
+        ay = min(ay0, ay1)
+        shift = ax & 7
+        self._mark_dirty(x, y, x + w - 1, y + h - 1, color)
+
+        if self._rotation is Rotation.ROTATE_0:
+            self._blit_rows(image, mask, ax, ay, color)
+        else:
+            (data, rw, rh) = rotate_bitmap(image.data, w, h, self._rotation)
+            (data, row_bytes) = shift_bitmap(data, rw, rh, shift)
+            mask_data = None
+            if mask is not None:
+                (mask_data, _, _) = rotate_bitmap(mask.data, w, h, self._rotation)
+                (mask_data, _) = shift_bitmap(mask_data, rw, rh, shift)
+            self._blit_absolute(data, row_bytes, rh, ax >> 3, ay, color, mask_data)
+
+    def _blit_rows(self, image: "Image", mask: "Image", ax: int, ay: int, color: PixelType):
+        """
+        Blit an unrotated image row by row through one reusable shifted-row buffer
+        """
+        if ay >= self._y1 or ay + image.height <= self._y0 or ax >= self._w or ax + image.width <= 0:
+            return
+
+        row_bytes = image.row_bytes
+        last_mask = tail_mask(image.width)
+        shift = ax & 7
+        x_byte = ax >> 3
+        shifted = bytearray(row_bytes + 1)
+        shifted_mask = None if mask is None else bytearray(row_bytes + 1)
+        mask_rows = None if mask is None else mask.rows()
+
+        y = ay
+        for row in image.rows():
+            if mask_rows is not None:
+                shift_row_into(next(mask_rows), row_bytes, shifted_mask, shift, last_mask)
+            if y >= self._y1:
+                break
+            if y >= self._y0:
+                shift_row_into(row, row_bytes, shifted, shift, last_mask)
+                self._blit_absolute(shifted, row_bytes + 1, 1, x_byte, y, color, shifted_mask)
+            y += 1
+
+    def _blit_absolute(self, data: bytearray, row_bytes: int, height: int, x_byte: int, y: int, color: PixelType,
+                       mask: bytearray = None):
+        """
+        Ink the set bits of byte-aligned bitmap rows into a plane, with the first byte at column x_byte of row y.
+        With a mask (same layout as data), pixels under set mask bits are replaced by the data bits instead.
+        Rows, bytes and the padding bits past the last column are clipped.
+        """
+        plane = self._planes.get(color)
+        if plane is None:
+            return
+        (buf, ink) = plane
+        stride = self._stride
+
+        c0 = max(0, -x_byte)
+        c1 = min(row_bytes, stride - x_byte)
+        r0 = max(0, self._y0 - y)
+        r1 = min(height, self._y1 - y)
+        if c0 >= c1 or r0 >= r1:
+            return
+        # The last byte of a row only holds width_px % 8 real pixels
+        edge = 0xFF
+        if c1 == stride - x_byte:
+            edge = (0xFF << (stride * 8 - self._w)) & 0xFF
+        count = c1 - c0
+
+        view = memoryview(buf)
+        data = memoryview(data)
+        if mask is None:
+            ink_edge = (ink << 8) | edge
+        else:
+            mask = memoryview(mask)
+            ink_edge = (count << 16) | (ink << 8) | edge
+
+        for r in range(r0, r1):
+            src = r * row_bytes + c0
+            dst = (y + r - self._y0) * stride + x_byte + c0
+            if mask is None:
+                blit_row(view[dst:], data[src:], count, ink_edge)
+            else:
+                blit_row_masked(view[dst:], data[src:], mask[src:], ink_edge)
@@ -0,0 +1,103 @@
+from ._display_interface import IEPaperDisplay, PixelType, Rotation
+from ._drawing import EInkCanvas
+
+try:
+    import framebuf
+except ImportError:
+    # Not MicroPython (e.g. CPython with the emulator); FrameBufferCanvas draws with the pure-Python primitives
+    framebuf = None
+
+
+class FrameBufferCanvas(EInkCanvas):
+    """
+    EInkCanvas whose primitives run in MicroPython's native framebuf module. Each plane buffer is wrapped in a
+    MONO_HLSB FrameBuffer (MSB-first rows, with the display's byte stride), and each plane's ink is the bit value that
+    draws it: 0 on the black/white plane, 1 on the red plane. Rotation is applied to the coordinates before they reach
+    framebuf.
+
+    Clearing (whole-row slice fills, which also cover the padding bits past the panel width), text, images, frames
+    and flushing are shared with EInkCanvas. Without framebuf every primitive falls back to the pure-Python one.
+    Native circles can differ from the Python rasterizer by a pixel along the edge.
+    """
+
+    def __init__(self, display: IEPaperDisplay, rotation: Rotation = Rotation.ROTATE_0, diff_flush: bool = True):
+        super().__init__(display, rotation, diff_flush)
+
+        # (FrameBuffer, ink bit) per pixel type; None when framebuf isn't available
+        self._fbs = None
+        if framebuf is not None:
+            self._fbs = {}
+            for pixel_type, buf in self._buffers.items():
+                fb = framebuf.FrameBuffer(buf, self._w, self._y1 - self._y0, framebuf.MONO_HLSB, self._stride * 8)
+                self._fbs[pixel_type] = (fb, 1 if self._ink[pixel_type] else 0)
+            self._has_ellipse = hasattr(framebuf.FrameBuffer, "ellipse")
+
+    @property
+    def native(self) -> bool:
+        """
+        Whether drawing runs in framebuf
+        """
+        return self._fbs is not None
+
+    def draw_pixel(self, x: int, y: int, color: PixelType):
+        if self._fbs is None:
+            return super().draw_pixel(x, y, color)
+
+        fb = self._fbs.get(color)
+        if fb is None:
+            return
+        self._mark_dirty(x, y, x, y, color)
+        (ax, ay) = self._to_absolute(x, y)
+        fb[0].pixel(ax, ay - self._y0, fb[1])
+
+    def draw_line(self, p1: (int, int), p2: (int, int), color: PixelType):
+        if self._fbs is None:
+            return super().draw_line(p1, p2, color)
+
+        fb = self._fbs.get(color)
+        if fb is None:
+            return
+        self._mark_dirty(p1[0], p1[1], p2[0], p2[1], color)
+        (ax1, ay1) = self._to_absolute(p1[0], p1[1])
+        (ax2, ay2) = self._to_absolute(p2[0], p2[1])
+        fb[0].line(ax1, ay1 - self._y0, ax2, ay2 - self._y0, fb[1])
+
+    def draw_circle(self, c: (int, int), r: int, color: PixelType, filled: bool = False):
+        if self._fbs is None or not self._has_ellipse:
+            return super().draw_circle(c, r, color, filled)
+
+        fb = self._fbs.get(color)
+        if fb is None or r <= 0:
+            return
+        (x, y) = c
+        self._mark_dirty(x - r, y - r, x + r, y + r, color)
+        (ax, ay) = self._to_absolute(x, y)
+        fb[0].ellipse(ax, ay - self._y0, r, r, fb[1], filled)
+
+    def draw_rectangle(self, top_left: (int, int), bottom_right: (int, int), color: PixelType, filled: bool = False):
+        if self._fbs is None:
+            return super().draw_rectangle(top_left, bottom_right, color, filled)
+
+        fb = self._fbs.get(color)
+        if fb is None:
+            return
+        self._mark_dirty(top_left[0], top_left[1], bottom_right[0], bottom_right[1], color)
+        (ax0, ay0) = self._to_absolute(top_left[0], top_left[1])
+        (ax1, ay1) = self._to_absolute(bottom_right[0], bottom_right[1])
+        x = min(ax0, ax1)
+        y = min(ay0, ay1) - self._y0
+        w = abs(ax1 - ax0) + 1
+        h = abs(ay1 - ay0) + 1
+        if filled:
+            fb[0].fill_rect(x, y, w, h, fb[1])
+        else:
+            fb[0].rect(x, y, w, h, fb[1])
+
+    def _fill_rect_absolute(self, x0: int, y0: int, x1: int, y1: int, color: PixelType):
+        if self._fbs is None:
+            return super()._fill_rect_absolute(x0, y0, x1, y1, color)
+
+        fb = self._fbs.get(color)
+        if fb is None:
+            return
+        fb[0].fill_rect(min(x0, x1), min(y0, y1) - self._y0, abs(x1 - x0) + 1, abs(y1 - y0) + 1, fb[1])
@@ -0,0 +1,87 @@
+class Font:
+    """
+    Packed 1-bit bitmap font covering a contiguous range of character codes.
+
+    Binary layout:
+        b"HF", version, height, first char code, glyph count, spacing,
+        one width byte per glyph,
+        glyph bitmaps in order, each `height` rows of ceil(width / 8) MSB-first bytes
+    """
+    MAGIC = b"HF"
+    VERSION = 1
+    HEADER_BYTES = 7
+
+    def __init__(self, data: bytes):
+        if bytes(data[0:2]) != self.MAGIC or data[2] != self.VERSION:
+            raise Exception("Not a packed font (bad magic or version)")
+
+        self._data = memoryview(data)
+        self._height = data[3]
+        self._first = data[4]
+        self._count = data[5]
+        self._spacing = data[6]
+        self._widths = self._data[self.HEADER_BYTES:self.HEADER_BYTES + self._count]
+
+        # Offset of each glyph bitmap, computed once at load
+        self._offsets = []
+        offset = self.HEADER_BYTES + self._count
+        for w in self._widths:
+            self._offsets.append(offset)
+            offset += ((w + 7) >> 3) * self._height
+
+        if offset > len(data):
+            raise Exception(f"Font data truncated ({len(data)} of {offset} bytes)")
+
+    @classmethod
+    def load(cls, path: str) -> "Font":
+        """
+        Load a packed font file, e.g. one written by tools/make_font.py
+        """
+        with open(path, "rb") as f:
+            return cls(f.read())
+
+    @property
+    def height(self) -> int:
+        return self._height
+
+    @property
+    def spacing(self) -> int:
+        """
+        Blank columns between glyphs
+        """
+        return self._spacing
+
+    def glyph(self, char: str) -> (int, memoryview):
+        """
+        :return: (width, packed rows) of the glyph, or None if the font doesn't have it
+        """
+        i = ord(char) - self._first
+        if i < 0 or i >= self._count:
+            return None
+        w = self._widths[i]
+        offset = self._offsets[i]
+        return w, self._data[offset:offset + ((w + 7) >> 3) * self._height]
+
+    def text_width(self, text: str) -> int:
+        """
+        Width in pixels of the longest line of the text
+        """
+        widest = 0
+        width = 0
+        for ch in text:
+            if ch == "\n":
+                width = 0
+                continue
+            g = self.glyph(ch)
+            if g is not None:
+                width += g[0] + self._spacing
+                widest = max(widest, width - self._spacing)
+        return widest
+
+
+def default_font() -> Font:
+    """
+    The built-in 5x7 font (printable ASCII, space through '~')
+    """
+    from .fonts.font5x7 import DATA
+    return Font(DATA)
@@ -0,0 +1,173 @@
+from ._display_interface import IEPaperDisplay, PixelType
+
+# Runs of the two paper/ink bytes, which make up almost every run in a frame, are copied from these
+_RUN_00 = memoryview(bytes(128))
+_RUN_FF = memoryview(b"\xff" * 128)
+
+
+class Frame:
+    """
+    Prerendered frame with each plane compressed with PackBits, as built by tools/make_frame.py. A plane holds the
+    bytes the display RAM takes (rows of width_bytes, top row first), so decoded planes go to the display or into a
+    canvas as they are.
+
+    Binary layout:
+        b"HR", version, width_bytes, height (2 bytes, little endian), plane count,
+        per plane: pixel type, encoded length (4 bytes, little endian), PackBits data
+
+    PackBits: a header byte n of 0-127 is followed by n + 1 literal bytes; 129-255 by one byte repeated 257 - n times;
+    128 is skipped.
+    """
+    MAGIC = b"HR"
+    VERSION = 1
+    HEADER_BYTES = 7
+    PLANE_HEADER_BYTES = 5
+    # Decoded bytes handed to the SPI bus per write when streaming a plane
+    CHUNK_BYTES = 512
+
+    def __init__(self, data: bytes):
+        """
+        :param data: The frame file contents; planes are decoded from it without copying
+        """
+        data = memoryview(data)
+        if len(data) < self.HEADER_BYTES or bytes(data[0:2]) != self.MAGIC or data[2] != self.VERSION:
+            raise Exception("Not a compressed frame (bad magic or version)")
+
+        self._data = data
+        self._width_bytes = data[3]
+        self._height = data[4] | (data[5] << 8)
+        self._planes = {}
+        pos = self.HEADER_BYTES
+        for _ in range(data[6]):
+            if pos + self.PLANE_HEADER_BYTES > len(data):
+                raise Exception("Compressed frame truncated")
+            pixel_type = data[pos]
+            length = data[pos + 1] | (data[pos + 2] << 8) | (data[pos + 3] << 16) | (data[pos + 4] << 24)
+            pos += self.PLANE_HEADER_BYTES
+            if pos + length > len(data):
+                raise Exception("Compressed frame truncated")
+            self._planes[pixel_type] = data[pos:pos + length]
+            pos += length
+        self._chunk: bytearray = None
+
+    @classmethod
+    def load(cls, path: str) -> "Frame":
+        """
+        Load a compressed frame file; it is small enough to hold in RAM
+        """
+        with open(path, "rb") as f:
+            return cls(f.read())
+
+    @property
+    def width_bytes(self) -> int:
+        return self._width_bytes
+
+    @property
+    def height(self) -> int:
+        return self._height
+
+    @property
+    def plane_bytes(self) -> int:
+        """
+        Size of each decoded plane
+        """
+        return self._width_bytes * self._height
+
+    @property
+    def pixel_types(self) -> [PixelType]:
+        return list(self._planes.keys())
+
+    def encoded_bytes(self, pixel_type: PixelType) -> int:
+        return len(self._planes[pixel_type])
+
+    def expand_into(self, pixel_type: PixelType, dst: bytearray) -> None:
+        """
+        Decode a plane into a buffer of at least plane_bytes
+        """
+        if len(dst) < self.plane_bytes:
+            raise Exception(f"Can't expand a {self.plane_bytes} byte plane into {len(dst)} bytes")
+        for _ in unpack_chunks(self._planes[pixel_type], memoryview(dst)[0:self.plane_bytes]):
+            pass
+
+    def chunks(self, pixel_type: PixelType):
+        """
+        Decode a plane a chunk at a time. Every chunk is decoded into the same buffer, so it is only valid until the
+        next one is decoded.
+        """
+        if self._chunk is None:
+            self._chunk = bytearray(self.CHUNK_BYTES)
+        return unpack_chunks(self._planes[pixel_type], memoryview(self._chunk), self.plane_bytes)
+
+    def send(self, display: IEPaperDisplay) -> None:
+        """
+        Stream every plane to the display RAM as it is decoded, without a full plane buffer
+        """
+        if self._width_bytes != display.width_bytes or self._height != display.height_px:
+            raise Exception(f"Frame of {self._width_bytes}x{self._height} bytes doesn't fit the display")
+        for pixel_type in self._planes:
+            display.set_pixels(pixel_type, self.chunks(pixel_type))
+
+
+def unpack_chunks(src: memoryview, buf: memoryview, total: int = None):
+    """
+    Decode PackBits data into buf, yielding the filled part of buf each time it is full and once more at the end
+    :param src: Encoded bytes
+    :param buf: Output buffer
+    :param total: Decoded size; len(buf) if None
+    """
+    if total is None:
+        total = len(buf)
+    size = len(buf)
+    src_len = len(src)
+    pos = 0
+    pending = 0
+    literal = False
+    value = 0
+
+    while total:
+        n = 0
+        while n < size and total:
+            if pending == 0:
+                if pos >= src_len:
+                    raise Exception("Compressed plane truncated")
+                header = src[pos]
+                pos += 1
+                if header < 128:
+                    pending = header + 1
+                    literal = True
+                elif header > 128:
+                    if pos >= src_len:
+                        raise Exception("Compressed plane truncated")
+                    pending = 257 - header
+                    literal = False
+                    value = src[pos]
+                    pos += 1
+                else:
+                    continue
+
+            take = min(pending, size - n, total)
+            if literal:
+                if pos + take > src_len:
+                    raise Exception("Compressed plane truncated")
+                buf[n:n + take] = src[pos:pos + take]
+                pos += take
+            elif value == 0x00:
+                buf[n:n + take] = _RUN_00[0:take]
+            elif value == 0xFF:
+                buf[n:n + take] = _RUN_FF[0:take]
+            else:
+                _fill(buf, n, take, value)
+            n += take
+            pending -= take
+            total -= take
+        yield buf[0:n]
+
+
+def _fill(buf: memoryview, start: int, count: int, value: int) -> None:
+    # Doubling copies: log2(count) slice assignments instead of count byte stores
+    buf[start] = value
+    done = 1
+    while done < count:
+        step = min(done, count - done)
+        buf[start + done:start + done + step] = buf[start:start + step]
+        done += step
@@ -0,0 +1,134 @@
+class Image:
+    """
+    Packed 1-bit image: rows of MSB-first bytes where a set bit is an inked pixel.
+
+    Binary layout:
+        b"HI", version, width (2 bytes, little endian), height (2 bytes, little endian),
+        `height` rows of ceil(width / 8) bytes
+    """
+    MAGIC = b"HI"
+    VERSION = 1
+    HEADER_BYTES = 7
+
+    def __init__(self, width: int, height: int, data: bytearray = None):
+        self._width = width
+        self._height = height
+        self._row_bytes = (width + 7) >> 3
+        if data is None:
+            data = bytearray(self._row_bytes * height)
+        elif len(data) < self._row_bytes * height:
+            raise Exception(f"{width}x{height} image needs {self._row_bytes * height} bytes, got {len(data)}")
+        self._data = data
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Image":
+        """
+        Wrap an image in the packed format without copying the pixel rows
+        """
+        (width, height) = parse_header(data)
+        return cls(width, height, memoryview(data)[cls.HEADER_BYTES:])
+
+    @classmethod
+    def load(cls, path: str) -> "Image":
+        """
+        Load a whole packed image file into RAM
+        """
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+    @property
+    def width(self) -> int:
+        return self._width
+
+    @property
+    def height(self) -> int:
+        return self._height
+
+    @property
+    def row_bytes(self) -> int:
+        return self._row_bytes
+
+    @property
+    def data(self) -> bytearray:
+        return self._data
+
+    def rows(self):
+        """
+        Iterate over the packed rows, top to bottom
+        """
+        view = memoryview(self._data)
+        for r in range(self._height):
+            yield view[r * self._row_bytes:(r + 1) * self._row_bytes]
+
+    def to_bytes(self) -> bytes:
+        """
+        The image in the packed file format
+        """
+        return bytes(make_header(self._width, self._height)) + bytes(self._data[0:self._row_bytes * self._height])
+
+
+class ImageFile:
+    """
+    Packed image streamed from a file (e.g. on the flash filesystem) one row at a time, so only a single row buffer is
+    held in RAM. Use it as a context manager to close the file.
+    """
+
+    def __init__(self, path: str):
+        self._file = open(path, "rb")
+        header = self._file.read(Image.HEADER_BYTES)
+        (self._width, self._height) = parse_header(header)
+        self._row_bytes = (self._width + 7) >> 3
+        self._row = bytearray(self._row_bytes)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self) -> None:
+        self._file.close()
+
+    @property
+    def width(self) -> int:
+        return self._width
+
+    @property
+    def height(self) -> int:
+        return self._height
+
+    @property
+    def row_bytes(self) -> int:
+        return self._row_bytes
+
+    @property
+    def data(self) -> bytearray:
+        """
+        All rows read into a new buffer (for rotated blits, which need the whole bitmap)
+        """
+        self._file.seek(Image.HEADER_BYTES)
+        return self._file.read(self._row_bytes * self._height)
+
+    def rows(self):
+        """
+        Iterate over the rows, top to bottom. Every row is read into the same buffer, so it is only valid until the
+        next one is read.
+        """
+        self._file.seek(Image.HEADER_BYTES)
+        for _ in range(self._height):
+            if self._file.readinto(self._row) != self._row_bytes:
+                raise Exception("Image file truncated")
+            yield self._row
+
+
+def make_header(width: int, height: int) -> bytearray:
+    return bytearray(Image.MAGIC) + bytearray([Image.VERSION, width & 0xFF, width >> 8, height & 0xFF, height >> 8])
+
+
+def parse_header(data: bytes) -> (int, int):
+    """
+    :return: (width, height) from a packed image header
+    """
+    if len(data) < Image.HEADER_BYTES or bytes(data[0:2]) != Image.MAGIC or data[2] != Image.VERSION:
+        raise Exception("Not a packed image (bad magic or version)")
+    return data[3] | (data[4] << 8), data[5] | (data[6] << 8)
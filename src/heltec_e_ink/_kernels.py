@@ -0,0 +1,91 @@
+# Inner byte loops of the drawing code. The viper-compiled versions in _kernels_viper are used where MicroPython has
+# the viper emitter; the Python versions here are the fallback, and the reference they're checked against. Both take
+# the same arguments: bytes-like buffers already offset to their first byte, with small parameters packed into one int.
+
+
+def py_blit_row(dst, src, count: int, ink_edge: int) -> None:
+    """
+    Ink the set bits of count source bytes into dst: ORed in if the ink byte is 0xFF, cleared if it's 0x00
+    :param ink_edge: ink byte << 8 | mask applied to the last source byte
+    """
+    ink = ink_edge >> 8
+    edge = ink_edge & 0xFF
+    last = count - 1
+    for i in range(count):
+        b = src[i]
+        if i == last:
+            b &= edge
+        if b:
+            if ink:
+                dst[i] |= b
+            else:
+                dst[i] &= b ^ 0xFF
+
+
+def py_blit_row_masked(dst, src, mask, count_ink_edge: int) -> None:
+    """
+    Replace the dst bits under set mask bits: inked where the source bit is set, paper where it's clear
+    :param count_ink_edge: count << 16 | ink byte << 8 | mask applied to the last mask byte
+    """
+    count = count_ink_edge >> 16
+    ink = (count_ink_edge >> 8) & 0xFF
+    edge = count_ink_edge & 0xFF
+    last = count - 1
+    for i in range(count):
+        m = mask[i]
+        if i == last:
+            m &= edge
+        if m:
+            b = src[i]
+            if not ink:
+                b ^= 0xFF
+            dst[i] = (dst[i] & (m ^ 0xFF)) | (b & m)
+
+
+def py_shift_row(src, dst, src_bytes: int, shift_mask: int) -> None:
+    """
+    Shift one packed row right by 0-7 bits into dst, which must hold src_bytes + 1 bytes
+    :param shift_mask: mask applied to the last source byte << 8 | shift
+    """
+    shift = shift_mask & 7
+    last_mask = shift_mask >> 8
+    last = src_bytes - 1
+    carry = 0
+    for i in range(src_bytes):
+        b = src[i]
+        if i == last:
+            b &= last_mask
+        dst[i] = carry | (b >> shift)
+        carry = (b << (8 - shift)) & 0xFF
+    dst[src_bytes] = carry
+
+
+def py_next_changed_row(a, b, row: int, end_width: int) -> int:
+    """
+    First row from row on where two planes of the same layout differ, or the end row if none does. Unlike the other
+    kernels it takes the whole planes, so scanning a window allocates nothing.
+    :param end_width: row to stop before << 16 | row width in bytes
+    """
+    end = end_width >> 16
+    width = end_width & 0xFFFF
+    i = row * width
+    while row < end:
+        stop = i + width
+        while i < stop:
+            if a[i] != b[i]:
+                return row
+            i += 1
+        row += 1
+    return end
+
+
+try:
+    from ._kernels_viper import blit_row, blit_row_masked, next_changed_row, shift_row
+    NATIVE = True
+except (ImportError, SyntaxError, AttributeError):
+    # No viper emitter (CPython, or a port built without it)
+    blit_row = py_blit_row
+    blit_row_masked = py_blit_row_masked
+    next_changed_row = py_next_changed_row
+    shift_row = py_shift_row
+    NATIVE = False
@@ -0,0 +1,82 @@
+import micropython
+
+
+# Viper versions of the kernels in _kernels; importing this module fails wherever the viper emitter is missing.
+# Viper functions take at most four arguments, so small parameters are packed into one int.
+
+@micropython.viper
+def blit_row(dst, src, count: int, ink_edge: int):
+    d = ptr8(dst)
+    s = ptr8(src)
+    ink = ink_edge >> 8
+    edge = ink_edge & 0xFF
+    last = count - 1
+    i = 0
+    while i < count:
+        b = s[i]
+        if i == last:
+            b &= edge
+        if b:
+            if ink:
+                d[i] = d[i] | b
+            else:
+                d[i] = d[i] & (b ^ 0xFF)
+        i += 1
+
+
+@micropython.viper
+def blit_row_masked(dst, src, mask, count_ink_edge: int):
+    d = ptr8(dst)
+    s = ptr8(src)
+    k = ptr8(mask)
+    count = count_ink_edge >> 16
+    ink = (count_ink_edge >> 8) & 0xFF
+    edge = count_ink_edge & 0xFF
+    last = count - 1
+    i = 0
+    while i < count:
+        m = k[i]
+        if i == last:
+            m &= edge
+        if m:
+            b = s[i]
+            if not ink:
+                b ^= 0xFF
+            d[i] = (d[i] & (m ^ 0xFF)) | (b & m)
+        i += 1
+
+
+@micropython.viper
+def shift_row(src, dst, src_bytes: int, shift_mask: int):
+    s = ptr8(src)
+    d = ptr8(dst)
+    shift = shift_mask & 7
+    last_mask = shift_mask >> 8
+    last = src_bytes - 1
+    carry = 0
+    i = 0
+    while i < src_bytes:
+        b = s[i]
+        if i == last:
+            b &= last_mask
+        d[i] = carry | (b >> shift)
+        carry = (b << (8 - shift)) & 0xFF
+        i += 1
+    d[src_bytes] = carry
+
+
+@micropython.viper
+def next_changed_row(a, b, row: int, end_width: int) -> int:
+    p = ptr8(a)
+    q = ptr8(b)
+    end = end_width >> 16
+    width = end_width & 0xFFFF
+    i = row * width
+    while row < end:
+        stop = i + width
+        while i < stop:
+            if p[i] != q[i]:
+                return row
+            i += 1
+        row += 1
+    return end
@@ -0,0 +1,96 @@
+from ._display_interface import PixelType, RefreshMode
+from ._drawing import EInkCanvas
+
+
+class RefreshPipeline:
+    """
+    Overlaps drawing the next frame with the refresh of the current one.
+
+    The canvas is the back buffer. submit() snapshots it into the pipeline's front buffers and returns at once; the
+    run() task sends the snapshot as soon as the panel's BUSY line drops and starts its refresh. Frames submitted
+    while an earlier one is still waiting are coalesced: only the latest is sent.
+
+        pipeline = RefreshPipeline(canvas)
+        asyncio.create_task(pipeline.run())
+        while True:
+            draw(canvas)
+            pipeline.submit()
+            await asyncio.sleep(1)
+    """
+
+    def __init__(self, canvas: EInkCanvas, mode: RefreshMode = RefreshMode.FULL):
+        """
+        :param canvas: Canvas frames are drawn on
+        :param mode: Refresh mode used for every frame
+        """
+        try:
+            from asyncio import Event
+        except ImportError:
+            from uasyncio import Event
+
+        self._canvas = canvas
+        self._display = canvas.display
+        self._mode = mode
+        self._front: {PixelType: bytearray} = {}
+        for p in self._display.supported_pixel_types:
+            self._front[p] = bytearray(len(canvas.plane(p)))
+        self._pending = False
+        self._wake = Event()
+        self._idle = Event()
+        self._idle.set()
+
+        self.frames_submitted = 0
+        self.frames_sent = 0
+        self.frames_coalesced = 0
+
+    @property
+    def pending(self) -> bool:
+        """
+        Whether a submitted frame is waiting for the panel
+        """
+        return self._pending
+
+    def submit(self) -> None:
+        """
+        Queue the canvas contents as the next frame. A frame already waiting is replaced.
+        """
+        # A queued transport may still be sending the front buffers of the previous frame
+        self._display.flush_transfers()
+        for p, front in self._front.items():
+            front[:] = self._canvas.plane(p)
+
+        if self._pending:
+            self.frames_coalesced += 1
+        self._pending = True
+        self.frames_submitted += 1
+        self._idle.clear()
+        self._wake.set()
+
+    async def run(self) -> None:
+        """
+        Send queued frames as the panel becomes ready; run it as an asyncio task
+        """
+        while True:
+            await self._wake.wait()
+            self._wake.clear()
+
+            while self._pending:
+                # The previous refresh must finish before the controller RAM accepts new data
+                await self._display.wait_ready()
+                self._pending = False
+                for p, front in self._front.items():
+                    self._display.set_pixels(p, front)
+                    # The canvas diffs its next flush against what the panel now holds
+                    self._canvas.record_sent(p, front)
+                self._display.refresh(self._mode)
+                self.frames_sent += 1
+
+            await self._display.wait_ready()
+            if not self._pending:
+                self._idle.set()
+
+    async def wait_idle(self) -> None:
+        """
+        Wait until every submitted frame is on the panel and its refresh has finished
+        """
+        await self._idle.wait()
@@ -0,0 +1,149 @@
+from ._display_interface import IEPaperDisplay, RefreshMode
+from ._drawing import EInkCanvas
+
+
+class PowerState:
+    # Registers set up, ready for updates
+    AWAKE = 0
+    # Deep sleep mode 1: registers lost, RAM retained
+    SLEEP_RETAIN = 1
+    # Deep sleep mode 2 or panel power removed: registers and RAM lost. Also the state before the first wake, when an
+    # earlier run (before the MCU rebooted) may have left the panel in deep sleep.
+    OFF = 2
+
+
+class PowerManager:
+    """
+    Keeps the panel asleep between updates and wakes it with as little setup as its state allows: after deep sleep
+    mode 1 only the registers are re-sent, and only a panel that lost its RAM gets the full reset and initialization
+    (and the canvas re-sends every plane).
+
+    Updates are queued with submit() and applied together in one wake cycle by apply():
+
+        power = PowerManager(display, canvas)
+        power.submit(lambda c: c.draw_text(4, 4, "21.5C", PixelType.BLACK_WHITE))
+        power.submit(lambda c: c.draw_text(4, 14, "54%", PixelType.BLACK_WHITE))
+        power.apply()
+
+    The controller only leaves deep sleep through its RES# pin, so the display's SerialInitInfo needs a reset_pin.
+    """
+
+    def __init__(self, display: IEPaperDisplay, canvas: EInkCanvas = None, retain_ram: bool = True,
+                 sleep_after_apply: bool = True):
+        """
+        :param display: Display to manage; assumed to need a full initialization before its first update
+        :param canvas: Canvas the queued updates draw on
+        :param retain_ram: Sleep in mode 1, keeping the RAM; otherwise mode 2
+        :param sleep_after_apply: Put the panel back to sleep once apply() has refreshed it
+        """
+        self._display = display
+        self._canvas = canvas
+        self._retain_ram = retain_ram
+        self._sleep_after_apply = sleep_after_apply
+        self._state = PowerState.OFF
+        self._slept = False
+        self._queue = []
+
+        self.wakes = 0
+        self.full_inits = 0
+
+    @property
+    def state(self) -> PowerState:
+        return self._state
+
+    @property
+    def pending(self) -> int:
+        """
+        Number of queued updates
+        """
+        return len(self._queue)
+
+    def wake(self) -> None:
+        """
+        Bring the panel to AWAKE, re-sending only the setup it lost
+        """
+        if self._state == PowerState.AWAKE:
+            return
+
+        display = self._display
+        # Only RES# brings the controller out of deep sleep; it ignores the SPI bus until then. An OFF panel may be
+        # asleep without this manager having put it there, so it gets a reset whenever there's a pin for one.
+        if self._slept or (self._state == PowerState.OFF and display.can_hardware_reset):
+            display.hardware_reset()
+            self._slept = False
+
+        if self._state == PowerState.SLEEP_RETAIN:
+            display.restore_registers()
+        else:
+            display.initialize_display()
+            self.full_inits += 1
+            if self._canvas is not None:
+                self._canvas.invalidate()
+
+        self._state = PowerState.AWAKE
+        self.wakes += 1
+
+    def sleep(self) -> None:
+        """
+        Put the panel into deep sleep once it's done with the current refresh
+        """
+        if self._state != PowerState.AWAKE:
+            return
+
+        self._display.wait_until_ready()
+        self._display.enter_deep_sleep(self._retain_ram)
+        self._slept = True
+        self._state = PowerState.SLEEP_RETAIN if self._retain_ram else PowerState.OFF
+
+    def power_lost(self) -> None:
+        """
+        Record that the panel's power was removed, so the next wake initializes it in full
+        """
+        self._state = PowerState.OFF
+        self._slept = False
+
+    def submit(self, update) -> None:
+        """
+        Queue an update for the next apply()
+        :param update: Called with the canvas to draw on
+        """
+        if self._canvas is None:
+            raise Exception("Queued updates need a canvas")
+        self._queue.append(update)
+
+    def apply(self, mode: RefreshMode = RefreshMode.FULL) -> bool:
+        """
+        Wake the panel, draw every queued update, flush and refresh once, then sleep again
+        :param mode: Refresh mode
+        :return: True if anything was sent
+        """
+        if not self._queue:
+            return False
+
+        self.wake()
+        self._draw_queued()
+        sent = self._canvas.flush(refresh=True, mode=mode)
+        if self._sleep_after_apply:
+            self.sleep()
+        return sent
+
+    async def apply_async(self, mode: RefreshMode = RefreshMode.FULL) -> bool:
+        """
+        apply(), yielding to other asyncio tasks while the panel is busy
+        """
+        if not self._queue:
+            return False
+
+        self.wake()
+        self._draw_queued()
+        sent = self._canvas.flush(refresh=True, mode=mode)
+        await self._display.wait_ready()
+        if self._sleep_after_apply:
+            self.sleep()
+        return sent
+
+    def _draw_queued(self) -> None:
+        queue = self._queue
+        self._queue = []
+        for update in queue:
+            update(self._canvas)
@@ -0,0 +1,67 @@
+from ._display_interface import PixelType, RefreshMode
+
+
+class PanelProfile:
+    """
+    Declarative description of a panel, read by its controller's generic driver: adding a panel on a supported
+    controller is a new profile, not new code.
+
+    The init sequence is a precompiled blob of records, each the record length, the command byte and its data:
+        len(data) + 1, command, data...
+    so the driver sends every command with its data as one slice of the blob, without building a buffer.
+    """
+
+    def __init__(self, name: str, driver: str, width_px: int, height_px: int, planes: ((PixelType, int),),
+                 init: bytes, refresh_modes: {RefreshMode: int}, ram_x_offset: int = 0, reset_delay_ms: int = 100):
+        """
+        :param name: Panel model
+        :param driver: Module in heltec_e_ink.displays with the controller's Display and SerialInterface
+        :param width_px: Panel width in pixels
+        :param height_px: Panel height in pixels
+        :param planes: (pixel type, RAM write command) per plane, in flush order
+        :param init: Register setup sent after the reset, as an init blob; for SSD1680 panels its data entry mode also
+            decides which end of the RAM Y range holds the top row
+        :param refresh_modes: Controller parameter that selects each supported refresh mode
+        :param ram_x_offset: RAM X address (in bytes) of the panel's first column
+        :param reset_delay_ms: Time the controller needs after power-up before it takes commands
+        """
+        self.name = name
+        self.driver = driver
+        self.width_px = width_px
+        self.height_px = height_px
+        self.planes = planes
+        self.init = init
+        self.refresh_modes = refresh_modes
+        self.ram_x_offset = ram_x_offset
+        self.reset_delay_ms = reset_delay_ms
+
+    def __repr__(self):
+        return self.__str__()
+
+    def __str__(self):
+        return f"Panel Profile: {self.name} {self.width_px}x{self.height_px} ({self.driver})"
+
+
+def init_records(blob: bytes):
+    """
+    Iterate over an init blob, yielding each record's command and data as one memoryview slice
+    """
+    view = memoryview(blob)
+    i = 0
+    while i < len(blob):
+        n = blob[i]
+        if n == 0 or i + 1 + n > len(blob):
+            raise Exception(f"Malformed init blob at offset {i}")
+        yield view[i + 1:i + 1 + n]
+        i += 1 + n
+
+
+def find_init_record(blob: bytes, command: int):
+    """
+    The last record of an init blob that sets a command, as in init_records, or None if the blob doesn't set it
+    """
+    found = None
+    for record in init_records(blob):
+        if record[0] == command:
+            found = record
+    return found
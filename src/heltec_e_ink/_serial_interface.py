@@ -1,11 +1,98 @@
-from micropython import const
+import time
 
-from machine import Pin, SPI
+try:
+    from micropython import const
+except ImportError:
+    def const(v):
+        return v
+
+try:
+    from machine import Pin, SPI, idle
+except ImportError:
+    # Off-device (e.g. under CPython with the emulator); pins and the SPI bus must be injected
+    Pin = SPI = None
+
+    def idle():
+        pass
+
+
+if hasattr(time, "ticks_ms"):
+    _ticks_ms = time.ticks_ms
+    _ticks_diff = time.ticks_diff
+else:
+    def _ticks_ms() -> int:
+        return time.monotonic_ns() // 1_000_000
+
+    def _ticks_diff(end: int, start: int) -> int:
+        return end - start
+
+
+def sleep_ms_blocking(ms: int) -> None:
+    if hasattr(time, "sleep_ms"):
+        time.sleep_ms(ms)
+    else:
+        time.sleep(ms / 1000)
+
+
+async def sleep_ms_async(ms: int) -> None:
+    """
+    Sleep without blocking other asyncio tasks: asyncio.sleep_ms on MicroPython, asyncio.sleep under CPython
+    """
+    try:
+        from asyncio import sleep_ms
+    except ImportError:
+        try:
+            from uasyncio import sleep_ms
+        except ImportError:
+            from asyncio import sleep
+            await sleep(ms / 1000)
+            return
+    await sleep_ms(ms)
+
+
+def make_ready_flag():
+    """
+    asyncio.ThreadSafeFlag on MicroPython; an asyncio.Event-backed stand-in under CPython, which has none
+    """
+    try:
+        from asyncio import ThreadSafeFlag
+    except ImportError:
+        try:
+            from uasyncio import ThreadSafeFlag
+        except ImportError:
+            return _EventFlag()
+    return ThreadSafeFlag()
+
+
+class _EventFlag:
+    """
+    ThreadSafeFlag stand-in on asyncio.Event. wait() also returns every POLL_MS, so a BUSY pin without a working
+    interrupt (e.g. a mock) is still checked again
+    """
+    POLL_MS = 1
+
+    def __init__(self):
+        from asyncio import Event
+        self._event = Event()
+
+    def set(self) -> None:
+        self._event.set()
+
+    async def wait(self) -> None:
+        from asyncio import wait_for, TimeoutError
+        try:
+            await wait_for(self._event.wait(), self.POLL_MS / 1000)
+        except TimeoutError:
+            pass
+        self._event.clear()
 
 
 class SerialInitInfo:
     def __init__(self, spi_id: int, tx_pin: int, sck_pin: int, cs_pin: int, data_command_pin: int, busy_pin: int,
-                 baud_hz: int):
+                 baud_hz: int, reset_pin: int = None):
+        """
+        :param reset_pin: The panel's RES# pin, needed to wake it from deep sleep; None if it isn't wired
+        """
         self.spi_id: const(int) = const(spi_id)
         self.tx_pin: const(int) = const(tx_pin)
         self.sck_pin: const(int) = const(sck_pin)
@@ -13,6 +100,7 @@ class SerialInitInfo:
         self.data_command_pin: const(int) = const(data_command_pin)
         self.busy_pin: const(int) = const(busy_pin)
         self.baud_hz: const(int) = const(baud_hz)
+        self.reset_pin: int = reset_pin
 
     def __repr__(self):
         return self.__str__()
@@ -20,10 +108,13 @@ class SerialInitInfo:
     def __str__(self):
         return (
             f"Serial Info: spi={self.spi_id} baud={self.baud_hz}Hz tx={self.tx_pin} sck={self.sck_pin} " +
-            f"cs={self.cs_pin} dc={self.data_command_pin} busy={self.busy_pin}")
+            f"cs={self.cs_pin} dc={self.data_command_pin} busy={self.busy_pin} reset={self.reset_pin}")
 
 
 class ISerialDisplayInterface:
+    # RES# low time, and the wait after releasing it before the controller takes commands
+    RESET_PULSE_MS = const(10)
+
     #
     # Properties
     #
@@ -78,9 +169,12 @@ class ISerialDisplayInterface:
     # Methods
     #
 
-    def __init__(self, init_info: SerialInitInfo):
+    def __init__(self, init_info: SerialInitInfo, spi: SPI = None, pin_factory=None):
         """
         Initialize the interface (write only)
+        :param init_info: Pin connections and bus settings
+        :param spi: SPI bus to use instead of creating one from init_info
+        :param pin_factory: Called like machine.Pin to create the pins; machine.Pin if None
         """
 
         spi_id = init_info.spi_id
@@ -110,12 +204,79 @@ class ISerialDisplayInterface:
         if cs_pin in invalid_pin_map[spi_id]:
             raise Exception(f"In SPI {spi_id} mode, pins {invalid_pin_map[spi_id]} cannot be used as CS.\n" + err_msg)
 
-        self._tx_pin = Pin(tx_pin, mode=Pin.OUT)
-        self._sck_pin = Pin(sck_pin, mode=Pin.OUT)
-        self._cs_pin = Pin(cs_pin, mode=Pin.OUT, value=1)
-        self._data_command_pin = Pin(data_command_pin, mode=Pin.OUT, value=0)
-        self._busy_pin = Pin(busy_pin, mode=Pin.IN)
-        self._spi = SPI(spi_id, baud_hz, firstbit=SPI.MSB, polarity=0, phase=0, sck=self._sck_pin, mosi=self._tx_pin)
+        if pin_factory is None:
+            pin_factory = Pin
+
+        self._cs_pin = pin_factory(cs_pin, mode=pin_factory.OUT, value=1)
+        self._data_command_pin = pin_factory(data_command_pin, mode=pin_factory.OUT, value=0)
+        self._busy_pin = pin_factory(busy_pin, mode=pin_factory.IN)
+        self._reset_pin = None
+        if init_info.reset_pin is not None:
+            self._reset_pin = pin_factory(init_info.reset_pin, mode=pin_factory.OUT, value=1)
+        # Set from the BUSY falling-edge interrupt; created on the first async wait
+        self._ready_flag = None
+        self._busy_pin.irq(trigger=pin_factory.IRQ_FALLING, handler=self._on_busy_falling)
+        self._spi_id = spi_id
+        if spi is None:
+            # A bus passed in owns its pins already; creating them again would take them away from the SPI peripheral
+            self._tx_pin = pin_factory(tx_pin, mode=pin_factory.OUT)
+            self._sck_pin = pin_factory(sck_pin, mode=pin_factory.OUT)
+            spi = SPI(spi_id, baud_hz, firstbit=SPI.MSB, polarity=0, phase=0, sck=self._sck_pin, mosi=self._tx_pin)
+        self._spi = spi
+        # Optional asynchronous transport; when set, writes are queued on it instead of blocking
+        self.transport: QueuedTransport = None
+        # Set when the SPI bus is shared with other panels; writes claim the bus from them first
+        self.bus = None
+
+    @property
+    def can_reset(self) -> bool:
+        """
+        Whether a RES# pin is wired, so hardware_reset() can be used
+        """
+        return self._reset_pin is not None
+
+    def hardware_reset(self) -> None:
+        """
+        Pulse RES# low. This is the only way out of deep sleep: the controller ignores the SPI bus until then.
+        """
+        if self._reset_pin is None:
+            raise Exception("No RES# pin to reset the display with (see SerialInitInfo reset_pin)")
+
+        if self.transport is not None:
+            self.transport.flush()
+        self._reset_pin.value(0)
+        sleep_ms_blocking(self.RESET_PULSE_MS)
+        self._reset_pin.value(1)
+        sleep_ms_blocking(self.RESET_PULSE_MS)
+
+    def _on_busy_falling(self, pin: Pin) -> None:
+        # Interrupt context: no allocation
+        if self._ready_flag is not None:
+            self._ready_flag.set()
+
+    def wait_ready(self) -> None:
+        """
+        Block until queued transfers are sent and the BUSY line drops, sleeping the core between interrupts instead of
+        polling
+        """
+        if self.transport is not None:
+            self.transport.flush()
+        while self.is_busy:
+            idle()
+
+    async def wait_ready_async(self) -> None:
+        """
+        Wait for the BUSY line to drop without blocking other asyncio tasks
+        """
+        if self._ready_flag is None:
+            self._ready_flag = make_ready_flag()
+
+        if self.transport is not None:
+            await self.transport.wait_idle_async()
+
+        # A stale flag from an earlier edge only costs one extra check of the pin
+        while self.is_busy:
+            await self._ready_flag.wait()
 
     @classmethod
     def write_buffer(cls, buffer: bytearray) -> int:
@@ -124,3 +285,240 @@ class ISerialDisplayInterface:
         :param buffer: Buffer to write
         :return: Number of bytes written
         """
+
+    def write_command(self, command: int, data=None) -> int:
+        """
+        Write a command byte with DC low, then its data with DC high, without copying the data.
+        :param command: Command byte
+        :param data: Bytes-like data (e.g. a memoryview over a canvas plane), or None
+        :return: Number of bytes written, including the command
+        """
+
+    def write_stream(self, command: int, source) -> int:
+        """
+        Write a command followed by data that arrives in pieces, sending each piece as it comes.
+        :param command: Command byte
+        :param source: Iterable of bytes-like chunks, or a file-like object with readinto (read through a small
+                       fixed buffer)
+        :return: Number of bytes written, including the command
+        """
+
+
+class QueuedTransport:
+    """
+    Sends command writes in order without blocking the caller. Each queued write sends its command byte directly and
+    hands the data phase to the subclass, which calls _transfer_done() once the bytes are out; the next write starts
+    from there. Data buffers are referenced, not copied, and must not change until their write completes.
+
+    Waiting on the queue gives up with an exception once the active write has made no progress for timeout_ms, so a
+    transfer whose completion never arrives (e.g. a DMA interrupt that doesn't fire) fails instead of hanging.
+    """
+
+    def __init__(self, iface: ISerialDisplayInterface, depth: int = 8, timeout_ms: int = 1000):
+        """
+        :param iface: Interface whose pins and SPI bus carry the transfers
+        :param depth: Writes that may wait in the queue before submit() blocks
+        :param timeout_ms: Longest wait for the active write to complete
+        """
+        self._iface = iface
+        self._depth = depth
+        self._timeout_ms = timeout_ms
+        self._queue = []
+        self._active = None
+        self._command_buf = bytearray(1)
+        # Called (in interrupt-scheduled context on hardware) whenever the queue drains
+        self.on_idle = None
+        self.completed = 0
+
+    @property
+    def idle(self) -> bool:
+        """
+        Whether every queued write has been sent
+        """
+        return self._active is None and not self._queue
+
+    def submit(self, command: int, data=None, on_done=None) -> None:
+        """
+        Queue a command and its data
+        :param command: Command byte
+        :param data: Bytes-like data, or None
+        :param on_done: Called once the write has been sent
+        """
+        while len(self._queue) >= self._depth:
+            self._wait_for_progress()
+
+        self._queue.append((command, data, on_done))
+        if self._active is None:
+            self._start_next()
+
+    def flush(self) -> None:
+        """
+        Block until every queued write has been sent
+        """
+        while not self.idle:
+            self._wait_for_progress()
+
+    async def wait_idle_async(self) -> None:
+        """
+        Wait until every queued write has been sent without blocking other asyncio tasks
+        """
+        completed = self.completed
+        start = _ticks_ms()
+        while not self.idle:
+            await sleep_ms_async(1)
+            if self.completed != completed:
+                completed = self.completed
+                start = _ticks_ms()
+            elif _ticks_diff(_ticks_ms(), start) > self._timeout_ms:
+                self._timed_out()
+
+    def _wait_for_progress(self) -> None:
+        """
+        Wait until the active write completes, or raise once it has taken longer than timeout_ms
+        """
+        completed = self.completed
+        start = _ticks_ms()
+        while self.completed == completed and not self.idle:
+            self._wait_for_completion()
+            if self.completed == completed and _ticks_diff(_ticks_ms(), start) > self._timeout_ms:
+                self._timed_out()
+
+    def _timed_out(self) -> None:
+        raise Exception(f"Queued write of command 0x{self._active[0]:02X} didn't complete within {self._timeout_ms} ms")
+
+    def _start_next(self) -> None:
+        if not self._queue:
+            self._active = None
+            if self.on_idle is not None:
+                self.on_idle()
+            return
+
+        self._active = self._queue.pop(0)
+        (command, data, _) = self._active
+        self._send_command(command)
+
+        if data is not None and len(data) > 0:
+            self._iface.data_mode = True
+            self._start_data(memoryview(data))
+        else:
+            self._transfer_done()
+
+    def _send_command(self, command: int) -> None:
+        # A single byte; not worth a DMA transfer
+        iface = self._iface
+        self._command_buf[0] = command
+        iface.select_chip = True
+        iface.command_mode = True
+        iface._spi.write(self._command_buf)
+
+    def _transfer_done(self) -> None:
+        on_done = self._active[2]
+        self._iface.select_chip = False
+        self.completed += 1
+        if on_done is not None:
+            on_done()
+        self._start_next()
+
+    def _start_data(self, data: memoryview) -> None:
+        """
+        Start sending the data phase of the active write; call _transfer_done() when it completes
+        """
+        raise NotImplementedError()
+
+    def _wait_for_completion(self) -> None:
+        """
+        Wait for the active transfer to make progress
+        """
+        idle()
+
+
+class DmaTransport(QueuedTransport):
+    """
+    Feeds the data phase of each write to the RP2040 SPI TX FIFO with an rp2.DMA channel, so the CPU is free while a
+    plane goes out. Requires MicroPython with rp2.DMA (1.21 or newer). benchmarks/smoke_dma.py checks it on the board.
+    """
+    _SPI_BASE = (0x4003C000, 0x40040000)
+    _SSPDR = 0x008
+    _SSPSR = 0x00C
+    _SSPDMACR = 0x024
+    _SSPSR_BSY = 0x10
+    _SSPDMACR_TXDMAE = 0x02
+    # DREQ numbers of SPI0 TX and SPI1 TX
+    _DREQ_SPI_TX = (16, 18)
+
+    def __init__(self, iface: ISerialDisplayInterface, depth: int = 8, timeout_ms: int = 1000):
+        super().__init__(iface, depth, timeout_ms)
+        from rp2 import DMA
+        from machine import mem32
+
+        self._mem32 = mem32
+        base = self._SPI_BASE[iface._spi_id]
+        self._data_reg = base + self._SSPDR
+        self._status_reg = base + self._SSPSR
+        mem32[base + self._SSPDMACR] |= self._SSPDMACR_TXDMAE
+
+        self._dma = DMA()
+        # pack_ctrl() defaults to irq_quiet=True, which would never raise the end-of-transfer interrupt the queue
+        # advances on
+        self._ctrl = self._dma.pack_ctrl(size=0, inc_read=True, inc_write=False, irq_quiet=False,
+                                         treq_sel=self._DREQ_SPI_TX[iface._spi_id])
+        self._dma.irq(handler=self._on_dma_done)
+
+    def close(self) -> None:
+        """
+        Release the DMA channel
+        """
+        self.flush()
+        self._dma.close()
+
+    def _start_data(self, data: memoryview) -> None:
+        self._dma.config(read=data, write=self._data_reg, count=len(data), ctrl=self._ctrl, trigger=True)
+
+    def _on_dma_done(self, dma) -> None:
+        # The DMA finishes when the last byte enters the FIFO; CS must stay low until it has shifted out
+        while self._mem32[self._status_reg] & self._SSPSR_BSY:
+            pass
+        self._transfer_done()
+
+
+class FakeTransport(QueuedTransport):
+    """
+    Host-side transport that records writes and sends a data phase only when complete() is called, standing in for the
+    DMA so the queueing and ordering logic can run off-device (e.g. against the emulated controller). Data is read when
+    it goes out, as the DMA would, so changing a buffer before then changes what is sent.
+    """
+
+    def __init__(self, iface: ISerialDisplayInterface, depth: int = 8, timeout_ms: int = 1000):
+        super().__init__(iface, depth, timeout_ms)
+        # (command, data bytes) in the order the writes were sent
+        self.log = []
+        self._data: memoryview = None
+
+    @property
+    def in_flight(self) -> bool:
+        """
+        Whether a data phase is waiting for complete()
+        """
+        return self._data is not None
+
+    def complete(self) -> None:
+        """
+        Send the active data phase on the SPI bus and finish it, as the DMA and its interrupt would
+        """
+        data = self._data
+        if data is None:
+            raise Exception("No transfer in flight")
+        self._data = None
+        self._iface._spi.write(data)
+        self.log[-1] = (self.log[-1][0], bytes(data))
+        self._transfer_done()
+
+    def _send_command(self, command: int) -> None:
+        super()._send_command(command)
+        self.log.append((command, b""))
+
+    def _start_data(self, data: memoryview) -> None:
+        self._data = data
+
+    def _wait_for_completion(self) -> None:
+        self.complete()
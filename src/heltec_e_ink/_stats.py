@@ -0,0 +1,292 @@
+import time
+
+from ._display_interface import IEPaperDisplay
+from ._drawing import EInkCanvas
+
+if hasattr(time, "ticks_us"):
+    _ticks_us = time.ticks_us
+    _ticks_diff = time.ticks_diff
+else:
+    def _ticks_us() -> int:
+        return time.perf_counter_ns() // 1000
+
+    def _ticks_diff(end: int, start: int) -> int:
+        return end - start
+
+
+class Stats:
+    """
+    Opt-in per-stage timings (microseconds) and counters for the draw, flush, SPI, busy-wait and refresh path.
+
+    attach() wraps the methods of a display (and optionally a canvas) on those instances only, and detach() puts the
+    originals back, so nothing is measured, and nothing costs anything, unless a Stats object is attached.
+    Stage times nest: flush time includes the SPI time spent inside it. Refresh time runs from the end of refresh() to
+    the first time BUSY is read low afterwards, however it is read (a wait, display_ready or a bus polling its panels),
+    so it includes whatever the CPU did in between. Data phases sent by a DmaTransport bypass the SPI bus and are not
+    counted.
+    pixels_drawn counts the pixels the canvas writes after clipping: whole spans, and the set bits of blitted images
+    and glyphs (of the mask, for masked blits). FrameBufferCanvas primitives drawn by native framebuf aren't counted.
+    """
+
+    def __init__(self):
+        self._wrapped = []
+        self._draw_depth = 0
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Zero every counter
+        """
+        self.draw_us = 0
+        self.draw_calls = 0
+        self.pixels_drawn = 0
+        self.flush_us = 0
+        self.flushes = 0
+        self.spi_us = 0
+        self.spi_calls = 0
+        self.bytes_sent = 0
+        self.busy_us = 0
+        self.busy_waits = 0
+        self.refreshes = 0
+        self.refresh_us_last = 0
+        self.refresh_us_max = 0
+        self.refresh_us_total = 0
+
+    @property
+    def refresh_us_mean(self) -> int:
+        """
+        Mean time of the refreshes seen to finish
+        """
+        return self.refresh_us_total // self.refreshes if self.refreshes else 0
+
+    def as_dict(self) -> dict:
+        return {
+            "draw_us": self.draw_us, "draw_calls": self.draw_calls, "pixels_drawn": self.pixels_drawn,
+            "flush_us": self.flush_us, "flushes": self.flushes,
+            "spi_us": self.spi_us, "spi_calls": self.spi_calls, "bytes_sent": self.bytes_sent,
+            "busy_us": self.busy_us, "busy_waits": self.busy_waits,
+            "refreshes": self.refreshes, "refresh_us_last": self.refresh_us_last,
+            "refresh_us_max": self.refresh_us_max, "refresh_us_mean": self.refresh_us_mean,
+        }
+
+    def __repr__(self):
+        return self.__str__()
+
+    def __str__(self):
+        return (
+            f"Stats: draw={self.draw_us}us/{self.draw_calls} calls/{self.pixels_drawn} px " +
+            f"flush={self.flush_us}us/{self.flushes} spi={self.spi_us}us/{self.spi_calls} calls/{self.bytes_sent} B " +
+            f"busy={self.busy_us}us/{self.busy_waits} refresh={self.refreshes} " +
+            f"(last={self.refresh_us_last}us max={self.refresh_us_max}us mean={self.refresh_us_mean}us)")
+
+    #
+    # Attaching
+    #
+
+    def attach(self, display: IEPaperDisplay, canvas: EInkCanvas = None) -> "Stats":
+        """
+        Start measuring a display, its serial interface, and optionally a canvas drawing on it
+        """
+        # Start of this display's refresh in progress, or None
+        refresh = [None]
+        self._wrap(display, "wait_until_ready", lambda fn: self._timed_busy(fn, refresh))
+        self._wrap(display, "wait_ready", lambda fn: self._timed_busy_async(fn, refresh))
+        self._wrap(display, "refresh", lambda fn: self._counted_refresh(fn, refresh))
+
+        iface = getattr(display, "_display_iface", None)
+        if iface is not None:
+            self._wrap(iface, "_spi", lambda spi: _CountingSPI(spi, self))
+            self._wrap(iface, "_busy_pin", lambda pin: _WatchedBusyPin(pin, self, refresh))
+
+        if canvas is not None:
+            for name in ("draw_pixel", "draw_line", "draw_circle", "draw_rectangle", "draw_text", "blit",
+                         "draw_buffer", "clear"):
+                self._wrap(canvas, name, self._timed_draw)
+            for name in ("flush", "flush_partial"):
+                self._wrap(canvas, name, self._timed_flush)
+            self._wrap(canvas, "_draw_pixel", lambda fn: self._counted_pixel(canvas, fn))
+            self._wrap(canvas, "_fill_rect_absolute", lambda fn: self._counted_span(canvas, fn))
+            self._wrap(canvas, "_blit_absolute", lambda fn: self._counted_blit(canvas, fn))
+        return self
+
+    def detach(self) -> None:
+        """
+        Restore every wrapped method
+        """
+        while self._wrapped:
+            (obj, name, had_own, original) = self._wrapped.pop()
+            if had_own:
+                setattr(obj, name, original)
+            else:
+                delattr(obj, name)
+
+    def _wrap(self, obj, name: str, make_wrapper) -> None:
+        if not hasattr(obj, name):
+            return
+        original = getattr(obj, name)
+        had_own = name in obj.__dict__
+        setattr(obj, name, make_wrapper(original))
+        self._wrapped.append((obj, name, had_own, original))
+
+    #
+    # Wrappers
+    #
+
+    def _timed_draw(self, fn):
+        def wrapper(*args, **kwargs):
+            self._draw_depth += 1
+            start = _ticks_us()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self._draw_depth -= 1
+                if self._draw_depth == 0:
+                    self.draw_us += _ticks_diff(_ticks_us(), start)
+                    self.draw_calls += 1
+        return wrapper
+
+    def _timed_flush(self, fn):
+        def wrapper(*args, **kwargs):
+            start = _ticks_us()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.flush_us += _ticks_diff(_ticks_us(), start)
+                self.flushes += 1
+        return wrapper
+
+    def _counted_pixel(self, canvas: EInkCanvas, fn):
+        def wrapper(x, y, color):
+            (ax, ay) = canvas._to_absolute(x, y)
+            if 0 <= ax < canvas._w and canvas._y0 <= ay < canvas._y1 and color in canvas._planes:
+                self.pixels_drawn += 1
+            fn(x, y, color)
+        return wrapper
+
+    def _counted_span(self, canvas: EInkCanvas, fn):
+        def wrapper(x0, y0, x1, y1, color):
+            # Clipped as _fill_rect_absolute clips
+            w = min(max(x0, x1), canvas._w - 1) - max(min(x0, x1), 0) + 1
+            h = min(max(y0, y1), canvas._y1 - 1) - max(min(y0, y1), canvas._y0) + 1
+            if w > 0 and h > 0 and color in canvas._planes:
+                self.pixels_drawn += w * h
+            fn(x0, y0, x1, y1, color)
+        return wrapper
+
+    def _counted_blit(self, canvas: EInkCanvas, fn):
+        def wrapper(data, row_bytes, height, x_byte, y, color, mask=None):
+            if color in canvas._planes:
+                self.pixels_drawn += _blit_pixels(canvas, mask if mask is not None else data, row_bytes, height,
+                                                  x_byte, y)
+            fn(data, row_bytes, height, x_byte, y, color, mask)
+        return wrapper
+
+    def _counted_refresh(self, fn, refresh: list):
+        def wrapper(*args, **kwargs):
+            fn(*args, **kwargs)
+            self.refreshes += 1
+            refresh[0] = _ticks_us()
+        return wrapper
+
+    def _refresh_done(self, refresh: list) -> None:
+        """
+        BUSY was seen low: end the display's refresh in progress, if there is one
+        """
+        start = refresh[0]
+        if start is None:
+            return
+        refresh[0] = None
+        elapsed = _ticks_diff(_ticks_us(), start)
+        self.refresh_us_last = elapsed
+        self.refresh_us_total += elapsed
+        self.refresh_us_max = max(self.refresh_us_max, elapsed)
+
+    def _record_busy(self, elapsed: int, refresh: list) -> None:
+        self.busy_us += elapsed
+        self.busy_waits += 1
+        # For displays whose BUSY pin isn't watched; otherwise the wait has read it low already
+        self._refresh_done(refresh)
+
+    def _timed_busy(self, fn, refresh: list):
+        def wrapper():
+            start = _ticks_us()
+            fn()
+            self._record_busy(_ticks_diff(_ticks_us(), start), refresh)
+        return wrapper
+
+    def _timed_busy_async(self, fn, refresh: list):
+        async def wrapper():
+            start = _ticks_us()
+            await fn()
+            self._record_busy(_ticks_diff(_ticks_us(), start), refresh)
+        return wrapper
+
+
+# Set bits per byte value
+_POPCOUNT = bytes(bin(b).count("1") for b in range(256))
+
+
+def _blit_pixels(canvas: EInkCanvas, bits, row_bytes: int, height: int, x_byte: int, y: int) -> int:
+    """
+    Pixels a blit writes: the set bits (of the data, or of the mask when there is one) left after clipping as
+    _blit_absolute clips
+    """
+    stride = canvas._stride
+    c0 = max(0, -x_byte)
+    c1 = min(row_bytes, stride - x_byte)
+    r0 = max(0, canvas._y0 - y)
+    r1 = min(height, canvas._y1 - y)
+    if c0 >= c1 or r0 >= r1:
+        return 0
+    edge = 0xFF
+    if c1 == stride - x_byte:
+        edge = (0xFF << (stride * 8 - canvas._w)) & 0xFF
+
+    count = 0
+    for r in range(r0, r1):
+        start = r * row_bytes
+        for c in range(c0, c1 - 1):
+            count += _POPCOUNT[bits[start + c]]
+        count += _POPCOUNT[bits[start + c1 - 1] & edge]
+    return count
+
+
+class _CountingSPI:
+    """
+    SPI bus proxy that times and counts writes
+    """
+
+    def __init__(self, spi, stats: Stats):
+        self._spi = spi
+        self._stats = stats
+
+    def write(self, buf) -> None:
+        start = _ticks_us()
+        self._spi.write(buf)
+        stats = self._stats
+        stats.spi_us += _ticks_diff(_ticks_us(), start)
+        stats.spi_calls += 1
+        stats.bytes_sent += len(buf)
+
+    def __getattr__(self, name: str):
+        return getattr(self._spi, name)
+
+
+class _WatchedBusyPin:
+    """
+    BUSY pin proxy that ends the display's refresh in progress the first time the pin reads low
+    """
+
+    def __init__(self, pin, stats: Stats, refresh: list):
+        self._pin = pin
+        self._stats = stats
+        self._refresh = refresh
+
+    def value(self, *args):
+        v = self._pin.value(*args)
+        if not args and v == 0 and self._refresh[0] is not None:
+            self._stats._refresh_done(self._refresh)
+        return v
+
+    def __getattr__(self, name: str):
+        return getattr(self._pin, name)
@@ -0,0 +1,514 @@
+from .. import PixelType, RefreshMode
+from heltec_e_ink._serial_interface import ISerialDisplayInterface, SerialInitInfo, SPI, const, sleep_ms_async, \
+    sleep_ms_blocking
+from heltec_e_ink._display_interface import IEPaperDisplay
+from heltec_e_ink._profile import PanelProfile, find_init_record, init_records
+
+
+def is_buffer(data) -> bool:
+    """
+    Whether pixel data is a bytes-like buffer rather than a chunk iterator or file
+    """
+    return isinstance(data, (bytes, bytearray, memoryview))
+
+
+class SerialInterface(ISerialDisplayInterface):
+    # Largest single SPI transaction; bigger buffers are sent as consecutive chunks with CS held low
+    TRANSFER_CHUNK_BYTES = const(4096)
+    # Size of the fixed buffer file-like streams are read through
+    STREAM_BUFFER_BYTES = const(256)
+
+    def __init__(self, init_info: SerialInitInfo, spi: SPI = None, pin_factory=None):
+        super().__init__(init_info, spi, pin_factory)
+        self._command_buf = bytearray(1)
+        self._stream_buf: bytearray = None
+
+    def write_buffer(self, buffer: bytearray) -> int:
+        if len(buffer) == 0:
+            return 0
+        view = memoryview(buffer)
+        return self.write_command(view[0], view[1:] if len(view) > 1 else None)
+
+    def write_command(self, command: int, data=None) -> int:
+        if self.bus is not None:
+            self.bus.claim(self)
+
+        data_len = 0 if data is None else len(data)
+        if self.transport is not None:
+            self.transport.submit(command, data)
+            return 1 + data_len
+
+        spi = self._spi
+
+        self._command_buf[0] = command
+        self.select_chip = True
+        self.command_mode = True
+        spi.write(self._command_buf)
+
+        if data_len:
+            self.data_mode = True
+            chunk = self.TRANSFER_CHUNK_BYTES
+            if data_len <= chunk:
+                spi.write(data)
+            else:
+                view = memoryview(data)
+                for start in range(0, data_len, chunk):
+                    spi.write(view[start:start + chunk])
+
+        self.select_chip = False
+
+        return 1 + data_len
+
+    def write_stream(self, command: int, source) -> int:
+        if self.bus is not None:
+            self.bus.claim(self)
+
+        # Stream chunks may reuse one buffer, so they can't be queued; let queued writes finish first
+        if self.transport is not None:
+            self.transport.flush()
+
+        spi = self._spi
+        written = 1
+
+        self._command_buf[0] = command
+        self.select_chip = True
+        self.command_mode = True
+        spi.write(self._command_buf)
+        self.data_mode = True
+
+        try:
+            if hasattr(source, "readinto"):
+                if self._stream_buf is None:
+                    self._stream_buf = bytearray(self.STREAM_BUFFER_BYTES)
+                view = memoryview(self._stream_buf)
+                while True:
+                    n = source.readinto(self._stream_buf)
+                    if not n:
+                        break
+                    spi.write(view[0:n])
+                    written += n
+            else:
+                for chunk in source:
+                    if len(chunk):
+                        spi.write(chunk)
+                        written += len(chunk)
+        finally:
+            self.select_chip = False
+
+        return written
+
+
+class Cmd:
+    DRIVER_OUTPUT_CTRL = const(0x01)
+    GATE_VOLTAGE = const(0x03)
+    SOURCE_VOLTAGE = const(0x04)
+    DEEP_SLEEP = const(0x10)
+    DATA_ENTRY_MODE = const(0x11)
+    SOFT_RESET = const(0x12)
+    TEMPERATURE_SENSOR = const(0x18)
+    MASTER_ACTIVATION = const(0x20)
+    DISPLAY_UPDATE_CONTROL_1 = const(0x21)
+    DISPLAY_UPDATE_CONTROL_2 = const(0x22)
+    WRITE_BW_RAM = const(0x24)
+    WRITE_R_RAM = const(0x26)
+    WRITE_VCOM = const(0x2C)
+    WRITE_LUT = const(0x32)
+    END_OPTION = const(0x3F)
+    BORDER_WAVEFORM = const(0x3C)
+    RAM_X_START = const(0x44)
+    RAM_Y_START = const(0x45)
+    RAM_X_COUNTER = const(0x4E)
+    RAM_Y_COUNTER = const(0x4F)
+    ANALOG_BLOCK_CTRL = const(0x74)
+    DIGITAL_BLOCK_CTRL = const(0x7E)
+
+
+class Display(IEPaperDisplay):
+    """
+    Generic driver for panels on SSD1680-style controllers; geometry, planes, register setup and refresh modes come
+    from the panel's profile
+    """
+    # Waveform LUT register size; a LUT file may append the end option, gate, source and VCOM voltages (159 bytes)
+    LUT_BYTES = const(153)
+    LUT_WITH_VOLTAGES_BYTES = const(159)
+    # Display update control 1: normal RAM content, or red RAM bypassed as 0 so only the BW plane is driven
+    UPDATE_CTRL_1_NORMAL = b"\x00\x00"
+    UPDATE_CTRL_1_BW_ONLY = b"\x40\x00"
+    # Stands in for a refresh mode in _lut_mode once a custom LUT is uploaded
+    _LUT_CUSTOM = const(-1)
+    # Data entry mode bits: X counts up, Y counts up, Y advances before X. The controller resets to 0x03.
+    ENTRY_X_INC = const(0x01)
+    ENTRY_Y_INC = const(0x02)
+    ENTRY_Y_FIRST = const(0x04)
+    ENTRY_MODE_RESET = const(0x03)
+
+    def __init__(self, display_iface: ISerialDisplayInterface, profile: PanelProfile):
+        self._display_iface: ISerialDisplayInterface = display_iface
+        self._profile = profile
+        self._initialized = False
+        self._pixel_types = [p for (p, _) in profile.planes]
+        self._pixel_type_cmd = {p: cmd for (p, cmd) in profile.planes}
+        self._refresh_mode_cmd = profile.refresh_modes
+        self._ram_x_offset = profile.ram_x_offset
+        self._width_px = profile.width_px
+        self._height_px = profile.height_px
+        self._width_bytes = (profile.width_px + 7) >> 3
+        # Pixel data goes out top row first, left to right, so the init blob's data entry mode must count X up and
+        # advance X first; its Y direction decides whether the top row is the lowest or the highest RAM Y address
+        entry_mode = self.ENTRY_MODE_RESET
+        record = find_init_record(profile.init, Cmd.DATA_ENTRY_MODE)
+        if record is not None and len(record) > 1:
+            entry_mode = record[1] & 0x07
+        if entry_mode & (self.ENTRY_X_INC | self.ENTRY_Y_FIRST) != self.ENTRY_X_INC:
+            raise Exception(f"Data entry mode 0x{entry_mode:02X} of {profile.name} doesn't count X up before Y")
+        self._ram_y_inc = entry_mode & self.ENTRY_Y_INC != 0
+        # Refresh mode whose LUT the controller holds (or _LUT_CUSTOM); None until the first refresh after a reset
+        self._lut_mode: RefreshMode = None
+        self._update_ctrl_1 = self.UPDATE_CTRL_1_NORMAL
+        # The RAM window currently programmed as (x_byte, y, width_bytes, height); None is the full frame
+        self._window: (int, int, int, int) = None
+        # Register data is staged here rather than in a new buffer per write; _register_views[n] holds the first n bytes
+        self._register_buf = bytearray(4)
+        self._register_views = [memoryview(self._register_buf)[0:n] for n in range(5)]
+
+    @property
+    def profile(self) -> PanelProfile:
+        return self._profile
+
+    @property
+    def supported_pixel_types(self) -> [PixelType]:
+        return self._pixel_types
+
+    @property
+    def width_px(self) -> int:
+        return self._width_px
+
+    @property
+    def width_bytes(self) -> int:
+        return self._width_bytes
+
+    @property
+    def height_px(self) -> int:
+        return self._height_px
+
+    @property
+    def display_ready(self) -> bool:
+        return not self._display_iface.is_busy
+
+    @property
+    def bits_per_pixel(self) -> int:
+        return 1
+
+    def initialize_display(self) -> None:
+        if self._initialized:
+            return
+
+        try:
+            self._initialized = True
+
+            # Wait for the screen to initialize its state machine
+            sleep_ms_blocking(self._profile.reset_delay_ms)
+            self.power_on_reset()
+
+            self._write_init_registers()
+
+            self.wait_until_ready()
+
+            self._initialized = True
+
+        except Exception as e:
+            self._initialized = False
+            raise e
+
+    async def initialize_display_async(self) -> None:
+        if self._initialized:
+            return
+
+        try:
+            self._initialized = True
+
+            # Wait for the screen to initialize its state machine
+            await sleep_ms_async(self._profile.reset_delay_ms)
+            await self.power_on_reset_async()
+            self._write_init_registers()
+            await self.wait_ready()
+
+        except Exception as e:
+            self._initialized = False
+            raise e
+
+    def _write_init_registers(self) -> None:
+        write_buffer = self._display_iface.write_buffer
+        for record in init_records(self._profile.init):
+            write_buffer(record)
+        self._window = None
+        # The soft reset cleared the LUT register and display update control 1
+        self._lut_mode = None
+        self._update_ctrl_1 = self.UPDATE_CTRL_1_NORMAL
+
+    def power_on_reset(self):
+        self.wait_until_ready()
+        self.write(Cmd.SOFT_RESET)
+        self.wait_until_ready()
+
+    async def power_on_reset_async(self) -> None:
+        await self.wait_ready()
+        self.write(Cmd.SOFT_RESET)
+        await self.wait_ready()
+
+    def enter_deep_sleep(self, retain_ram: bool = True) -> None:
+        self.write(Cmd.DEEP_SLEEP, [0x01 if retain_ram else 0x03])
+        # The controller comes back with its registers at their reset values
+        self._initialized = False
+
+    def exit_deep_sleep(self) -> None:
+        # The controller ignores SPI in deep sleep; only RES# wakes it
+        self.hardware_reset()
+
+    @property
+    def can_hardware_reset(self) -> bool:
+        return self._display_iface.can_reset
+
+    def hardware_reset(self) -> None:
+        self._display_iface.hardware_reset()
+        self.wait_until_ready()
+        self._initialized = False
+
+    def restore_registers(self) -> None:
+        self._write_init_registers()
+        self.wait_until_ready()
+        self._initialized = True
+
+    def refresh(self, mode: RefreshMode = RefreshMode.FULL) -> None:
+        if mode not in self._refresh_mode_cmd:
+            raise Exception(f"Unsupported refresh mode {mode}")
+
+        if mode == RefreshMode.FAST and self._lut_mode not in (RefreshMode.FULL, self._LUT_CUSTOM):
+            # Nothing usable is loaded yet, so this one has to load the full LUT
+            mode = RefreshMode.FULL
+
+        update_ctrl_1 = self.UPDATE_CTRL_1_BW_ONLY if mode == RefreshMode.PARTIAL_BW else self.UPDATE_CTRL_1_NORMAL
+        if update_ctrl_1 != self._update_ctrl_1:
+            self.write(Cmd.DISPLAY_UPDATE_CONTROL_1, update_ctrl_1)
+            self._update_ctrl_1 = update_ctrl_1
+
+        self._register_buf[0] = self._refresh_mode_cmd[mode]
+        self._write_register(Cmd.DISPLAY_UPDATE_CONTROL_2, 1)
+        self.write(Cmd.MASTER_ACTIVATION)
+
+        if mode == RefreshMode.FULL:
+            self._lut_mode = RefreshMode.FULL
+        elif mode != RefreshMode.FAST:
+            self._lut_mode = RefreshMode.PARTIAL
+
+    async def refresh_async(self, mode: RefreshMode = RefreshMode.FULL) -> None:
+        self.refresh(mode)
+        await self.wait_ready()
+
+    def load_lut(self, lut) -> None:
+        if isinstance(lut, str):
+            with open(lut, "rb") as f:
+                lut = f.read()
+        elif hasattr(lut, "read"):
+            lut = lut.read()
+
+        if len(lut) not in (self.LUT_BYTES, self.LUT_WITH_VOLTAGES_BYTES):
+            raise Exception(f"A LUT is {self.LUT_BYTES} or {self.LUT_WITH_VOLTAGES_BYTES} bytes (got {len(lut)})")
+
+        lut = memoryview(lut)
+        self.write(Cmd.WRITE_LUT, lut[:self.LUT_BYTES])
+        if len(lut) == self.LUT_WITH_VOLTAGES_BYTES:
+            self.write(Cmd.END_OPTION, lut[153:154])
+            self.write(Cmd.GATE_VOLTAGE, lut[154:155])
+            self.write(Cmd.SOURCE_VOLTAGE, lut[155:158])
+            self.write(Cmd.WRITE_VCOM, lut[158:159])
+        self._lut_mode = self._LUT_CUSTOM
+
+    def set_pixels(self, pixel_flags: PixelType, img_bytes: bytearray, start_byte: int = None) -> None:
+        if pixel_flags not in self.supported_pixel_types:
+            raise Exception(f"Unsupported pixel type {pixel_flags}")
+
+        if start_byte is None:
+            start_byte = 0
+
+        width_bytes = self.width_bytes
+        if start_byte < 0 or start_byte >= width_bytes * self.height_px \
+                or (is_buffer(img_bytes) and start_byte + len(img_bytes) > width_bytes * self.height_px):
+            raise Exception(f"Can't write pixels at offset {start_byte}")
+
+        if self._window is not None:
+            self.set_ram_window(0, 0, width_bytes, self.height_px)
+            self._window = None
+        # Writing continues in raster order, wrapping to the start of the next row
+        self.set_ram_counter(start_byte % width_bytes, start_byte // width_bytes)
+
+        self._write_pixels(self._pixel_type_cmd[pixel_flags], img_bytes)
+
+    def set_pixels_window(self, pixel_type: PixelType, img_bytes: bytearray, x_byte: int, y: int, width_bytes: int,
+                          height: int) -> None:
+        if pixel_type not in self.supported_pixel_types:
+            raise Exception(f"Unsupported pixel type {pixel_type}")
+
+        if x_byte < 0 or y < 0 or width_bytes <= 0 or height <= 0 \
+                or x_byte + width_bytes > self.width_bytes or y + height > self.height_px:
+            raise Exception(f"Window ({x_byte}, {y}, {width_bytes}, {height}) is outside the display")
+
+        if is_buffer(img_bytes) and len(img_bytes) != width_bytes * height:
+            raise Exception(f"Window of {width_bytes}x{height} bytes can't hold {len(img_bytes)} bytes")
+
+        window = (x_byte, y, width_bytes, height)
+        if self._window != window:
+            self.set_ram_window(x_byte, y, width_bytes, height)
+            self._window = window
+        self.set_ram_counter(x_byte, y)
+
+        self._write_pixels(self._pixel_type_cmd[pixel_type], img_bytes)
+
+    def _write_pixels(self, command: int, img_bytes) -> None:
+        if is_buffer(img_bytes):
+            self.write(command, img_bytes)
+        else:
+            self._display_iface.write_stream(command, img_bytes)
+
+    def set_ram_window(self, x_byte: int, y: int, width_bytes: int, height: int) -> None:
+        """
+        Program the RAM window that subsequent writes fill
+        :param x_byte: First byte column of the window
+        :param y: First row of the window
+        :param width_bytes: Width of the window in bytes
+        :param height: Height of the window in rows
+        """
+        y_start = self._ram_y(y)
+        y_end = self._ram_y(y + height - 1)
+        buf = self._register_buf
+        buf[0] = x_byte + self._ram_x_offset
+        buf[1] = x_byte + width_bytes - 1 + self._ram_x_offset
+        self._write_register(Cmd.RAM_X_START, 2)
+        buf[0] = y_start & 0xFF
+        buf[1] = y_start >> 8
+        buf[2] = y_end & 0xFF
+        buf[3] = y_end >> 8
+        self._write_register(Cmd.RAM_Y_START, 4)
+
+    def set_ram_counter(self, x_byte: int, y: int) -> None:
+        """
+        Move the RAM address counters to the given byte column and row
+        """
+        y_addr = self._ram_y(y)
+        buf = self._register_buf
+        buf[0] = x_byte + self._ram_x_offset
+        self._write_register(Cmd.RAM_X_COUNTER, 1)
+        buf[0] = y_addr & 0xFF
+        buf[1] = y_addr >> 8
+        self._write_register(Cmd.RAM_Y_COUNTER, 2)
+
+    def _ram_y(self, y: int) -> int:
+        """
+        RAM Y address of a display row: the Y direction of the data entry mode runs from the top row to the bottom
+        """
+        return y if self._ram_y_inc else self.height_px - 1 - y
+
+    def draw_pixel_absolute(self, buffer: bytearray, x: int, y: int, color: PixelType):
+        if x < 0 or x >= self.width_px or y < 0 or y >= self.height_px \
+                or color not in self.supported_pixel_types:
+            return
+        index = y * self.width_bytes + int(x / 8)
+
+        if color is PixelType.BLACK_WHITE:
+            buffer[index] &= ~(0b1000_0000 >> (x % 8))
+        elif color is PixelType.RED:
+            buffer[index] |= 0b1000_0000 >> (x % 8)
+
+    def draw_test_pattern(self, canvas: "EInkCanvas") -> {PixelType: bytearray}:
+        rows_b = self.width_px + 1
+        cols_b = self.height_px
+        resolution = int(rows_b * cols_b / 8)
+        bw_buffer = bytearray(4000)
+        r_buffer = bytearray(b"\x0f" * 4000)
+
+        for r in range(250):
+            for c in range(16):
+                offset = r * 16 + c
+                # print(offset)
+                if (c == 0 or c % 2 == 0) or (r == 0 or r % 16 < 4):
+                    bw_buffer[offset] = 0xFF
+                else:
+                    bw_buffer[offset] = 0x00
+        #
+        #
+        # for i in range(0, l):
+        #     bw_buffer[i] = 0xFF
+
+        # for i in range(400, 800):
+        #     bw_buffer[i] = 0xFF >> 2
+
+        #
+        # black = 0
+        # white = 1
+        # red = 2
+        # square_color = black
+        # square_len_bytes = 3
+        #
+        # def set_pixels(buffer, row_start, row_end, col_start, col_end, val):
+        #     row_end = min(row_end, rows_b)
+        #     col_end = min(col_end, cols_b)
+        #     for r in range(row_start, row_end):
+        #         for c in range(col_start, col_end):
+        #             buffer[r * cols_b + c] = val
+        #
+        # # The test pattern is 3-byte squares
+        # for col in range(10):
+        #     for row in range(5):
+        #         if square_color is black:
+        #             set_pixels(bw_buffer, row, row + square_len_bytes, col, col + square_len_bytes, 0x00)
+        #             set_pixels(r_buffer, row, row + square_len_bytes, col, col + square_len_bytes, 0x00)
+        #         if square_color is white:
+        #             set_pixels(bw_buffer, row, row + square_len_bytes, col, col + square_len_bytes, 0xFF)
+        #             set_pixels(r_buffer, row, row + square_len_bytes, col, col + square_len_bytes, 0x00)
+        #         if square_color is red:
+        #             set_pixels(r_buffer, row, row + square_len_bytes, col, col + square_len_bytes, 0xFF)
+        #     if square_color is black:
+        #         square_color = white
+        #     if square_color is white:
+        #         square_color = red
+        #     if square_color is red:
+        #         square_color = black
+
+        canvas.draw_buffer(PixelType.BLACK_WHITE, bw_buffer)
+        canvas.draw_buffer(PixelType.RED, r_buffer)
+
+    def write(self, command: int, data: [int] = None) -> int:
+        if data is not None and not is_buffer(data):
+            data = bytes(data)
+        return self._display_iface.write_command(command, data)
+
+    def _write_register(self, command: int, length: int) -> None:
+        """
+        Write the first length bytes of the register scratch buffer as a command's data
+        """
+        data = self._register_views[length]
+        if self._display_iface.transport is not None:
+            # Queued writes hold on to their data until sent, and the scratch buffer is about to be reused
+            data = bytes(data)
+        self._display_iface.write_command(command, data)
+
+    @property
+    def transfers_pending(self) -> bool:
+        """
+        Whether writes queued on an asynchronous transport haven't been sent yet
+        """
+        transport = self._display_iface.transport
+        return transport is not None and not transport.idle
+
+    def flush_transfers(self) -> None:
+        """
+        Block until writes queued on an asynchronous transport have been sent
+        """
+        if self._display_iface.transport is not None:
+            self._display_iface.transport.flush()
+
+    def wait_until_ready(self):
+        self._display_iface.wait_ready()
+
+    async def wait_ready(self) -> None:
+        await self._display_iface.wait_ready_async()
@@ -0,0 +1,418 @@
+from ._display_interface import IEPaperDisplay, PixelType
+from ._profile import PanelProfile
+from ._serial_interface import SerialInitInfo
+from .displays.ssd1680 import Cmd
+
+
+class EmulatedPin:
+    """
+    Stand-in for machine.Pin that reports level changes to the emulated controller
+    """
+    IN = 0
+    OUT = 1
+    IRQ_FALLING = 4
+    IRQ_RISING = 8
+
+    def __init__(self, pin_id: int, mode: int = IN, value: int = 0, on_change=None):
+        self.id = pin_id
+        self.mode = mode
+        self._value = value
+        self._on_change = on_change
+        self._irq_handler = None
+
+    def value(self, v: int = None):
+        if v is None:
+            return self._value
+        v = 1 if v else 0
+        if v == self._value:
+            return
+        self._value = v
+        if self._on_change is not None:
+            self._on_change(self, v)
+        if v == 0 and self._irq_handler is not None:
+            self._irq_handler(self)
+
+    def irq(self, handler=None, trigger: int = IRQ_FALLING):
+        self._irq_handler = handler
+
+
+class EmulatedController:
+    """
+    Emulation of an SSD16xx-style e-paper controller. It stands in for the SPI bus and pins of an
+    ISerialDisplayInterface, decodes the command stream clocked into it (RAM windows, address counters, data entry
+    mode, BW/red RAM writes, refreshes) and holds the RAM planes, so the library runs under CPython without hardware.
+    As on the real controller, deep sleep holds BUSY high and ignores the bus until RES# is pulsed.
+
+    The panel shows RAM X bytes [x_offset_bytes, x_offset_bytes + ceil(width_px / 8)) and, top row first, RAM Y
+    addresses height_px - 1 down to 0, or 0 up to height_px - 1 once the RAM has been written with Y counting up.
+    from_profile() takes the geometry and planes from a panel's PanelProfile.
+    """
+    RAM_X_BYTES = 22
+    RAM_Y_ROWS = 296
+
+    def __init__(self, init_info: SerialInitInfo, width_px: int = 122, height_px: int = 250, x_offset_bytes: int = 1,
+                 planes: ((PixelType, int),) = ((PixelType.BLACK_WHITE, Cmd.WRITE_BW_RAM),
+                                                (PixelType.RED, Cmd.WRITE_R_RAM))):
+        """
+        :param init_info: Pins the controller is wired to
+        :param width_px: Panel width in pixels
+        :param height_px: Panel height in pixels
+        :param x_offset_bytes: RAM X address (in bytes) of the panel's first column
+        :param planes: (pixel type, RAM write command) of each plane the panel shows
+        """
+        if x_offset_bytes < 0 or x_offset_bytes + ((width_px + 7) >> 3) > self.RAM_X_BYTES \
+                or height_px > self.RAM_Y_ROWS:
+            raise Exception(f"A {width_px}x{height_px} panel at RAM X byte {x_offset_bytes} doesn't fit the "
+                            f"{self.RAM_X_BYTES * 8}x{self.RAM_Y_ROWS} RAM")
+        self._init_info = init_info
+        self.width_px = width_px
+        self.height_px = height_px
+        self.x_offset_bytes = x_offset_bytes
+        self.plane_commands = planes
+        self.ram = {
+            Cmd.WRITE_BW_RAM: bytearray(b"\xff" * (self.RAM_X_BYTES * self.RAM_Y_ROWS)),
+            Cmd.WRITE_R_RAM: bytearray(self.RAM_X_BYTES * self.RAM_Y_ROWS)
+        }
+        # RAM contents latched by the last refresh, i.e. what the panel shows
+        self.shown = {cmd: bytearray(plane) for cmd, plane in self.ram.items()}
+
+        self.command_counts = {}
+        self.refresh_count = 0
+        self.last_update_control = None
+        self.deep_sleep = 0
+        self.hardware_resets = 0
+        self.bytes_received = 0
+        # Whether the panel's top row is RAM Y 0, i.e. the Y direction of the last RAM write; unlike the data entry
+        # mode register it survives resets and deep sleep, as the gate scan wiring it stands in for does
+        self.rows_y_inc = False
+
+        self._cs = None
+        self._dc = None
+        self._busy = None
+        self._reset = None
+        self._command = None
+        self._params = bytearray()
+        self._reset_registers()
+
+    @classmethod
+    def from_profile(cls, init_info: SerialInitInfo, profile: PanelProfile) -> "EmulatedController":
+        """
+        A controller wired to a panel as the profile describes it
+        """
+        return cls(init_info, profile.width_px, profile.height_px, profile.ram_x_offset, profile.planes)
+
+    def _reset_registers(self) -> None:
+        self.data_entry_mode = 0x03
+        self.x_window = (0, self.RAM_X_BYTES - 1)
+        self.y_window = (0, self.RAM_Y_ROWS - 1)
+        self.x_counter = 0
+        self.y_counter = 0
+        self.update_control_1 = (0x00, 0x00)
+        self.lut = None
+
+    #
+    # machine.Pin / machine.SPI stand-ins
+    #
+
+    @property
+    def pin_factory(self) -> "_PinFactory":
+        """
+        Creates the interface's pins wired to this controller; pass it as the pin_factory of the interface
+        """
+        return _PinFactory(self)
+
+    def _attach_pin(self, pin: EmulatedPin) -> None:
+        if pin.id == self._init_info.cs_pin:
+            self._cs = pin
+        elif pin.id == self._init_info.data_command_pin:
+            self._dc = pin
+        elif pin.id == self._init_info.busy_pin:
+            # A new pin for the same line (e.g. after the MCU reboots) reads the level the controller drives
+            if self._busy is not None:
+                pin._value = self._busy.value()
+            self._busy = pin
+        elif pin.id == self._init_info.reset_pin:
+            self._reset = pin
+
+    def write(self, buf) -> None:
+        """
+        SPI write: bytes with DC low are commands, bytes with DC high are their data
+        """
+        if self._cs is not None and self._cs.value() != 0:
+            return
+        # Deep sleep ignores the bus until a hardware reset, and so does a reset in progress
+        if self.deep_sleep or (self._reset is not None and self._reset.value() == 0):
+            return
+        self.bytes_received += len(buf)
+
+        if self._dc is None or self._dc.value() == 0:
+            for b in buf:
+                self._end_command()
+                self._command = b
+                self.command_counts[b] = self.command_counts.get(b, 0) + 1
+                if b in (Cmd.MASTER_ACTIVATION, Cmd.SOFT_RESET):
+                    self._end_command()
+            return
+
+        if self._command in self.ram:
+            self._write_ram(buf)
+        else:
+            self._params += bytes(buf)
+
+    def _on_pin_change(self, pin: EmulatedPin, value: int) -> None:
+        # Raising CS ends the transaction and with it the command's parameters
+        if pin is self._cs and value == 1:
+            self._end_command()
+        # Releasing RES# resets the controller: out of deep sleep, registers at their reset values, RAM kept
+        elif pin is self._reset and value == 1:
+            self._command = None
+            self._params = bytearray()
+            self.deep_sleep = 0
+            self._reset_registers()
+            self.hardware_resets += 1
+            if self._busy is not None:
+                self._busy.value(0)
+
+    #
+    # Command decoding
+    #
+
+    def _end_command(self) -> None:
+        command = self._command
+        p = self._params
+        self._command = None
+        self._params = bytearray()
+        if command is None:
+            return
+
+        if command == Cmd.SOFT_RESET:
+            self._reset_registers()
+        elif command == Cmd.DATA_ENTRY_MODE and len(p) >= 1:
+            self.data_entry_mode = p[0] & 0x07
+        elif command == Cmd.RAM_X_START and len(p) >= 2:
+            self.x_window = (p[0] & 0x3F, p[1] & 0x3F)
+        elif command == Cmd.RAM_Y_START and len(p) >= 4:
+            self.y_window = (p[0] | (p[1] & 0x01) << 8, p[2] | (p[3] & 0x01) << 8)
+        elif command == Cmd.RAM_X_COUNTER and len(p) >= 1:
+            self.x_counter = p[0] & 0x3F
+        elif command == Cmd.RAM_Y_COUNTER and len(p) >= 2:
+            self.y_counter = p[0] | (p[1] & 0x01) << 8
+        elif command == Cmd.DISPLAY_UPDATE_CONTROL_1 and len(p) >= 2:
+            self.update_control_1 = (p[0], p[1])
+        elif command == Cmd.DISPLAY_UPDATE_CONTROL_2 and len(p) >= 1:
+            self.last_update_control = p[0]
+        elif command == Cmd.WRITE_LUT:
+            self.lut = bytes(p)
+        elif command == Cmd.DEEP_SLEEP and len(p) >= 1:
+            self.deep_sleep = p[0] & 0x03
+            if self.deep_sleep:
+                # Registers come back at their reset values; mode 2 loses the RAM as well
+                self._reset_registers()
+                if self.deep_sleep == 0x03:
+                    for plane in self.ram.values():
+                        plane[:] = bytes(len(plane))
+                # BUSY stays high for as long as the controller sleeps
+                if self._busy is not None:
+                    self._busy.value(1)
+        elif command == Cmd.MASTER_ACTIVATION:
+            for cmd, plane in self.ram.items():
+                # Red RAM bypassed by display update control 1 leaves the red pixels on the panel as they were
+                if cmd == Cmd.WRITE_R_RAM and self.update_control_1[0] & 0xF0 == 0x40:
+                    continue
+                self.shown[cmd][:] = plane
+            self.refresh_count += 1
+
+    def _write_ram(self, buf) -> None:
+        plane = self.ram[self._command]
+        x_inc = self.data_entry_mode & 0x01
+        y_inc = self.data_entry_mode & 0x02
+        y_first = self.data_entry_mode & 0x04
+        self.rows_y_inc = y_inc != 0
+        (x_start, x_end) = self.x_window
+        (y_start, y_end) = self.y_window
+
+        for b in buf:
+            if 0 <= self.x_counter < self.RAM_X_BYTES and 0 <= self.y_counter < self.RAM_Y_ROWS:
+                plane[self.y_counter * self.RAM_X_BYTES + self.x_counter] = b
+
+            if y_first:
+                (self.y_counter, wrapped) = self._step(self.y_counter, y_inc, y_start, y_end)
+                if wrapped:
+                    (self.x_counter, _) = self._step(self.x_counter, x_inc, x_start, x_end)
+            else:
+                (self.x_counter, wrapped) = self._step(self.x_counter, x_inc, x_start, x_end)
+                if wrapped:
+                    (self.y_counter, _) = self._step(self.y_counter, y_inc, y_start, y_end)
+
+    @staticmethod
+    def _step(counter: int, increment: bool, start: int, end: int) -> (int, bool):
+        """
+        Advance an address counter within its window; returns the new value and whether it wrapped
+        """
+        if counter == end:
+            return start, True
+        return (counter + 1 if increment else counter - 1), False
+
+    #
+    # Inspection
+    #
+
+    def planes(self, shown: bool = True) -> {PixelType: bytearray}:
+        """
+        The panel area of the RAM in EInkCanvas layout (rows of ceil(width_px / 8) bytes, top row first)
+        :param shown: The contents latched by the last refresh rather than the current RAM
+        """
+        source = self.shown if shown else self.ram
+        width_bytes = (self.width_px + 7) >> 3
+        out = {}
+        for (pixel_type, cmd) in self.plane_commands:
+            ram = source[cmd]
+            plane = bytearray(width_bytes * self.height_px)
+            for row in range(self.height_px):
+                y = row if self.rows_y_inc else self.height_px - 1 - row
+                src = y * self.RAM_X_BYTES + self.x_offset_bytes
+                plane[row * width_bytes:(row + 1) * width_bytes] = ram[src:src + width_bytes]
+            out[pixel_type] = plane
+        return out
+
+    def pixels_rgb(self, shown: bool = True) -> bytearray:
+        """
+        The panel as packed 8-bit RGB rows; red RAM wins over black/white
+        """
+        planes = self.planes(shown)
+        width_bytes = (self.width_px + 7) >> 3
+        bw = planes.get(PixelType.BLACK_WHITE, bytearray(width_bytes * self.height_px))
+        # A panel without a red plane never shows red
+        red = planes.get(PixelType.RED, bytearray(width_bytes * self.height_px))
+        rgb = bytearray(self.width_px * self.height_px * 3)
+        i = 0
+        for y in range(self.height_px):
+            for x in range(self.width_px):
+                index = y * width_bytes + (x >> 3)
+                bit = 0x80 >> (x & 7)
+                if red[index] & bit:
+                    rgb[i:i + 3] = b"\xff\x00\x00"
+                elif bw[index] & bit:
+                    rgb[i:i + 3] = b"\xff\xff\xff"
+                i += 3
+        return rgb
+
+    def save_ppm(self, path: str, shown: bool = True) -> None:
+        """
+        Write the panel as a binary PPM image
+        """
+        with open(path, "wb") as f:
+            f.write(f"P6\n{self.width_px} {self.height_px}\n255\n".encode())
+            f.write(self.pixels_rgb(shown))
+
+    def save_png(self, path: str, shown: bool = True) -> None:
+        """
+        Write the panel as a PNG image (needs zlib, i.e. CPython)
+        """
+        import struct
+        import zlib
+
+        rgb = self.pixels_rgb(shown)
+        stride = self.width_px * 3
+        raw = bytearray()
+        for y in range(self.height_px):
+            raw.append(0)
+            raw += rgb[y * stride:(y + 1) * stride]
+
+        def chunk(kind: bytes, data: bytes) -> bytes:
+            return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+        with open(path, "wb") as f:
+            f.write(b"\x89PNG\r\n\x1a\n")
+            f.write(chunk(b"IHDR", struct.pack(">IIBBBBB", self.width_px, self.height_px, 8, 2, 0, 0, 0)))
+            f.write(chunk(b"IDAT", zlib.compress(bytes(raw))))
+            f.write(chunk(b"IEND", b""))
+
+
+class _PinFactory:
+    IN = EmulatedPin.IN
+    OUT = EmulatedPin.OUT
+    IRQ_FALLING = EmulatedPin.IRQ_FALLING
+    IRQ_RISING = EmulatedPin.IRQ_RISING
+
+    def __init__(self, controller: EmulatedController):
+        self._controller = controller
+
+    def __call__(self, pin_id: int, mode: int = EmulatedPin.IN, value: int = 0) -> EmulatedPin:
+        pin = EmulatedPin(pin_id, mode, value, self._controller._on_pin_change)
+        self._controller._attach_pin(pin)
+        return pin
+
+
+class EmulatedBus:
+    """
+    Stand-in for one SPI bus shared by several emulated controllers. Every write reaches all of them, and each only
+    listens while its own CS is low, as on real hardware. Pins are routed to the controller wired to them.
+    """
+
+    def __init__(self, controllers: [EmulatedController]):
+        self.controllers = controllers
+
+    def write(self, buf) -> None:
+        for controller in self.controllers:
+            controller.write(buf)
+
+    @property
+    def pin_factory(self) -> "_BusPinFactory":
+        """
+        Creates the pins of the panels on the bus; pass it as the pin_factory of the bus
+        """
+        return _BusPinFactory(self)
+
+
+class _BusPinFactory(_PinFactory):
+    def __init__(self, bus: EmulatedBus):
+        self._bus = bus
+
+    def __call__(self, pin_id: int, mode: int = EmulatedPin.IN, value: int = 0) -> EmulatedPin:
+        for controller in self._bus.controllers:
+            info = controller._init_info
+            if pin_id in (info.cs_pin, info.data_command_pin, info.busy_pin, info.reset_pin):
+                return controller.pin_factory(pin_id, mode, value)
+        return EmulatedPin(pin_id, mode, value)
+
+
+def connect_to_emulated_bus(count: int, display_name: int = 0) -> ("SharedSPIBus", [IEPaperDisplay],
+                                                                    [EmulatedController]):
+    """
+    Get a shared SPI bus with several displays of the given type, each wired to its own emulated controller
+    :param count: Number of panels on the bus
+    :param display_name: One of Displays, or a PanelProfile; the controllers take the panel's geometry from it
+    :return: The bus, its displays NOT INITIALIZED, and their controllers
+    """
+    from ._bus import SharedSPIBus
+
+    profile = _emulated_profile(display_name)
+    pins = [(20 + 4 * i, 21 + 4 * i, 22 + 4 * i, 23 + 4 * i) for i in range(count)]
+    controllers = [EmulatedController.from_profile(SerialInitInfo(0, 19, 18, cs, dc, busy, 2_000_000, reset), profile)
+                   for (cs, dc, busy, reset) in pins]
+    emulated = EmulatedBus(controllers)
+    bus = SharedSPIBus(0, 19, 18, 2_000_000, spi=emulated, pin_factory=emulated.pin_factory)
+    displays = [bus.add_display(profile, cs, dc, busy, reset) for (cs, dc, busy, reset) in pins]
+    return bus, displays, controllers
+
+
+def connect_to_emulator(display_name: int = 0) -> (IEPaperDisplay, EmulatedController):
+    """
+    Get a display of the given type wired to an emulated controller instead of real hardware
+    :param display_name: One of Displays, or a PanelProfile; the controller takes the panel's geometry from it
+    :return: The display NOT INITIALIZED, and the controller to inspect
+    """
+    from . import connect_to_display
+
+    profile = _emulated_profile(display_name)
+    init_info = SerialInitInfo(0, 19, 18, 20, 14, 15, 2_000_000, reset_pin=16)
+    controller = EmulatedController.from_profile(init_info, profile)
+    display = connect_to_display(profile, init_info, spi=controller, pin_factory=controller.pin_factory)
+    return display, controller
+
+
+def _emulated_profile(display_name) -> PanelProfile:
+    from . import load_profile
+
+    return display_name if isinstance(display_name, PanelProfile) else load_profile(display_name)
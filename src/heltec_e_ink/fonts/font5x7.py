@@ -0,0 +1,2 @@
+# Generated by tools/make_font.py from font5x7.txt; do not edit
+DATA = b'HF\x01\x07 _\x01\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x00\x00\x00\x00\x00\x00\x00     \x00 PPP\x00\x00\x00\x00PP\xf8P\xf8PP x\xa0p(\xf0 \xc0\xc8\x10 @\x98\x18`\x90\xa0@\xa8\x90h  @\x00\x00\x00\x00\x10 @@@ \x10@ \x10\x10\x10 @\x00 \xa8p\xa8 \x00\x00  \xf8  \x00\x00\x00\x00\x00` @\x00\x00\x00\xf8\x00\x00\x00\x00\x00\x00\x00\x00``\x00\x08\x10 @\x80\x00p\x88\x98\xa8\xc8\x88p `    pp\x88\x08\x10 @\xf8\xf8\x10 \x10\x08\x88p\x100P\x90\xf8\x10\x10\xf8\x80\xf0\x08\x08\x88p0@\x80\xf0\x88\x88p\xf8\x08\x10 @@@p\x88\x88p\x88\x88pp\x88\x88x\x08\x10`\x00``\x00``\x00\x00``\x00` @\x10 @\x80@ \x10\x00\x00\xf8\x00\xf8\x00\x00@ \x10\x08\x10 @p\x88\x08\x10 \x00 p\x88\x08h\xa8\xa8pp\x88\x88\xf8\x88\x88\x88\xf0\x88\x88\xf0\x88\x88\xf0p\x88\x80\x80\x80\x88p\xe0\x90\x88\x88\x88\x90\xe0\xf8\x80\x80\xf0\x80\x80\xf8\xf8\x80\x80\xf0\x80\x80\x80p\x88\x80\xb8\x88\x88x\x88\x88\x88\xf8\x88\x88\x88p     p8\x10\x10\x10\x10\x90`\x88\x90\xa0\xc0\xa0\x90\x88\x80\x80\x80\x80\x80\x80\xf8\x88\xd8\xa8\xa8\x88\x88\x88\x88\x88\xc8\xa8\x98\x88\x88p\x88\x88\x88\x88\x88p\xf0\x88\x88\xf0\x80\x80\x80p\x88\x88\x88\xa8\x90h\xf0\x88\x88\xf0\xa0\x90\x88x\x80\x80p\x08\x08\xf0\xf8      \x88\x88\x88\x88\x88\x88p\x88\x88\x88\x88\x88P \x88\x88\x88\xa8\xa8\xa8P\x88\x88P P\x88\x88\x88\x88P    \xf8\x08\x10 @\x80\xf8p@@@@@p\x00\x80@ \x10\x08\x00p\x10\x10\x10\x10\x10p P\x88\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\xf8@ \x10\x00\x00\x00\x00\x00\x00p\x08x\x88x\x80\x80\xb0\xc8\x88\x88\xf0\x00\x00p\x80\x80\x88p\x08\x08h\x98\x88\x88x\x00\x00p\x88\xf8\x80p0H@\xe0@@@\x00x\x88\x88x\x08p\x80\x80\xb0\xc8\x88\x88\x88 \x00`   p\x10\x000\x10\x10\x90`\x80\x80\x90\xa0\xc0\xa0\x90`     p\x00\x00\xd0\xa8\xa8\x88\x88\x00\x00\xb0\xc8\x88\x88\x88\x00\x00p\x88\x88\x88p\x00\x00\xf0\x88\xf0\x80\x80\x00\x00h\x98x\x08\x08\x00\x00\xb0\xc8\x80\x80\x80\x00\x00p\x80p\x08\xf0@@\xe0@@H0\x00\x00\x88\x88\x88\x98h\x00\x00\x88\x88\x88P \x00\x00\x88\x88\xa8\xa8P\x00\x00\x88P P\x88\x00\x00\x88\x88x\x08p\x00\x00\xf8\x10 @\xf8\x10  @  \x10       @  \x10  @\x00\x00@\xa8\x10\x00\x00'
@@ -0,0 +1,69 @@
+"""
+Precompile heltec_e_ink to .mpy files with mpy-cross, for copying to a board that runs stock firmware. The board then
+loads bytecode instead of compiling every module from source at import, which is most of the package's import time.
+(To build the package into the firmware instead, see manifest.py at the top of the repository.)
+
+-march is needed for the viper kernels to be compiled to native code; armv6m is the RP2040's Cortex-M0+.
+
+    pip install mpy-cross
+    python tools/build_mpy.py build/
+    mpremote cp -r build/heltec_e_ink :
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+
+PACKAGE = "heltec_e_ink"
+# Modules that only run on a host are copied as source, if at all
+HOST_ONLY = ("emulator.py",)
+
+
+def find_mpy_cross() -> [str]:
+    path = shutil.which("mpy-cross")
+    if path is not None:
+        return [path]
+    try:
+        import mpy_cross  # noqa: F401
+        return [sys.executable, "-m", "mpy_cross"]
+    except ImportError:
+        raise SystemExit("mpy-cross not found; install it with 'pip install mpy-cross' or put it on PATH")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("output", help="Directory to write the compiled package to")
+    parser.add_argument("--march", default="armv6m", help="Native code architecture for the viper kernels")
+    parser.add_argument("--opt", type=int, default=3, help="mpy-cross optimisation level (3 strips asserts)")
+    parser.add_argument("--with-emulator", action="store_true", help="Also copy the host-only emulator")
+    args = parser.parse_args()
+
+    mpy_cross = find_mpy_cross()
+    here = os.path.dirname(os.path.abspath(__file__))
+    src_root = os.path.join(here, "..", "src")
+    count = 0
+    for (dir_path, dir_names, file_names) in os.walk(os.path.join(src_root, PACKAGE)):
+        dir_names[:] = [d for d in dir_names if d != "__pycache__"]
+        rel_dir = os.path.relpath(dir_path, src_root)
+        out_dir = os.path.join(args.output, rel_dir)
+        os.makedirs(out_dir, exist_ok=True)
+        for name in sorted(file_names):
+            if not name.endswith(".py"):
+                continue
+            if name in HOST_ONLY and rel_dir == PACKAGE:
+                if args.with_emulator:
+                    shutil.copy(os.path.join(dir_path, name), out_dir)
+                continue
+            out_path = os.path.join(out_dir, name[:-3] + ".mpy")
+            # The source path recorded in the .mpy (shown in tracebacks) is relative to the package root
+            subprocess.run(mpy_cross + [f"-march={args.march}", f"-O{args.opt}", "-s", os.path.join(rel_dir, name),
+                                        "-o", out_path, os.path.join(dir_path, name)], check=True)
+            count += 1
+
+    print(f"{count} modules compiled to {os.path.join(args.output, PACKAGE)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
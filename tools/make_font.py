@@ -0,0 +1,143 @@
+"""
+Build a packed heltec_e_ink font (see heltec_e_ink._font.Font) on the host.
+
+Input is either a BDF font or a text file of glyph art ('//' starts a comment line):
+
+    height 7
+    spacing 1
+    glyph 0x41
+    .###.
+    #...#
+    ...
+
+Output is a binary font file to load with Font.load(), or a Python module holding it as DATA if the output name ends
+in .py (so it can be frozen into the firmware).
+
+    python tools/make_font.py tools/fonts/font5x7.txt font5x7.hfnt
+    python tools/make_font.py --first 0x20 --last 0x7E terminus-12.bdf terminus12.hfnt
+"""
+import argparse
+import sys
+
+MAGIC = b"HF"
+VERSION = 1
+
+
+def read_art(path: str) -> (int, int, {int: [str]}):
+    height = None
+    spacing = 1
+    glyphs = {}
+    current = None
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("//"):
+                continue
+            key, _, value = line.partition(" ")
+            if key == "height":
+                height = int(value)
+            elif key == "spacing":
+                spacing = int(value)
+            elif key == "glyph":
+                current = []
+                glyphs[int(value, 0)] = current
+            else:
+                current.append(line)
+
+    if height is None:
+        raise ValueError(f"{path}: missing 'height'")
+    for code, rows in glyphs.items():
+        if len(rows) != height or len({len(r) for r in rows}) != 1:
+            raise ValueError(f"{path}: glyph 0x{code:02X} must be {height} rows of equal width")
+    return height, spacing, glyphs
+
+
+def read_bdf(path: str, first: int, last: int) -> (int, int, {int: [str]}):
+    glyphs = {}
+    with open(path) as f:
+        lines = [line.split() for line in f]
+
+    (box_w, box_h, box_x, box_y) = next(map(int, line[1:5]) for line in lines if line and line[0] == "FONTBOUNDINGBOX")
+    baseline = box_h + box_y
+
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        if line and line[0] == "ENCODING":
+            code = int(line[1])
+            advance = bbx = None
+            while lines[i][0] != "BITMAP":
+                if lines[i][0] == "DWIDTH":
+                    advance = int(lines[i][1])
+                elif lines[i][0] == "BBX":
+                    bbx = [int(v) for v in lines[i][1:5]]
+                i += 1
+            (w, h, x_off, y_off) = bbx
+            bitmap = [int(lines[i + 1 + r][0], 16) for r in range(h)]
+            i += h
+
+            if first <= code <= last:
+                width = max(advance or 0, w + max(x_off, 0))
+                rows = [["."] * width for _ in range(box_h)]
+                top = baseline - (h + y_off)
+                hex_bits = ((w + 7) // 8) * 8
+                for r, bits in enumerate(bitmap):
+                    for c in range(w):
+                        if bits & (1 << (hex_bits - 1 - c)) and 0 <= top + r < box_h:
+                            rows[top + r][max(x_off, 0) + c] = "#"
+                glyphs[code] = ["".join(row) for row in rows]
+        i += 1
+
+    return box_h, 0, glyphs
+
+
+def pack(height: int, spacing: int, glyphs: {int: [str]}) -> bytes:
+    first = min(glyphs)
+    last = max(glyphs)
+    count = last - first + 1
+    if count > 255 or height > 255:
+        raise ValueError("Fonts are limited to 255 glyphs of at most 255 rows")
+
+    widths = bytearray()
+    bitmaps = bytearray()
+    for code in range(first, last + 1):
+        rows = glyphs.get(code, [""] * height)
+        width = len(rows[0])
+        widths.append(width)
+        for row in rows:
+            packed = bytearray((width + 7) // 8)
+            for c, px in enumerate(row):
+                if px == "#":
+                    packed[c >> 3] |= 0x80 >> (c & 7)
+            bitmaps += packed
+
+    return MAGIC + bytes([VERSION, height, first, count, spacing]) + bytes(widths) + bytes(bitmaps)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("source", help="BDF font or glyph art text file")
+    parser.add_argument("output", help="Packed font file, or a .py module")
+    parser.add_argument("--first", type=lambda v: int(v, 0), default=0x20, help="First character code (BDF only)")
+    parser.add_argument("--last", type=lambda v: int(v, 0), default=0x7E, help="Last character code (BDF only)")
+    args = parser.parse_args()
+
+    if args.source.lower().endswith(".bdf"):
+        data = pack(*read_bdf(args.source, args.first, args.last))
+    else:
+        data = pack(*read_art(args.source))
+
+    if args.output.endswith(".py"):
+        with open(args.output, "w") as f:
+            f.write(f"# Generated by tools/make_font.py from {args.source.rsplit('/', 1)[-1]}; do not edit\n")
+            f.write(f"DATA = {data!r}\n")
+    else:
+        with open(args.output, "wb") as f:
+            f.write(data)
+
+    print(f"{args.output}: {len(data)} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+"""
+Compress a prerendered screen into a heltec_e_ink frame (see heltec_e_ink._frame.Frame): each plane is encoded with
+PackBits. Planes come from PBM bitmaps the size of the panel (black PBM pixels are inked), or from raw plane dumps
+(e.g. bytes(canvas.plane(PixelType.RED)) written to a file).
+
+Output is a binary frame file to load with Frame.load(), or a Python module holding it as DATA if the output name ends
+in .py.
+
+    python tools/make_frame.py --bw text.pbm --red accents.pbm screen.hfrm
+"""
+import argparse
+import sys
+
+from make_image import read_pbm
+
+MAGIC = b"HR"
+VERSION = 1
+# Pixel type numbers of heltec_e_ink.PixelType
+BLACK_WHITE = 0
+RED = 1
+PANEL_WIDTH = 122
+PANEL_HEIGHT = 250
+
+
+def packbits(data: bytes) -> bytes:
+    """
+    PackBits-encode data: repeats of 2 or more bytes become runs (3 or more in the middle of a literal), everything
+    else literals of up to 128 bytes
+    """
+    out = bytearray()
+    literal = bytearray()
+    i = 0
+    n = len(data)
+
+    def flush_literal():
+        for start in range(0, len(literal), 128):
+            part = literal[start:start + 128]
+            out.append(len(part) - 1)
+            out.extend(part)
+        literal.clear()
+
+    while i < n:
+        run = 1
+        while i + run < n and run < 128 and data[i + run] == data[i]:
+            run += 1
+        if run >= 3 or (run == 2 and not literal):
+            flush_literal()
+            out.append(257 - run)
+            out.append(data[i])
+            i += run
+        else:
+            literal.append(data[i])
+            i += 1
+    flush_literal()
+    return bytes(out)
+
+
+def plane_from_pbm(path: str, width: int, height: int, ink_clears: bool) -> bytes:
+    (w, h, rows) = read_pbm(path)
+    if (w, h) != (width, height):
+        raise ValueError(f"{path}: {w}x{h} doesn't match the {width}x{height} panel")
+    if ink_clears:
+        # The black/white plane is white where bits are set
+        return bytes(b ^ 0xFF for b in rows)
+    return rows
+
+
+def plane_from_raw(path: str, plane_bytes: int) -> bytes:
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) != plane_bytes:
+        raise ValueError(f"{path}: {len(data)} bytes, expected a {plane_bytes} byte plane")
+    return data
+
+
+def pack(width_bytes: int, height: int, planes: [(int, bytes)]) -> bytes:
+    out = bytearray(MAGIC + bytes([VERSION, width_bytes, height & 0xFF, height >> 8, len(planes)]))
+    for (pixel_type, plane) in planes:
+        encoded = packbits(plane)
+        out += bytes([pixel_type]) + len(encoded).to_bytes(4, "little") + encoded
+    return bytes(out)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bw", help="Black/white plane: PBM image, or raw plane with --raw")
+    parser.add_argument("--red", help="Red plane: PBM image, or raw plane with --raw")
+    parser.add_argument("--raw", action="store_true", help="Planes are raw display RAM dumps, not PBM images")
+    parser.add_argument("--width", type=int, default=PANEL_WIDTH, help="Panel width in pixels")
+    parser.add_argument("--height", type=int, default=PANEL_HEIGHT, help="Panel height in pixels")
+    parser.add_argument("output", help="Frame file, or a .py module")
+    args = parser.parse_args()
+
+    if args.bw is None and args.red is None:
+        parser.error("give at least one of --bw and --red")
+
+    width_bytes = (args.width + 7) // 8
+    planes = []
+    for (pixel_type, path) in ((BLACK_WHITE, args.bw), (RED, args.red)):
+        if path is None:
+            continue
+        if args.raw:
+            plane = plane_from_raw(path, width_bytes * args.height)
+        else:
+            plane = plane_from_pbm(path, args.width, args.height, ink_clears=pixel_type == BLACK_WHITE)
+        planes.append((pixel_type, plane))
+
+    data = pack(width_bytes, args.height, planes)
+
+    if args.output.endswith(".py"):
+        with open(args.output, "w") as f:
+            f.write("# Generated by tools/make_frame.py; do not edit\n")
+            f.write(f"DATA = {data!r}\n")
+    else:
+        with open(args.output, "wb") as f:
+            f.write(data)
+
+    raw = width_bytes * args.height * len(planes)
+    print(f"{args.output}: {len(data)} bytes ({raw} bytes uncompressed)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""
+Convert a PBM bitmap (P1 or P4, as exported by GIMP or ImageMagick) into a packed heltec_e_ink image
+(see heltec_e_ink._image.Image). Black PBM pixels become inked pixels.
+
+Output is a binary image file to load with Image.load() or stream with ImageFile, or a Python module holding it as
+DATA if the output name ends in .py.
+
+    python tools/make_image.py logo.pbm logo.himg
+"""
+import argparse
+import sys
+
+MAGIC = b"HI"
+VERSION = 1
+
+
+def _tokens(data: bytes):
+    """
+    Yield whitespace-separated header tokens and the offset just past each one, skipping comments
+    """
+    i = 0
+    while i < len(data):
+        if data[i:i + 1] == b"#":
+            while i < len(data) and data[i:i + 1] not in (b"\n", b"\r"):
+                i += 1
+        elif data[i:i + 1].isspace():
+            i += 1
+        else:
+            start = i
+            while i < len(data) and not data[i:i + 1].isspace():
+                i += 1
+            yield data[start:i], i
+
+
+def read_pbm(path: str) -> (int, int, bytes):
+    with open(path, "rb") as f:
+        data = f.read()
+
+    tokens = _tokens(data)
+    magic, _ = next(tokens)
+    width = int(next(tokens)[0])
+    height, end = next(tokens)
+    height = int(height)
+    row_bytes = (width + 7) // 8
+
+    if magic == b"P4":
+        # Raw PBM rows are already packed MSB first with 1 for black
+        start = end + 1
+        rows = data[start:start + row_bytes * height]
+        if len(rows) != row_bytes * height:
+            raise ValueError(f"{path}: truncated raster")
+        return width, height, rows
+
+    if magic == b"P1":
+        packed = bytearray(row_bytes * height)
+        bits = [c for c in data[end:].decode("ascii") if c in "01"]
+        if len(bits) < width * height:
+            raise ValueError(f"{path}: truncated raster")
+        for n in range(width * height):
+            if bits[n] == "1":
+                (y, x) = divmod(n, width)
+                packed[y * row_bytes + (x >> 3)] |= 0x80 >> (x & 7)
+        return width, height, bytes(packed)
+
+    raise ValueError(f"{path}: not a PBM file (magic {magic!r})")
+
+
+def pack(width: int, height: int, rows: bytes) -> bytes:
+    if width > 0xFFFF or height > 0xFFFF:
+        raise ValueError("Images are limited to 65535x65535 pixels")
+    return MAGIC + bytes([VERSION, width & 0xFF, width >> 8, height & 0xFF, height >> 8]) + rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("source", help="PBM image (P1 or P4)")
+    parser.add_argument("output", help="Packed image file, or a .py module")
+    args = parser.parse_args()
+
+    data = pack(*read_pbm(args.source))
+
+    if args.output.endswith(".py"):
+        with open(args.output, "w") as f:
+            f.write(f"# Generated by tools/make_image.py from {args.source.rsplit('/', 1)[-1]}; do not edit\n")
+            f.write(f"DATA = {data!r}\n")
+    else:
+        with open(args.output, "wb") as f:
+            f.write(data)
+
+    print(f"{args.output}: {len(data)} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())